@@ -0,0 +1,299 @@
+"""
+Load generator: fleets of scripted players driving the table's action API headless.
+
+Each bot plays its own game, with tkinter and pygame replaced by the
+benchmark stubs so the window's event handlers run as they would in the
+app. Pass --no-gui to drive bare Tables and measure the game logic alone.
+
+Usage:
+    python benchmarks/load.py --bots 50 --rounds 100000
+    python benchmarks/load.py --bots 200 --policy random --think exp:50 --duration 30
+"""
+import argparse
+import heapq
+import json
+import random
+import time
+from collections import Counter
+
+from run import new_game, percentile  # Installs the stubs and an isolated cache directory
+
+from components.strategy import chart_for  # noqa: E402
+from components.table import Table, InvalidAction, SharedShoe, BETTING, INSURANCE, STARTING_BALANCE  # noqa: E402
+
+MAX_SAMPLES = 100_000  # Latency samples kept per action; later ones replace random earlier ones
+ACTIONS = ("place_bet", "hit", "stand", "double_down", "split_hand", "place_insurance", "fold", "surrender")
+
+
+class BasicPolicy:
+    """
+    Plays the basic strategy chart and never takes insurance.
+    """
+
+    def __init__(self, rng):
+        self.chart = chart_for()
+
+    def choose(self, table):
+        if table.state == INSURANCE:
+            return "stand" if table.current_hand.total >= 17 else "hit"  # Playing on declines insurance
+        action = self.chart.action(
+            table.current_hand,
+            table.dealer_hand.cards[0],
+            can_double=table.can_double,
+            can_split=table.can_split,
+            can_surrender=table.can_surrender,
+        )
+        return {
+            "hit": "hit", "stand": "stand", "double": "double_down", "split": "split_hand", "surrender": "surrender",
+        }[action]
+
+
+class DealerPolicy:
+    """
+    Hits below 17 like the dealer.
+    """
+
+    def __init__(self, rng):
+        pass
+
+    def choose(self, table):
+        return "hit" if table.current_hand.total < 17 else "stand"
+
+
+class RandomPolicy:
+    """
+    Picks any action at random, including ones the table will refuse, to exercise the error paths.
+    """
+
+    WEIGHTS = {"hit": 4, "stand": 4, "double_down": 1, "split_hand": 1, "place_insurance": 1, "fold": 1, "surrender": 1}
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.actions = list(self.WEIGHTS)
+        self.weights = list(self.WEIGHTS.values())
+
+    def choose(self, table):
+        return self.rng.choices(self.actions, self.weights)[0]
+
+
+POLICIES = {"basic": BasicPolicy, "dealer": DealerPolicy, "random": RandomPolicy}
+
+
+def think_time(spec, rng):
+    """
+    Returns a function giving think times in seconds, from a spec such as
+    "none", "fixed:20", "uniform:10-100" or "exp:50" (milliseconds).
+    """
+    kind, _, args = spec.partition(":")
+    if kind == "none":
+        return lambda: 0.0
+    if kind == "fixed":
+        delay = float(args) / 1000
+        return lambda: delay
+    if kind == "uniform":
+        low, high = (float(n) / 1000 for n in args.split("-"))
+        return lambda: rng.uniform(low, high)
+    if kind == "exp":
+        rate = 1000 / float(args)
+        return lambda: rng.expovariate(rate)
+    raise ValueError(f"Unknown think time distribution: {spec}")
+
+
+class LatencySample:
+    """
+    A fixed-size uniform sample of latencies (reservoir sampling), so long runs use bounded memory.
+    """
+
+    def __init__(self, rng, size=MAX_SAMPLES):
+        self.rng = rng
+        self.size = size
+        self.samples = []
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if len(self.samples) < self.size:
+            self.samples.append(value)
+        else:
+            index = self.rng.randrange(self.count)
+            if index < self.size:
+                self.samples[index] = value
+
+    def summary(self):
+        samples = sorted(self.samples)
+        if not samples:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "p50_us": percentile(samples, 0.50) / 1000,
+            "p90_us": percentile(samples, 0.90) / 1000,
+            "p99_us": percentile(samples, 0.99) / 1000,
+            "max_us": samples[-1] / 1000,
+        }
+
+
+class Bot:
+    """
+    A scripted player at its own table.
+    """
+
+    def __init__(self, table, policy, think, bet, stats):
+        self.table = table
+        self.policy = policy
+        self.think = think
+        self.bet = bet
+        self.stats = stats
+        table.subscribe(self.on_table_event)
+
+    def on_table_event(self, event, data):
+        if event == "round_settled":
+            self.stats.rounds += 1
+
+    def step(self):
+        """
+        Takes one action and records how long it took and whether the table accepted it.
+        """
+        table = self.table
+        if table.state == BETTING:
+            if table.shoe_owner is not None and table.shoe_owner.shuffle_due:
+                return  # Sitting out until the other seats finish and the shoe is shuffled
+            if table.balance < self.bet:
+                table.balance = STARTING_BALANCE  # Re-stake a broke bot so it keeps playing
+                self.stats.restakes += 1
+            name, args = "place_bet", (self.bet,)
+        else:
+            name, args = self.policy.choose(table), ()
+        action = getattr(table, name)
+        start = time.perf_counter_ns()
+        try:
+            action(*args)
+        except InvalidAction as error:
+            self.stats.errors[f"{name}: {error}"] += 1
+        except Exception as error:
+            self.stats.crashes[f"{name}: {type(error).__name__}: {error}"] += 1
+            table.set_state(BETTING)  # Put the table back in a playable state and carry on
+        finally:
+            self.stats.latency[name].add(time.perf_counter_ns() - start)
+
+
+class LoadStats:
+    """
+    Counters and latency samples shared by the whole fleet.
+    """
+
+    def __init__(self, rng):
+        self.rounds = 0
+        self.restakes = 0
+        self.errors = Counter()
+        self.crashes = Counter()
+        self.latency = {name: LatencySample(rng) for name in ACTIONS}
+        self.lag = LatencySample(rng)
+
+
+def run_load(bots, rounds=None, duration=None, policy="basic", think="none", bet=10, gui=True,
+             seats_per_shoe=1, seed=None):
+    """
+    Runs a fleet of bots until enough rounds are played or the time is up.
+
+    Bots are scheduled on one thread from a heap of wake-up times, so with
+    think times the run is paced like real players, and without them it
+    shows how many rounds per second the table logic can sustain. The lag
+    between a bot's wake-up time and when it actually acts shows when the
+    process is saturated.
+
+    Returns:
+        dict: The report.
+    """
+    rng = random.Random(seed)
+    stats = LoadStats(rng)
+    think_times = think_time(think, rng)
+    fleet = []
+    shoe = None
+    for index in range(bots):
+        if gui:
+            game = new_game()
+            table = game.table
+        else:
+            table = Table()
+        if seats_per_shoe > 1:
+            # Seats at one table share its shoe, which is only shuffled between all of their rounds
+            if index % seats_per_shoe == 0:
+                shoe = SharedShoe(table.deck)
+            shoe.join(table)
+            if gui:
+                game.deck = shoe.deck
+        fleet.append(Bot(table, POLICIES[policy](rng), think_times, bet, stats))
+
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+    queue = [(start, index) for index in range(bots)]
+    heapq.heapify(queue)
+    while queue:
+        wake, index = heapq.heappop(queue)
+        now = time.perf_counter()
+        if wake > now:
+            time.sleep(wake - now)
+            now = time.perf_counter()
+        if (rounds is not None and stats.rounds >= rounds) or (deadline is not None and now >= deadline):
+            break
+        stats.lag.add(int((now - wake) * 1e9))
+        bot = fleet[index]
+        bot.step()
+        heapq.heappush(queue, (time.perf_counter() + bot.think(), index))
+    elapsed = time.perf_counter() - start
+
+    actions = sum(sample.count for sample in stats.latency.values())
+    return {
+        "config": {
+            "bots": bots, "policy": policy, "think": think, "bet": bet, "gui": gui,
+            "seats_per_shoe": seats_per_shoe, "seed": seed,
+        },
+        "seconds": elapsed,
+        "rounds": stats.rounds,
+        "rounds_per_sec": stats.rounds / elapsed if elapsed else 0.0,
+        "actions_per_sec": actions / elapsed if elapsed else 0.0,
+        "actions": {name: sample.summary() for name, sample in stats.latency.items() if sample.count},
+        "scheduling_lag": stats.lag.summary(),
+        "invalid_actions": sum(stats.errors.values()),
+        "errors": dict(stats.errors.most_common()),
+        "crashes": dict(stats.crashes.most_common()),
+        "restakes": stats.restakes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the table with a fleet of scripted players.")
+    parser.add_argument("--bots", type=int, default=10, help="Number of players")
+    parser.add_argument("--rounds", type=int, default=None, help="Stop after this many rounds in total")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="basic", help="How bots play their hands")
+    parser.add_argument("--think", default="none", help='Think time: "none", "fixed:MS", "uniform:MIN-MAX" or "exp:MEAN"')
+    parser.add_argument("--bet", type=int, default=10, help="Bet per round")
+    parser.add_argument("--seats-per-shoe", type=int, default=1, help="Bots sharing each shoe")
+    parser.add_argument("--no-gui", action="store_true", help="Drive bare Tables without the window stand-ins")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for policies and think times")
+    parser.add_argument("--output", help="Also write the report to this file")
+    args = parser.parse_args()
+    if args.rounds is None and args.duration is None:
+        args.rounds = 10_000
+
+    report = run_load(
+        args.bots,
+        rounds=args.rounds,
+        duration=args.duration,
+        policy=args.policy,
+        think=args.think,
+        bet=args.bet,
+        gui=not args.no_gui,
+        seats_per_shoe=args.seats_per_shoe,
+        seed=args.seed,
+    )
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+Benchmarks for the game's hot paths, run headless with tkinter and pygame stubbed.
+
+Usage:
+    python benchmarks/run.py                        # print results as JSON
+    python benchmarks/run.py --compare              # also check against benchmarks/baseline.json
+    python benchmarks/run.py --save-baseline        # record a new baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+# Keep the sprite atlas out of the user's cache directory
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="blackjack-bench-")
+
+import stubs  # noqa: E402
+
+stubs.install()
+
+import tkinter as tk  # noqa: E402
+
+from components import card_images  # noqa: E402
+from components.deck import Deck  # noqa: E402
+from components.hand import Hand  # noqa: E402
+from main import BlackjackGame  # noqa: E402
+
+BENCHMARKS = {}
+
+
+def benchmark(name, iterations=10_000):
+    """
+    Registers a benchmark. The decorated function returns (setup, call);
+    setup runs untimed before every timed call.
+    """
+    def register(factory):
+        BENCHMARKS[name] = (factory, iterations)
+        return factory
+    return register
+
+
+def percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def run_benchmark(factory, iterations):
+    setup, call = factory()
+    # One untimed call first, so first-call costs such as cold caches aren't counted
+    if setup:
+        setup()
+    call()
+    samples = []
+    # As timeit does, keep the collector from landing a pause in whichever benchmark happens to trigger it
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            if setup:
+                setup()
+            start = time.perf_counter_ns()
+            call()
+            samples.append(time.perf_counter_ns() - start)
+    finally:
+        gc.enable()
+    samples.sort()
+    total = sum(samples)
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / (total / 1e9) if total else float("inf"),
+        "mean_us": total / iterations / 1000,
+        "p50_us": percentile(samples, 0.50) / 1000,
+        "p90_us": percentile(samples, 0.90) / 1000,
+        "p99_us": percentile(samples, 0.99) / 1000,
+        "max_us": samples[-1] / 1000,
+    }
+
+
+def new_game():
+    return BlackjackGame(tk.Tk())
+
+
+def deal(table):
+    # Keep the bankroll topped up so every round can be bet
+    table.balance = 1000
+    table.place_bet(10)
+
+
+def warm_game():
+    # Load every sprite up front so game benchmarks don't include image decoding
+    game = new_game()
+    for key in game.deck.card_images:
+        game.deck.card_images[key]
+    return game
+
+
+def random_hand(rng, deck):
+    hand = Hand()
+    for _ in range(rng.randint(2, 5)):
+        card = deck.draw_card()
+        if card is None:
+            deck.reshuffle()
+            card = deck.draw_card()
+        hand.add_card(card)
+    return hand
+
+
+@benchmark("deck.create_shoe")
+def bench_create_shoe():
+    deck = Deck()
+    return None, deck.create_shoe
+
+
+@benchmark("deck.shuffle")
+def bench_shuffle():
+    deck = Deck()
+    return deck.reshuffle, deck.shuffle
+
+
+@benchmark("deck.draw_card", iterations=100_000)
+def bench_draw_card():
+    deck = Deck()
+
+    def setup():
+        if not len(deck.shoe):
+            deck.reshuffle()
+    return setup, deck.draw_card
+
+
+@benchmark("deck.reshuffle")
+def bench_reshuffle():
+    deck = Deck()
+
+    def setup():
+        for _ in range(100):
+            deck.draw_card()
+    return setup, deck.reshuffle
+
+
+@benchmark("hand.calculate_hand_total", iterations=100_000)
+def bench_calculate_hand_total():
+    deck = Deck()
+    rng = random.Random(1)
+    hands = [random_hand(rng, deck) for _ in range(1000)]
+    state = {"i": 0}
+
+    def setup():
+        state["i"] = (state["i"] + 1) % len(hands)
+    return setup, lambda: hands[state["i"]].calculate_total()
+
+
+@benchmark("hand.add_card", iterations=100_000)
+def bench_hand_add_card():
+    deck = Deck()
+    cards = deck.create_deck()
+    state = {"hand": Hand(), "i": 0}
+
+    def setup():
+        state["i"] = (state["i"] + 1) % len(cards)
+        if len(state["hand"].cards) >= 5:
+            state["hand"] = Hand()
+    return setup, lambda: state["hand"].add_card(cards[state["i"]])
+
+
+@benchmark("game.stand")
+def bench_stand():
+    game = warm_game()
+    return lambda: deal(game.table), game.stand
+
+
+@benchmark("game.determine_winner")
+def bench_determine_winner():
+    table = warm_game().table
+    return lambda: deal(table), table.determine_winner
+
+
+@benchmark("startup.game_init", iterations=200)
+def bench_game_init():
+    def setup():
+        # A fresh process would start with an empty sprite cache
+        card_images._shared_caches.clear()
+    return setup, new_game
+
+
+@benchmark("startup.load_card_images", iterations=200)
+def bench_load_card_images():
+    deck = Deck()
+
+    def call():
+        card_images._shared_caches.clear()
+        images = deck.load_card_images()
+        for key in images:
+            images[key]
+    return None, call
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns the benchmarks that got more than tolerance slower than the baseline.
+
+    Medians are compared rather than means, so a single pause on a busy
+    machine can't fail a short run.
+    """
+    regressions = {}
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base and result["p50_us"] * (1 - tolerance) > base["p50_us"]:
+            regressions[name] = {"baseline_p50_us": base["p50_us"], "p50_us": result["p50_us"]}
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the blackjack benchmarks.")
+    parser.add_argument("names", nargs="*", help="Benchmarks to run (default: all)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", action="store_true", help="Compare against the tracked baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the tracked baseline")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every iteration count")
+    args = parser.parse_args()
+
+    # Build the sprite atlas once so startup benchmarks measure the warm path
+    images = Deck().load_card_images()
+    for key in images:
+        images[key]
+    card_images._shared_caches.clear()
+
+    results = {}
+    for name, (factory, iterations) in BENCHMARKS.items():
+        if args.names and name not in args.names:
+            continue
+        results[name] = run_benchmark(factory, max(1, int(iterations * args.scale)))
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+    exit_code = 0
+    if args.compare and os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            report["regressions"] = compare(results, json.load(f), args.tolerance)
+        exit_code = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            f.write(text + "\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
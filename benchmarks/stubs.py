@@ -0,0 +1,124 @@
+"""
+Headless stand-ins for tkinter and pygame so BlackjackGame can be built without a display or audio device.
+
+Call install() before importing main.
+"""
+import sys
+import types
+
+
+class Widget:
+    """
+    Accepts any widget call and remembers the options it was configured with.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.options = dict(kwargs)
+        self.value = ""
+
+    def __getattr__(self, name):
+        # pack, title, geometry, iconbitmap, ... are all no-ops
+        return lambda *args, **kwargs: None
+
+    def config(self, **kwargs):
+        self.options.update(kwargs)
+
+    configure = config
+
+    def get(self):
+        return self.value
+
+
+class Canvas(Widget):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.items = {}
+        self.next_id = 1
+        self.callbacks = {}
+
+    def create_image(self, x, y, **kwargs):
+        item = self.next_id
+        self.next_id += 1
+        self.items[item] = [x, y, kwargs]
+        return item
+
+    def coords(self, item, *pos):
+        if pos and item in self.items:
+            self.items[item][0:2] = pos
+
+    def move(self, item, dx, dy):
+        if item in self.items:
+            self.items[item][0] += dx
+            self.items[item][1] += dy
+
+    def itemconfigure(self, item, **kwargs):
+        if item in self.items:
+            self.items[item][2].update(kwargs)
+
+    def delete(self, item):
+        if item == "all":
+            self.items.clear()
+        else:
+            self.items.pop(item, None)
+
+    def after(self, ms, callback, *args):
+        # Nothing runs the event loop, so scheduled callbacks are simply recorded
+        after_id = f"after#{len(self.callbacks)}"
+        self.callbacks[after_id] = (callback, args)
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.callbacks.pop(after_id, None)
+
+
+class Sound:
+    def __init__(self, source):
+        self.volume = 1.0
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+    def get_volume(self):
+        return self.volume
+
+
+class Channel:
+    def __init__(self, index):
+        self.index = index
+
+    def play(self, sound):
+        return None
+
+    def get_busy(self):
+        return False
+
+
+def install():
+    """
+    Registers the stub tkinter and pygame modules and stops PIL from creating real Tk images.
+    """
+    from PIL import ImageTk
+    ImageTk.PhotoImage = lambda image: image
+
+    tkinter = types.ModuleType("tkinter")
+    for name in ("Tk", "Toplevel", "Frame", "Label", "Entry", "Button", "Menu", "Scale"):
+        setattr(tkinter, name, type(name, (Widget,), {}))
+    tkinter.Canvas = Canvas
+    tkinter.NW, tkinter.LEFT = "nw", "left"
+    tkinter.NORMAL, tkinter.DISABLED, tkinter.HIDDEN = "normal", "disabled", "hidden"
+    sys.modules["tkinter"] = tkinter
+
+    pygame = types.ModuleType("pygame")
+    pygame.error = type("error", (RuntimeError,), {})
+    pygame.mixer = types.SimpleNamespace(
+        init=lambda *args, **kwargs: None,
+        set_num_channels=lambda count: None,
+        get_init=lambda: (44100, -16, 2),
+        Sound=Sound,
+        Channel=Channel,
+    )
+    pygame.sndarray = types.SimpleNamespace(make_sound=Sound)
+    sys.modules["pygame"] = pygame
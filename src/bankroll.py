@@ -0,0 +1,62 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from components.bankroll import BETTING_STRATEGIES, run_sessions
+from components.rules import NUM_DECKS, RuleSet
+from components.shuffle import DEFAULT_PENETRATION
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play sessions of a betting strategy and report bankroll statistics.")
+    parser.add_argument("--strategy", choices=sorted(BETTING_STRATEGIES), default="flat", help="Betting strategy")
+    parser.add_argument("--sessions", type=int, default=1000, help="Number of sessions to play")
+    parser.add_argument("--rounds", type=int, default=1000, help="Rounds per session")
+    parser.add_argument("--bankroll", type=int, default=1000, help="Starting bankroll of each session")
+    parser.add_argument("--unit", type=int, default=10, help="Base bet")
+    parser.add_argument("--decks", type=int, default=NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--penetration", type=float, default=DEFAULT_PENETRATION,
+                        help="Fraction of the shoe dealt before the cut card")
+    parser.add_argument("--rules", default="{}",
+                        help='JSON object of table rules, e.g. \'{"hit_soft_17": true, "blackjack_pays": "3:2"}\'')
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 for one per CPU)")
+    parser.add_argument("--json", action="store_true", help="Print the full result as JSON")
+    args = parser.parse_args()
+
+    # Always run from a known seed so any run can be reproduced
+    seed = args.seed if args.seed is not None else np.random.SeedSequence().entropy
+
+    rules = RuleSet.from_dict(dict({"num_decks": args.decks, "penetration": args.penetration}, **json.loads(args.rules)))
+
+    start = time.perf_counter()
+    stats = run_sessions(
+        args.sessions,
+        args.rounds,
+        seed,
+        strategy=args.strategy,
+        unit=args.unit,
+        bankroll=args.bankroll,
+        workers=args.workers or None,
+        rules=rules,
+    )
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(dict(stats.as_dict(), seed=seed, seconds=elapsed)))
+        return
+
+    result = stats.as_dict()
+    print(f"Seed: {seed}")
+    print(f"Sessions: {result['sessions']}  Rounds: {result['rounds']}  Wagered: {result['wagered']}")
+    print(f"Net per round: {result['mean_net']:.4f} (std dev {result['std_dev']:.4f})  Edge: {result['edge']:.4%}")
+    print(f"Risk of ruin: {result['risk_of_ruin']:.2%}")
+    print(f"Drawdown: max {result['max_drawdown']}, mean {result['mean_drawdown']:.1f}")
+    print(f"Final bankroll: mean {result['mean_final_bankroll']:.1f}")
+    print(f"Rounds/sec: {result['rounds'] / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
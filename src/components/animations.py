@@ -1,10 +1,300 @@
-import pygame
+"""
+Pygame rendering backend: retained sprites, dirty-rectangle updates and fixed-timestep animation.
+
+Only the parts of the screen that changed since the last frame are
+repainted and sent to the display, so the cost of a frame follows the
+size of the moving cards rather than the size of the screen. Animations
+advance in fixed steps and are drawn interpolated between the last two
+steps, so motion stays smooth and deterministic whatever the frame rate.
+"""
 import time
+from collections.abc import Mapping
+
+import pygame
+
+from components.card_images import CARD_SIZE, SLOT_INDEX, SPRITE_KEYS, SpriteAtlas
+from components.scheduler import Tween
+
+BACKGROUND_COLOR = (0, 128, 0)  # Green for a table
+STEP = 1 / 120  # Length of one animation step, in seconds
+MAX_FRAME_TIME = 0.25  # Longest frame the animator catches up on; beyond this animations slow down
+
+
+class Sprite:
+    """
+    An image on the screen. Use the DirtyRenderer methods to change it so the old area gets repainted.
+    """
+
+    __slots__ = ("image", "pos", "prev_pos", "visible", "drawn")
+
+    def __init__(self, image, pos, visible=True):
+        self.image = image
+        self.pos = pos
+        self.prev_pos = pos  # Position at the previous animation step, for interpolation
+        self.visible = visible
+        self.drawn = None  # Rect covered on screen by the last render
+
+    def rect_at(self, alpha):
+        x = self.prev_pos[0] + (self.pos[0] - self.prev_pos[0]) * alpha
+        y = self.prev_pos[1] + (self.pos[1] - self.prev_pos[1]) * alpha
+        return self.image.get_rect(topleft=(round(x), round(y)))
+
+
+class DirtyRenderer:
+    """
+    Draws sprites in order over a background and updates only the changed areas of the display.
+
+    Args:
+        screen (pygame.Surface): The display surface.
+        background (pygame.Surface): What lies under the sprites; defaults to a table-green fill.
+        repaint (bool): Paint the whole background on the first render. Leave it off if it's already on screen.
+    """
+
+    def __init__(self, screen, background=None, repaint=True):
+        self.screen = screen
+        if background is None:
+            background = pygame.Surface(screen.get_size())
+            background.fill(BACKGROUND_COLOR)
+        self.background = background
+        self.sprites = []  # In drawing order, bottom first
+        self.dirty = []
+        if repaint:
+            self.invalidate()
+
+    def add(self, image, pos=(0, 0), visible=True):
+        sprite = Sprite(image, pos, visible)
+        self.sprites.append(sprite)
+        return sprite
+
+    def remove(self, sprite):
+        self.sprites.remove(sprite)
+        if sprite.drawn is not None:
+            self.dirty.append(sprite.drawn)
+
+    def place(self, sprite, pos):
+        """
+        Moves a sprite to pos straight away, without interpolating from where it was.
+        """
+        sprite.pos = sprite.prev_pos = pos
+
+    def set_image(self, sprite, image):
+        if sprite.image is not image:
+            sprite.image = image
+            if sprite.drawn is not None:
+                self.dirty.append(sprite.drawn)
+                sprite.drawn = None
+
+    def show(self, sprite, visible=True):
+        sprite.visible = visible
+
+    def invalidate(self, rect=None):
+        """
+        Marks an area (or the whole screen) for repainting on the next render.
+        """
+        self.dirty.append(pygame.Rect(rect) if rect is not None else self.screen.get_rect())
+
+    def render(self, alpha=1.0):
+        """
+        Repaints what changed and pushes just those areas to the display.
+
+        Args:
+            alpha (float): How far between the previous and current animation step to draw moving sprites.
+
+        Returns:
+            list: The rects that were updated.
+        """
+        dirty = self.dirty
+        for sprite in self.sprites:
+            rect = sprite.rect_at(alpha) if sprite.visible else None
+            if rect != sprite.drawn:
+                if sprite.drawn is not None:
+                    dirty.append(sprite.drawn)
+                if rect is not None:
+                    dirty.append(rect)
+                sprite.drawn = rect
+        if not dirty:
+            return []
+
+        rects = merge_rects(dirty)
+        self.dirty = []
+        screen = self.screen
+        for rect in rects:
+            screen.set_clip(rect)
+            screen.blit(self.background, rect, rect)
+            for sprite in self.sprites:
+                if sprite.drawn is not None and sprite.drawn.colliderect(rect):
+                    screen.blit(sprite.image, sprite.drawn)
+        screen.set_clip(None)
+        pygame.display.update(rects)
+        return rects
+
+
+def merge_rects(rects):
+    """
+    Merges overlapping rects so no area is repainted twice in a frame.
+    """
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class Animator:
+    """
+    Runs many sprite moves at once on a fixed timestep.
+
+    advance() consumes real frame time in STEP-sized steps and returns how
+    far the clock is into the next step, for DirtyRenderer.render. Moves are
+    queued like AnimationScheduler.move: staggered one after another, but
+    each finishes within budget of being queued.
+    """
+
+    def __init__(self, renderer, step=STEP, duration=0.4, stagger=0.1, budget=0.8):
+        self.renderer = renderer
+        self.step = step
+        self.duration = duration  # Default length of a single move
+        self.stagger = stagger  # Gap between the starts of queued moves
+        self.budget = budget  # Longest a queued move may take to finish
+        self.time = 0.0  # Animation clock, advanced one step at a time
+        self.accumulator = 0.0
+        self.tweens = []
+        self.settling = []  # Sprites that arrived on the last step
+        self.last_start = 0.0
+
+    @property
+    def busy(self):
+        return bool(self.tweens)
+
+    def move(self, sprite, start_pos, end_pos, duration=None, on_start=None, on_done=None):
+        """
+        Queues a move of a sprite, which is hidden until its move starts.
+
+        Args:
+            sprite (Sprite): The sprite to move.
+            start_pos (tuple): Starting position (x, y).
+            end_pos (tuple): Ending position (x, y).
+            duration (float): Length of the move in seconds; defaults to duration.
+            on_start (callable): Called when the sprite starts moving.
+            on_done (callable): Called once the sprite reaches end_pos.
+        """
+        duration = min(self.duration if duration is None else duration, self.budget)
+        start_time = max(self.time, self.last_start + self.stagger)
+        start_time = min(start_time, self.time + self.budget - duration)
+        self.last_start = start_time
+
+        self.renderer.show(sprite, False)
+        self.renderer.place(sprite, start_pos)
+        self.tweens.append(Tween(sprite, start_pos, end_pos, start_time, duration, on_start, on_done))
+
+    def advance(self, frame_time):
+        """
+        Steps every move forward by frame_time seconds of real time.
+
+        Returns:
+            float: Interpolation factor between the last two steps.
+        """
+        self.accumulator += min(frame_time, MAX_FRAME_TIME)
+        while self.accumulator >= self.step:
+            self.accumulator -= self.step
+            self.time += self.step
+            self.update()
+        return self.accumulator / self.step
+
+    def update(self):
+        # Sprites that arrived last step stop interpolating from their previous position
+        for sprite in self.settling:
+            sprite.prev_pos = sprite.pos
+        self.settling = []
+
+        now = self.time
+        running = []
+        finished = []
+        for tween in self.tweens:
+            sprite = tween.item
+            if now < tween.start_time:
+                running.append(tween)
+                continue
+            if not tween.started:
+                tween.started = True
+                self.renderer.show(sprite)
+                if tween.on_start:
+                    tween.on_start()
+            pos, done = tween.position(now)
+            sprite.prev_pos = sprite.pos
+            sprite.pos = pos
+            (finished if done else running).append(tween)
+
+        self.settling = [tween.item for tween in finished]
+        self.tweens = running
+
+        for tween in finished:
+            if tween.on_done:
+                tween.on_done()
+
+    def cancel(self, sprite):
+        """
+        Drops a sprite's queued or running move, leaving the sprite where it is.
+        """
+        self.tweens = [tween for tween in self.tweens if tween.item is not sprite]
+
+    def retarget(self, sprite, end_pos):
+        """
+        Sends a sprite's queued or running move to a new end position.
+
+        Returns:
+            bool: Whether the sprite had a move to retarget.
+        """
+        for tween in self.tweens:
+            if tween.item is sprite:
+                tween.end_pos = end_pos
+                return True
+        return False
+
+    def cancel_all(self):
+        self.tweens = []
+        self.last_start = self.time
+
+
+class SurfaceImages(Mapping):
+    """
+    Card surfaces for pygame, keyed by card tuple or "back", converted from the sprite atlas on first use.
+
+    Needs a display mode to be set, since surfaces are converted to the display format.
+    """
+
+    def __init__(self, size=CARD_SIZE):
+        self.atlas = SpriteAtlas(size)
+        self.surfaces = {}
+
+    def __getitem__(self, key):
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if key not in SLOT_INDEX:
+                raise KeyError(key)
+            image = self.atlas.get(key)
+            surface = pygame.image.frombuffer(image.tobytes(), image.size, "RGBA").convert_alpha()
+            self.surfaces[key] = surface
+        return surface
+
+    def __iter__(self):
+        return iter(SPRITE_KEYS)
+
+    def __len__(self):
+        return len(SPRITE_KEYS)
+
 
 def draw_card_animation(screen, card_image, start_pos, end_pos, duration=1):
     """
     Animates a card moving from start_pos to end_pos on the screen.
 
+    Blocks until the move is done. Only the area the card passes over is
+    repainted, using what was on the screen before as the background.
+
     Args:
         screen (pygame.Surface): The game screen to draw on.
         card_image (pygame.Surface): The image of the card to animate.
@@ -12,26 +302,16 @@ def draw_card_animation(screen, card_image, start_pos, end_pos, duration=1):
         end_pos (tuple): Ending position (x, y) of the card.
         duration (float): Duration of the animation in seconds.
     """
-    clock = pygame.time.Clock()
-    start_time = time.time()
-
-    while True:
-        elapsed_time = time.time() - start_time
-        if elapsed_time > duration:
-            break
-
-        # Calculate the current position based on linear interpolation
-        t = elapsed_time / duration
-        current_x = start_pos[0] + (end_pos[0] - start_pos[0]) * t
-        current_y = start_pos[1] + (end_pos[1] - start_pos[1]) * t
-
-        # Redraw the screen
-        screen.fill((0, 128, 0))  # Example background color (green for a table)
-        screen.blit(card_image, (current_x, current_y))
-        pygame.display.flip()
+    renderer = DirtyRenderer(screen, background=screen.copy(), repaint=False)
+    animator = Animator(renderer, duration=duration, budget=duration)
+    sprite = renderer.add(card_image, start_pos, visible=False)
+    animator.move(sprite, start_pos, end_pos)
 
+    clock = pygame.time.Clock()
+    last = time.perf_counter()
+    while animator.busy:
         clock.tick(60)  # Limit to 60 FPS
-
-    # Ensure the card ends at the final position
-    screen.blit(card_image, end_pos)
-    pygame.display.flip()
\ No newline at end of file
+        now = time.perf_counter()
+        renderer.render(animator.advance(now - last))
+        last = now
+    renderer.render()
@@ -0,0 +1,168 @@
+"""
+Sound effects: a bank of preloaded samples played on a fixed pool of mixer channels.
+
+The mixer is opened on a background thread with a small buffer, started by
+start() once the front end is up (or by the first play()), so neither
+startup nor the game waits for the audio device and a sound starts within a
+few milliseconds of play(). Sounds asked for before the device is ready, or
+when there is no device at all, are skipped rather than queued, since a
+late sound effect is worse than none.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+import pygame
+
+SOUND_DIR = os.path.join(os.path.dirname(__file__), "..", "assets", "sounds")
+
+FREQUENCY = 44100
+BUFFER_SIZE = 256  # Frames per mixer buffer, about 6 ms at 44.1 kHz
+NUM_CHANNELS = 8
+DEFAULT_VOLUME = 0.2
+
+# Sample files by event; events without a file get a synthesized sound
+SAMPLE_FILES = {"deal": "card_draw.wav", "win": "win.wav", "lose": "lose.wav", "shuffle": "shuffle.wav"}
+# When every channel is busy, a sound may only take over a channel playing one of equal or lower priority
+PRIORITIES = {"deal": 1, "shuffle": 2, "lose": 3, "win": 3}
+
+
+def synthesize(name, frequency=FREQUENCY, channels=2):
+    """
+    Returns a simple generated sample for an event, as an int16 array for pygame.sndarray.
+    """
+    def tone(pitch, seconds):
+        t = np.arange(int(seconds * frequency)) / frequency
+        return np.sin(2 * np.pi * pitch * t) * np.exp(-t * 6)
+
+    if name == "win":
+        wave = np.concatenate([tone(660, 0.12), tone(880, 0.25)])  # Rising chime
+    elif name == "lose":
+        wave = np.concatenate([tone(392, 0.15), tone(262, 0.3)])  # Falling tones
+    elif name == "shuffle":
+        rng = np.random.default_rng(0)
+        t = np.arange(int(0.4 * frequency)) / frequency
+        wave = rng.uniform(-1, 1, t.size) * (0.5 + 0.5 * np.sin(2 * np.pi * 18 * t)) * np.exp(-t * 4)  # Riffling cards
+    else:
+        wave = tone(1000, 0.05)
+    samples = (wave * 0.5 * 32767).astype(np.int16)
+    return np.repeat(samples[:, None], channels, axis=1) if channels > 1 else samples
+
+
+_banks = {}
+
+
+def sample_bank(frequency, channels):
+    """
+    Returns every event's decoded Sound for a mixer format, loading them once per process.
+    """
+    bank = _banks.get((frequency, channels))
+    if bank is None:
+        bank = {}
+        for name, filename in SAMPLE_FILES.items():
+            path = os.path.join(SOUND_DIR, filename)
+            if os.path.exists(path):
+                bank[name] = pygame.mixer.Sound(path)
+            else:
+                bank[name] = pygame.sndarray.make_sound(synthesize(name, frequency, channels))
+        _banks[(frequency, channels)] = bank
+    return bank
+
+
+class AudioEngine:
+    """
+    Plays named sound effects with priority-based voice allocation.
+
+    Args:
+        volume (float): Initial volume, 0 to 1.
+        num_channels (int): Size of the channel pool; at most this many sounds play at once.
+        background (bool): Open the audio device on a background thread when start() is
+            called, rather than right away on this one.
+    """
+
+    def __init__(self, volume=DEFAULT_VOLUME, num_channels=NUM_CHANNELS, background=True):
+        self.volume = volume
+        self.num_channels = num_channels
+        self.bank = {}
+        self.voices = []  # Per channel: [priority, start time] of what it last played
+        self.channels = []
+        self.available = False
+        self.ready = threading.Event()
+        self.started = False
+        if not background:
+            self.started = True
+            self.open()
+
+    def start(self):
+        """
+        Starts opening the audio device on a background thread, if that hasn't been done yet.
+        """
+        if not self.started:
+            self.started = True
+            threading.Thread(target=self.open, name="audio-init", daemon=True).start()
+
+    def open(self):
+        """
+        Opens the audio device and decodes every sample. Sets ready when done, even if there's no device.
+        """
+        try:
+            pygame.mixer.init(frequency=FREQUENCY, size=-16, channels=2, buffer=BUFFER_SIZE)
+            pygame.mixer.set_num_channels(self.num_channels)
+            frequency, _, channels = pygame.mixer.get_init()
+            self.bank = sample_bank(frequency, channels)
+            self.set_volume(self.volume)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.num_channels)]
+            self.voices = [[0, 0.0] for _ in self.channels]
+            self.available = True
+        except (pygame.error, OSError) as error:
+            print(f"Sound disabled: {error}")
+        finally:
+            self.ready.set()
+
+    def play(self, name):
+        """
+        Plays a sound effect now, if the device is ready and a channel can be had.
+
+        A free channel is used if there is one. Otherwise the oldest sound of
+        the lowest priority is cut off, as long as it's not more important
+        than the new one.
+
+        Returns:
+            bool: Whether the sound was started.
+        """
+        if not self.available:
+            self.start()
+            return False
+        priority = PRIORITIES[name]
+        victim = None
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                victim = index
+                break
+            voice_priority, started = self.voices[index]
+            if voice_priority <= priority and (
+                victim is None or (voice_priority, started) < tuple(self.voices[victim])
+            ):
+                victim = index
+        if victim is None:
+            return False
+        self.channels[victim].play(self.bank[name])
+        self.voices[victim] = [priority, time.perf_counter()]
+        return True
+
+    def get_volume(self):
+        return self.volume
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for sound in self.bank.values():
+            sound.set_volume(volume)
+
+    def close(self):
+        if not self.started:
+            return
+        self.ready.wait()
+        if self.available:
+            self.available = False
+            pygame.mixer.quit()
@@ -0,0 +1,304 @@
+"""
+Streaming bankroll simulation for betting strategies.
+
+Rounds are played on a real Table, so bets, splits, insurance and payouts
+go through the same accounting as the game, with the player's decisions
+taken from the basic strategy chart. Each round is streamed from a
+generator into running statistics and then dropped, so memory use does
+not depend on how many rounds or sessions are played.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from components.deck import Deck
+from components.rules import NUM_DECKS, RuleSet
+from components.shuffle import CutCardPolicy, DEFAULT_PENETRATION, fast_rng
+from components.strategy import chart_for
+from components.table import Table, INSURANCE, PLAYING_STATES
+
+HISTOGRAM_BINS = 40  # Final bankroll bins between 0 and twice the starting bankroll
+CHUNK_SESSIONS = 100  # Sessions played per task
+
+
+class FlatBet:
+    """
+    Bets the same amount every round.
+    """
+
+    def __init__(self, unit=10):
+        self.unit = unit
+
+    def reset(self):
+        pass
+
+    def next_bet(self, table):
+        return self.unit
+
+    def wants_insurance(self, table):
+        return False
+
+    def settle(self, bet, net):
+        pass
+
+
+class Martingale(FlatBet):
+    """
+    Doubles the bet after every loss and drops back to one unit after a win.
+
+    Args:
+        unit (int): Opening bet.
+        max_bet (int): Table limit; the progression restarts once it would go over.
+    """
+
+    def __init__(self, unit=10, max_bet=None):
+        super().__init__(unit)
+        self.max_bet = max_bet
+        self.bet = unit
+
+    def reset(self):
+        self.bet = self.unit
+
+    def next_bet(self, table):
+        return self.bet
+
+    def settle(self, bet, net):
+        if net < 0:
+            self.bet = bet * 2
+            if self.max_bet is not None and self.bet > self.max_bet:
+                self.bet = self.unit
+        elif net > 0:
+            self.bet = self.unit
+
+
+class CountSpread(FlatBet):
+    """
+    Spreads bets with the Hi-Lo true count: one unit at a true count of 1 or
+    less, then one more unit per point of count, up to max_units.
+
+    Args:
+        unit (int): Minimum bet.
+        max_units (int): Largest bet, in units.
+        insurance_count (float): True count at which insurance is taken.
+    """
+
+    def __init__(self, unit=10, max_units=8, insurance_count=3):
+        super().__init__(unit)
+        self.max_units = max_units
+        self.insurance_count = insurance_count
+
+    def next_bet(self, table):
+        units = min(max(int(table.deck.true_count), 1), self.max_units)
+        return units * self.unit
+
+    def wants_insurance(self, table):
+        return table.deck.true_count >= self.insurance_count
+
+
+BETTING_STRATEGIES = {"flat": FlatBet, "martingale": Martingale, "count": CountSpread}
+
+
+def play_rounds(table, strategy, chart):
+    """
+    Plays rounds at a table until the player can't cover the next bet.
+
+    Yields:
+        tuple: (bet, net, balance) for each round, net being the change in balance.
+    """
+    settled = []
+    table.subscribe(lambda event, data: settled.append(data["net"]) if event == "round_settled" else None)
+    actions = {
+        "hit": table.hit, "stand": table.stand, "double": table.double_down, "split": table.split_hand,
+        "surrender": table.surrender,
+    }
+    while True:
+        bet = min(strategy.next_bet(table), table.balance)
+        if bet < strategy.unit:
+            return  # Ruined
+        table.place_bet(bet)
+        if table.state == INSURANCE and strategy.wants_insurance(table) and table.bet // 2 <= table.balance:
+            table.place_insurance()
+        while table.state in PLAYING_STATES:
+            action = chart.action(
+                table.current_hand,
+                table.dealer_hand.cards[0],
+                can_double=table.can_double,
+                can_split=table.can_split,
+                can_surrender=table.can_surrender,
+            )
+            actions[action]()
+        net = settled.pop()
+        strategy.settle(bet, net)
+        yield bet, net, table.balance
+
+
+class BankrollStats:
+    """
+    Running statistics over rounds and sessions, updated one value at a time.
+
+    Round results use Welford's algorithm for the mean and variance, and
+    each session adds its final bankroll to a fixed-size histogram, so the
+    state is the same size after a thousand rounds or a billion.
+    """
+
+    def __init__(self, bankroll, bins=HISTOGRAM_BINS):
+        self.bankroll = bankroll
+        self.rounds = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        self.wagered = 0
+        self.sessions = 0
+        self.ruined = 0
+        self.max_drawdown = 0
+        self.drawdown_total = 0
+        self.final_total = 0
+        self.histogram = np.zeros(bins, dtype=np.int64)
+
+    def add_round(self, bet, net):
+        self.rounds += 1
+        self.wagered += bet
+        delta = net - self.mean
+        self.mean += delta / self.rounds
+        self.m2 += delta * (net - self.mean)
+
+    def add_session(self, final_balance, drawdown, ruined):
+        self.sessions += 1
+        self.ruined += ruined
+        self.max_drawdown = max(self.max_drawdown, drawdown)
+        self.drawdown_total += drawdown
+        self.final_total += final_balance
+        bins = len(self.histogram)
+        index = int(final_balance * bins // (2 * self.bankroll))
+        self.histogram[min(max(index, 0), bins - 1)] += 1
+
+    def play_session(self, rounds, min_bet):
+        """
+        Consumes a stream of (bet, net, balance) rounds as one session.
+
+        Args:
+            rounds (iterable): The session's rounds, e.g. from play_rounds.
+            min_bet (int): Smallest bet; a session that ends below it counts as ruined.
+        """
+        balance = peak = self.bankroll
+        drawdown = 0
+        for bet, net, balance in rounds:
+            self.add_round(bet, net)
+            if balance > peak:
+                peak = balance
+            elif peak - balance > drawdown:
+                drawdown = peak - balance
+        self.add_session(balance, drawdown, ruined=balance < min_bet)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.rounds - 1) if self.rounds > 1 else 0.0
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def risk_of_ruin(self):
+        return self.ruined / self.sessions if self.sessions else 0.0
+
+    def merge(self, other):
+        """
+        Folds another set of statistics into this one.
+
+        Args:
+            other (BankrollStats): Statistics for the same starting bankroll.
+
+        Returns:
+            BankrollStats: This object, for chaining.
+        """
+        rounds = self.rounds + other.rounds
+        if rounds:
+            delta = other.mean - self.mean
+            self.m2 += other.m2 + delta * delta * self.rounds * other.rounds / rounds
+            self.mean += delta * other.rounds / rounds
+        self.rounds = rounds
+        self.wagered += other.wagered
+        self.sessions += other.sessions
+        self.ruined += other.ruined
+        self.max_drawdown = max(self.max_drawdown, other.max_drawdown)
+        self.drawdown_total += other.drawdown_total
+        self.final_total += other.final_total
+        self.histogram += other.histogram
+        return self
+
+    def as_dict(self):
+        return {
+            "sessions": self.sessions,
+            "rounds": self.rounds,
+            "wagered": self.wagered,
+            "mean_net": self.mean,
+            "std_dev": self.std_dev,
+            "edge": self.mean * self.rounds / self.wagered if self.wagered else 0.0,
+            "risk_of_ruin": self.risk_of_ruin,
+            "max_drawdown": self.max_drawdown,
+            "mean_drawdown": self.drawdown_total / self.sessions if self.sessions else 0.0,
+            "mean_final_bankroll": self.final_total / self.sessions if self.sessions else 0.0,
+            "histogram": self.histogram.tolist(),
+        }
+
+
+def _run_chunk(num_sessions, seed_sequence, strategy_name, unit, bankroll, rounds, rules):
+    deck = Deck(rules.num_decks, rng=fast_rng(seed_sequence), shuffle_policy=CutCardPolicy(rules.penetration))
+    chart = chart_for(rules=rules)
+    strategy = BETTING_STRATEGIES[strategy_name](unit)
+    stats = BankrollStats(bankroll)
+    for _ in range(num_sessions):
+        strategy.reset()
+        deck.reshuffle()
+        table = Table(deck, balance=bankroll, rules=rules)
+        stats.play_session(islice(play_rounds(table, strategy, chart), rounds), unit)
+    return stats
+
+
+def run_sessions(num_sessions, rounds, seed, strategy="flat", unit=10, bankroll=1000, workers=1,
+                 chunk_sessions=CHUNK_SESSIONS, num_decks=NUM_DECKS, penetration=DEFAULT_PENETRATION, rules=None):
+    """
+    Plays many independent sessions of a betting strategy and aggregates them.
+
+    As in parallel.run_parallel, sessions are cut into chunks with their own
+    RNG streams spawned from seed, and chunks are merged in order, so the
+    result for a seed doesn't depend on the number of workers.
+
+    Args:
+        num_sessions (int): Number of sessions to play.
+        rounds (int): Rounds per session; a session ends early if the bankroll is lost.
+        seed (int): Root seed for every chunk's stream.
+        strategy (str): Key of BETTING_STRATEGIES.
+        unit (int): Base bet.
+        bankroll (int): Starting balance of each session.
+        workers (int): Worker processes (None for one per CPU).
+        chunk_sessions (int): Sessions per task.
+        num_decks (int): Number of decks in the shoe.
+        penetration (float): Fraction of the shoe dealt before the cut card.
+        rules (RuleSet): Rules to play by; their deck count and penetration replace num_decks and penetration.
+
+    Returns:
+        BankrollStats: Statistics over every round and session.
+    """
+    rules = rules if rules is not None else RuleSet(num_decks, penetration=penetration)
+    workers = workers or os.cpu_count() or 1
+    num_chunks = -(-num_sessions // chunk_sessions)
+    seeds = np.random.SeedSequence(seed).spawn(num_chunks)
+    args = [
+        (min(chunk_sessions, num_sessions - chunk * chunk_sessions), seed_sequence, strategy, unit, bankroll,
+         rounds, rules)
+        for chunk, seed_sequence in enumerate(seeds)
+    ]
+    stats = BankrollStats(bankroll)
+    if workers == 1:
+        for chunk_args in args:
+            stats.merge(_run_chunk(*chunk_args))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_stats in pool.map(_run_chunk, *zip(*args)):
+            stats.merge(chunk_stats)
+    return stats
@@ -0,0 +1,147 @@
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Mapping
+
+from PIL import Image, ImageTk
+
+from components.metrics import timed
+from components.shoe import CARDS
+
+CARD_SIZE = (100, 150)  # Size the cards are drawn at on the table
+ASSET_PATH = os.path.join(os.path.dirname(__file__), "..", "assets", "cards")
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "blackjack"
+)
+
+# Atlas slots, one per sprite: every card then the card back
+SPRITE_KEYS = CARDS + ("back",)
+SLOT_INDEX = {key: slot for slot, key in enumerate(SPRITE_KEYS)}
+
+# The atlas header holds one stamp per slot: the source PNG's mtime, or 0 for an empty slot
+STAMP = struct.Struct("<q")
+
+
+def sprite_path(key):
+    """
+    Returns the PNG file for a card tuple or "back".
+    """
+    if key == "back":
+        return os.path.join(ASSET_PATH, "card_back.png")
+    rank, suit = key
+    return os.path.join(ASSET_PATH, f"{rank}_of_{suit}.png".lower())
+
+
+class SpriteAtlas:
+    """
+    An on-disk atlas of pre-scaled RGBA sprites.
+
+    Slots are filled the first time a sprite is requested, so the PNGs are
+    decoded and resized once per machine and only for cards that are drawn.
+    Later runs read the raw pixels straight from the memory-mapped file.
+    """
+
+    def __init__(self, size=CARD_SIZE, cache_dir=CACHE_DIR):
+        self.size = size
+        self.slot_size = size[0] * size[1] * 4
+        self.header_size = STAMP.size * len(SPRITE_KEYS)
+        self.path = os.path.join(cache_dir, f"sprites_{size[0]}x{size[1]}.rgba")
+        self.map = self.open_map(cache_dir)
+
+    def open_map(self, cache_dir):
+        """
+        Opens (creating if needed) the atlas file. Returns None if it can't be written.
+        """
+        total_size = self.header_size + self.slot_size * len(SPRITE_KEYS)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(self.path, "a+b") as f:
+                if os.fstat(f.fileno()).st_size != total_size:
+                    f.truncate(0)
+                    f.truncate(total_size)
+                return mmap.mmap(f.fileno(), total_size)
+        except OSError:
+            return None  # Read-only or missing cache directory: decode in memory only
+
+    @timed("card_images.load_sprite")
+    def get(self, key):
+        """
+        Returns the scaled sprite for a card tuple or "back" as a PIL image.
+        """
+        path = sprite_path(key)
+        stamp = os.stat(path).st_mtime_ns
+        if self.map is None:
+            return self.decode(path)
+
+        slot = SLOT_INDEX[key]
+        stamp_offset = slot * STAMP.size
+        offset = self.header_size + slot * self.slot_size
+        if STAMP.unpack_from(self.map, stamp_offset)[0] == stamp:
+            return Image.frombuffer("RGBA", self.size, self.map[offset:offset + self.slot_size], "raw", "RGBA", 0, 1)
+
+        image = self.decode(path)
+        self.map[offset:offset + self.slot_size] = image.tobytes()
+        STAMP.pack_into(self.map, stamp_offset, stamp)  # Written last so a torn write is never trusted
+        return image
+
+    def decode(self, path):
+        with Image.open(path) as image:
+            return image.convert("RGBA").resize(self.size)
+
+
+class SpriteCache:
+    """
+    Process-wide cache of card PhotoImages, shared by every Deck and table.
+    """
+
+    def __init__(self, size=CARD_SIZE):
+        self.size = size
+        self.atlas = None
+        self.photos = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        photo = self.photos.get(key)
+        if photo is None:
+            with self.lock:
+                photo = self.photos.get(key)
+                if photo is None:
+                    if self.atlas is None:
+                        self.atlas = SpriteAtlas(self.size)
+                    photo = ImageTk.PhotoImage(self.atlas.get(key))
+                    self.photos[key] = photo
+        return photo
+
+
+class CardImages(Mapping):
+    """
+    A read-only mapping of card tuple (or "back") to PhotoImage that loads each sprite on first use.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def __getitem__(self, key):
+        if key not in SLOT_INDEX:
+            raise KeyError(key)
+        return self.cache.get(key)
+
+    def __iter__(self):
+        return iter(SPRITE_KEYS)
+
+    def __len__(self):
+        return len(SPRITE_KEYS)
+
+
+_shared_caches = {}
+
+
+def shared_card_images(size=CARD_SIZE):
+    """
+    Returns the process-wide lazy card image mapping for the given sprite size.
+    """
+    cache = _shared_caches.get(size)
+    if cache is None:
+        cache = _shared_caches.setdefault(size, SpriteCache(size))
+    return CardImages(cache)
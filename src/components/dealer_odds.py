@@ -0,0 +1,140 @@
+from functools import lru_cache
+
+from components.rules import BLACKJACK, DEALER_STAND_TOTAL
+from components.shoe import RANKS
+
+# Compositions count the cards left by value: index 0 for Aces, 1-8 for 2-9 and 9 for ten-valued cards
+VALUE_INDEX = {rank: min(index + 1, 9) for index, rank in enumerate(RANKS)}
+VALUE_INDEX['Ace'] = 0
+HARD_VALUES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+FULL_DECK = (4, 4, 4, 4, 4, 4, 4, 4, 4, 16)
+
+# Final dealer results, in the order the distributions are returned
+OUTCOMES = tuple(range(DEALER_STAND_TOTAL, BLACKJACK + 1)) + ("bust",)
+BUST = len(OUTCOMES) - 1
+
+DEALER_CACHE_SIZE = 1 << 16  # Bound on memoized (hand, composition) states
+
+
+def composition_from_cards(cards):
+    """
+    Counts cards by value.
+
+    Args:
+        cards (iterable): (rank, suit) tuples, e.g. Deck.cards.
+
+    Returns:
+        tuple: Ten counts, for Aces, 2-9 and ten-valued cards.
+    """
+    counts = [0] * 10
+    for rank, _ in cards:
+        counts[VALUE_INDEX[rank]] += 1
+    return tuple(counts)
+
+
+def composition_from_shoe(shoe):
+    """
+    Counts the undrawn cards of a Shoe by value, from the shoe's per-rank counts.
+    """
+    counts = shoe.rank_counts
+    # Rank indexes 0-7 are 2-9, 8-11 the ten-valued cards and 12 the Ace
+    return (counts[12], *counts[:8], counts[8] + counts[9] + counts[10] + counts[11])
+
+
+@lru_cache(maxsize=DEALER_CACHE_SIZE)
+def _dealer_distribution(hard, aces, composition, hit_soft_17=False):
+    """
+    Returns the probabilities of each final dealer result from a hand drawing on composition.
+
+    Only whether the hand holds an Ace matters, so aces is a flag to keep the cache small.
+    """
+    total = hard + 10 if aces and hard + 10 <= BLACKJACK else hard
+    outcome = [0.0] * len(OUTCOMES)
+    if total > BLACKJACK:
+        outcome[BUST] = 1.0
+        return tuple(outcome)
+    if total >= DEALER_STAND_TOTAL and not (hit_soft_17 and total == DEALER_STAND_TOTAL and total != hard):
+        outcome[total - DEALER_STAND_TOTAL] = 1.0
+        return tuple(outcome)
+
+    remaining = sum(composition)
+    if remaining == 0:
+        # The table reshuffles an empty shoe mid-hand, so keep drawing from a full deck's proportions
+        return _dealer_distribution(hard, aces, FULL_DECK, hit_soft_17)
+
+    counts = list(composition)
+    for index, count in enumerate(composition):
+        if not count:
+            continue
+        counts[index] = count - 1
+        branch = _dealer_distribution(hard + HARD_VALUES[index], aces or index == 0, tuple(counts), hit_soft_17)
+        counts[index] = count
+        weight = count / remaining
+        for i, p in enumerate(branch):
+            outcome[i] += weight * p
+    return tuple(outcome)
+
+
+def dealer_probabilities(upcard, composition, hit_soft_17=False):
+    """
+    Computes the exact distribution of the dealer's final total.
+
+    The dealer's hole card and any hits are drawn from composition, and the
+    dealer hits below DEALER_STAND_TOTAL as in Table.dealer_turn.
+
+    Args:
+        upcard (tuple or str): The dealer's face-up card, or just its rank.
+        composition (tuple): Cards left in the shoe, from composition_from_cards.
+        hit_soft_17 (bool): The dealer also hits soft 17 (RuleSet.hit_soft_17).
+
+    Returns:
+        tuple: Probabilities for each entry of OUTCOMES (17-21, then bust).
+    """
+    rank = upcard[0] if isinstance(upcard, tuple) else upcard
+    index = VALUE_INDEX[rank]
+    return _dealer_distribution(HARD_VALUES[index], index == 0, tuple(composition), hit_soft_17)
+
+
+def natural_probability(upcard, composition):
+    """
+    Returns the probability that the dealer's hole card makes a natural with upcard.
+
+    The natural is already counted as a 21 by dealer_probabilities.
+    """
+    rank = upcard[0] if isinstance(upcard, tuple) else upcard
+    index = VALUE_INDEX[rank]
+    remaining = sum(composition)
+    if index not in (0, 9) or not remaining:
+        return 0.0
+    return composition[9 - index] / remaining  # A ten under an Ace, or an Ace under a ten
+
+
+def stand_ev(player_total, upcard, composition, hit_soft_17=False, naturals=False):
+    """
+    Returns the expected value of standing, per unit bet, with the 1:1 payouts of Table.determine_winner.
+
+    With naturals (RuleSet.blackjack_pays) a dealer natural beats the player's 21 instead of pushing.
+    """
+    if player_total > BLACKJACK:
+        return -1.0
+    distribution = dealer_probabilities(upcard, composition, hit_soft_17)
+    ev = distribution[BUST]
+    for total, p in zip(OUTCOMES[:BUST], distribution):
+        if player_total > total:
+            ev += p
+        elif player_total < total:
+            ev -= p
+    if naturals and player_total == BLACKJACK:
+        ev -= natural_probability(upcard, composition)
+    return ev
+
+
+def cache_info():
+    """
+    Returns hit/miss statistics for the dealer outcome cache.
+    """
+    return _dealer_distribution.cache_info()
+
+
+def clear_cache():
+    _dealer_distribution.cache_clear()
@@ -1,50 +1,89 @@
-import os
-from PIL import Image, ImageTk
-import random
+from components.card_images import shared_card_images
+from components.metrics import timed
+from components.rules import NUM_DECKS
+from components.shoe import CARDS, RANKS, Shoe
+from components.shuffle import CutCardPolicy
 
 class Deck:
-    def __init__(self, num_decks=8):
+    def __init__(self, num_decks=NUM_DECKS, rng=None, shuffle_policy=None):
         self.num_decks = num_decks  # Number of decks in the shoe
-        self.cards = self.create_shoe()
+        self.rng = rng  # numpy Generator used for shuffling (None for a fresh one)
+        # When to reshuffle between rounds (defaults to a cut card at 75% penetration)
+        self.shuffle_policy = shuffle_policy if shuffle_policy is not None else CutCardPolicy()
+        self.shoe = self.create_shoe()
         self.card_images = self.load_card_images()
-        self.shuffle()
+        self.reshuffle()
+
+    @property
+    def cards(self):
+        """
+        The undrawn cards as (rank, suit) tuples. The next card to be drawn is last.
+        """
+        return [CARDS[code] for code in self.shoe.remaining()[::-1]]
+
+    @property
+    def rank_counts(self):
+        """
+        Undrawn cards per rank, as a dict keyed by rank string.
+        """
+        return dict(zip(RANKS, self.shoe.rank_counts))
+
+    def count_of(self, rank):
+        """
+        Returns how many cards of a rank are left in the shoe.
+        """
+        return self.shoe.rank_counts[RANKS.index(rank)]
+
+    @property
+    def running_count(self):
+        """
+        The Hi-Lo running count of the cards drawn since the last full reshuffle.
+        """
+        return self.shoe.running_count
+
+    @property
+    def true_count(self):
+        return self.shoe.true_count
+
+    @property
+    def decks_remaining(self):
+        return self.shoe.decks_remaining
 
     def create_deck(self):
-        suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
-        return [(rank, suit) for suit in suits for rank in ranks]
+        return list(CARDS)
 
     def create_shoe(self):
-        # Combine multiple decks into a shoe
-        shoe = []
-        for _ in range(self.num_decks):
-            shoe.extend(self.create_deck())
-        return shoe
+        # Combine multiple decks into a compact shoe of card codes
+        return Shoe(self.num_decks, rng=self.rng)
 
+    @timed("deck.load_card_images")
     def load_card_images(self):
         """
-        Loads all card images and the back image into a dictionary.
+        Returns the card images, keyed by card tuple and "back".
+
+        Images come from the process-wide sprite cache and are decoded on first use.
         """
-        card_images = {}
-        base_path = os.path.join(os.path.dirname(__file__), "..", "assets", "cards")
-        for rank, suit in self.create_deck():
-            file_name = f"{rank}_of_{suit}.png".lower()
-            file_path = os.path.join(base_path, file_name)
-            card_images[(rank, suit)] = ImageTk.PhotoImage(Image.open(file_path).resize((100, 150)))
-        card_images["back"] = ImageTk.PhotoImage(
-            Image.open(os.path.join(base_path, "card_back.png")).resize((100, 150))
-        )
-        return card_images
+        return shared_card_images()
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        self.shoe.shuffle()
 
     def draw_card(self):
-        if not self.cards:
+        code = self.shoe.draw()
+        if code is None:
             return None  # Return None if the deck is empty
-        return self.cards.pop()
+        return CARDS[code]
+
+    def end_round(self):
+        """
+        Lets the shuffle policy reshuffle or recycle cards between rounds.
+
+        Returns:
+            bool: True if the whole shoe was reshuffled.
+        """
+        return self.shuffle_policy.end_round(self.shoe)
 
+    @timed("deck.reshuffle")
     def reshuffle(self):
-        # Recreate and shuffle the shoe
-        self.cards = self.create_shoe()
-        self.shuffle()
\ No newline at end of file
+        # Return every card to the shoe and shuffle it in place
+        self.shoe.reshuffle()
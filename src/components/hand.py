@@ -1,27 +1,70 @@
+from components.metrics import timed
+from components.rules import BLACKJACK
+from components.shoe import RANKS
+
+# Value of each rank with Aces counted as 1; one Ace per hand may later count as 11
+HARD_VALUES = {rank: min(index + 2, 10) for index, rank in enumerate(RANKS)}
+HARD_VALUES['Ace'] = 1
+
+
 class Hand:
+    """
+    A hand of (rank, suit) cards that keeps its value up to date as cards are added.
+
+    The hard total (Aces as 1) and the number of Aces are kept as running
+    counts, so the total and the blackjack/bust/pair flags cost the same
+    however many cards the hand holds.
+    """
+
     def __init__(self):
         self.cards = []
+        self.hard_total = 0  # Total with every Ace counted as 1
+        self.aces = 0  # Number of Aces in the hand
 
     def add_card(self, card):
         self.cards.append(card)
+        rank = card[0]
+        self.hard_total += HARD_VALUES[rank]
+        if rank == 'Ace':
+            self.aces += 1
+
+    def pop_card(self):
+        """
+        Removes and returns the last card (used when splitting a hand).
+        """
+        card = self.cards.pop()
+        rank = card[0]
+        self.hard_total -= HARD_VALUES[rank]
+        if rank == 'Ace':
+            self.aces -= 1
+        return card
+
+    @property
+    def is_soft(self):
+        # An Ace can count as 11 without busting
+        return self.aces > 0 and self.hard_total + 10 <= BLACKJACK
+
+    @property
+    @timed("hand.calculate_total")
+    def total(self):
+        return self.hard_total + 10 if self.is_soft else self.hard_total
+
+    @property
+    def is_blackjack(self):
+        return len(self.cards) == 2 and self.total == BLACKJACK
+
+    @property
+    def is_bust(self):
+        return self.hard_total > BLACKJACK
+
+    @property
+    def is_pair(self):
+        return len(self.cards) == 2 and self.cards[0][0] == self.cards[1][0]
 
     def calculate_total(self):
-        total = 0
-        aces = 0
-        for card in self.cards:
-            if card.rank in ['J', 'Q', 'K']:
-                total += 10
-            elif card.rank == 'A':
-                aces += 1
-                total += 11
-            else:
-                total += card.rank
-
-        while total > 21 and aces:
-            total -= 10
-            aces -= 1
-
-        return total
+        return self.total
 
     def clear_hand(self):
-        self.cards = []
\ No newline at end of file
+        self.cards = []
+        self.hard_total = 0
+        self.aces = 0
@@ -0,0 +1,98 @@
+"""
+Precomputed hand-value tables and batch evaluation of many hands at once.
+
+A hand's value only depends on its hard total (Aces as 1) and whether it
+holds an Ace, so every hand is one of a few dozen states. NEXT_STATE maps a
+state and a card's rank index (components.shoe.RANKS order) to the state
+after drawing it, and the STATE_* tables give each state's total, softness
+and bust flag. Adding a card is then a single table lookup, and arrays of
+hands are evaluated with NumPy indexing instead of a Python loop per hand.
+"""
+import numpy as np
+
+from components.rules import BLACKJACK
+from components.shoe import RANKS
+
+RANK_INDEX = {rank: index for index, rank in enumerate(RANKS)}
+RANK_HARD_VALUES = np.array([2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, 1], dtype=np.int16)
+ACE = RANK_INDEX['Ace']
+PAD = len(RANKS)  # Rank index for "no card", leaving the state unchanged
+
+# The highest hard total a hand can reach: hitting a hard 21 with a ten
+MAX_HARD = BLACKJACK + 10
+NUM_STATES = 2 * (MAX_HARD + 1)
+EMPTY_STATE = 0
+
+
+def state_of(hard, has_ace):
+    """
+    Returns the state index of a hand with a hard total and whether it holds an Ace.
+    """
+    return 2 * hard + int(has_ace)
+
+
+def _build_tables():
+    hard = np.arange(NUM_STATES) // 2
+    has_ace = np.arange(NUM_STATES) % 2 == 1
+    soft = has_ace & (hard + 10 <= BLACKJACK)
+    totals = np.where(soft, hard + 10, hard).astype(np.int16)
+    bust = hard > BLACKJACK
+
+    next_state = np.empty((NUM_STATES, PAD + 1), dtype=np.uint8)
+    for state in range(NUM_STATES):
+        for rank in range(PAD):
+            new_hard = hard[state] + RANK_HARD_VALUES[rank]
+            # A busted hand takes no more cards, so its state never changes
+            if bust[state]:
+                next_state[state, rank] = state
+            else:
+                next_state[state, rank] = state_of(new_hard, has_ace[state] or rank == ACE)
+        next_state[state, PAD] = state
+    return next_state, totals, soft, bust
+
+
+NEXT_STATE, STATE_TOTALS, STATE_SOFT, STATE_BUST = _build_tables()
+for _table in (NEXT_STATE, STATE_TOTALS, STATE_SOFT, STATE_BUST):
+    _table.flags.writeable = False  # Shared by every caller; never modified
+
+
+def hand_states(ranks):
+    """
+    Returns the state of every hand in a batch. Cards after a hand busts are ignored, as at the table.
+
+    Args:
+        ranks (numpy.ndarray): An (n_hands, n_cards) array of rank indexes, padded with PAD.
+
+    Returns:
+        numpy.ndarray: n_hands state indexes.
+    """
+    ranks = np.asarray(ranks)
+    states = np.full(ranks.shape[0], EMPTY_STATE, dtype=np.uint8)
+    for column in ranks.T:
+        states = NEXT_STATE[states, column]
+    return states
+
+
+def evaluate(ranks):
+    """
+    Evaluates a batch of hands in one vectorized pass.
+
+    Args:
+        ranks (numpy.ndarray): An (n_hands, n_cards) array of rank indexes, padded with PAD.
+
+    Returns:
+        tuple: Arrays of totals, soft flags and bust flags, one entry per hand.
+    """
+    states = hand_states(ranks)
+    return STATE_TOTALS[states], STATE_SOFT[states], STATE_BUST[states]
+
+
+def rank_matrix(hands):
+    """
+    Packs Hand objects (or lists of (rank, suit) cards) into a padded rank array for evaluate.
+    """
+    hands = [getattr(hand, "cards", hand) for hand in hands]
+    ranks = np.full((len(hands), max((len(cards) for cards in hands), default=0)), PAD, dtype=np.uint8)
+    for row, cards in enumerate(hands):
+        ranks[row, :len(cards)] = [RANK_INDEX[rank] for rank, _ in cards]
+    return ranks
@@ -0,0 +1,178 @@
+"""
+Opt-in instrumentation for the game's hot paths.
+
+Set BLACKJACK_METRICS=1 to turn it on. Instrumentation is decided when a
+module is imported: with it off, timed() hands back the undecorated
+function and nothing is recorded, so a disabled build runs exactly the
+same code as before. With it on, each timed function gets a call count and
+a latency histogram, and the animation scheduler records Tk frame times.
+
+The registry can be written out as JSON or in the Prometheus text format.
+"""
+import bisect
+import functools
+import json
+import os
+import time
+
+ENABLED = os.environ.get("BLACKJACK_METRICS", "") not in ("", "0")
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 0.01, 0.016, 0.025, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+DROPPED_FRAME_FACTOR = 1.5  # A frame this many times longer than planned counts as dropping frames
+
+
+class Histogram:
+    """
+    Counts observations into fixed buckets, keeping their sum for the mean.
+    """
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # The last bucket catches everything over BUCKETS[-1]
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """
+        Returns the upper bound of the bucket holding the q-th quantile (inf if it's past the last bucket).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Registry:
+    """
+    Named latency histograms and counters.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        return histogram
+
+    def increment(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_frame(self, interval, frame_ms):
+        """
+        Records the time between two animation frames and any frames it dropped.
+        """
+        self.histogram("tk.frame_time").observe(interval)
+        frames = interval * 1000 / frame_ms
+        if frames >= DROPPED_FRAME_FACTOR:
+            self.increment("tk.dropped_frames", round(frames) - 1)
+
+    def snapshot(self):
+        return {
+            "time": time.time(),
+            "histograms": {
+                name: {
+                    "count": h.count,
+                    "sum": h.sum,
+                    "mean": h.mean,
+                    "p50": h.quantile(0.5),
+                    "p99": h.quantile(0.99),
+                    "buckets": dict(zip([str(bound) for bound in BUCKETS] + ["+Inf"], h.counts)),
+                }
+                for name, h in sorted(self.histograms.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        for name, h in sorted(self.histograms.items()):
+            metric = f"blackjack_{name.replace('.', '_')}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(BUCKETS, h.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {h.count}')
+            lines.append(f"{metric}_sum {h.sum}")
+            lines.append(f"{metric}_count {h.count}")
+        for name, value in sorted(self.counters.items()):
+            metric = f"blackjack_{name.replace('.', '_')}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def format_table(self):
+        """
+        Returns a plain-text summary, one line per metric, for the stats panel.
+        """
+        lines = [f"{'metric':<28}{'calls':>9}{'mean ms':>10}{'p50 ms':>9}{'p99 ms':>9}"]
+        for name, h in sorted(self.histograms.items()):
+            lines.append(
+                f"{name:<28}{h.count:>9}{h.mean * 1000:>10.3f}{h.quantile(0.5) * 1000:>9.3f}{h.quantile(0.99) * 1000:>9.3f}"
+            )
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:<28}{value:>9}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """
+        Writes the metrics to path, as Prometheus text for .prom files and JSON otherwise.
+
+        The file is replaced in one step, so a scraper never reads a half-written dump.
+        """
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+
+
+REGISTRY = Registry()
+
+
+def timed(name):
+    """
+    Decorator recording a function's calls and latency under name, if instrumentation is enabled.
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+        histogram = REGISTRY.histogram(name)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorate
@@ -0,0 +1,515 @@
+"""
+A table where several seats play one round together against one dealer.
+
+Table is a single player's game. MultiSeatTable deals every seat that bet
+and the dealer from one shoe, lets the seats act in seat order, plays the
+dealer's hand once for everyone and settles each seat against it. It is
+the table behind the multiplayer server; like Table it has no UI and no
+clock, so whoever hosts it decides when betting closes and when a seat has
+taken too long (see server.TableRoom).
+"""
+from components.deck import Deck
+from components.hand import Hand
+from components.rules import DEFAULT_RULES
+from components.seat import Seat, SEAT_HANDS, OUTCOME_NAMES, SURRENDER, STOOD, BUST, DOUBLED, SURRENDERED
+from components.shuffle import CutCardPolicy
+from components.table import (
+    InvalidAction, BETTING, DEALING, INSURANCE, PLAYER_TURN, SPLIT_HAND, DEALER_TURN, SETTLE, PLAYING_STATES,
+    STARTING_BALANCE,
+)
+
+SEATS = 5
+
+
+class Player:
+    """
+    The player at one seat: balance, this round's bets and hands.
+    """
+
+    def __init__(self, balance, max_hands):
+        self.balance = balance
+        self.bet = 0  # Bet placed for the next or current round (0 while sitting out)
+        self.insurance_bet = 0
+        self.seat = Seat(max_hands)
+        self.in_round = False  # Dealt into the round being played
+
+
+class MultiSeatTable:
+    """
+    Several seats and one dealer playing rounds together.
+
+    Seats bet while the table is betting; the round is dealt as soon as
+    every seated player has bet, or when deal() is called (e.g. by a betting
+    timer), and seats without a bet sit it out. Seats then act one at a
+    time, in seat order, with the same actions as Table: hit, stand,
+    double_down, split_hand, surrender, place_insurance and fold, each
+    taking the seat index. turn is the seat whose turn it is. After the last
+    seat the dealer plays and every seat is settled.
+
+    Listeners are called as listener(seat, event, data). Events about one
+    player carry their seat and the same data as the matching Table event
+    (bet_placed, card_dealt, hit, stood, bust, doubled, hand_split,
+    next_hand_started, surrendered, folded, insurance_placed, hand_settled,
+    insurance_settled and round_settled, the last three sent per seat).
+    Table-wide events carry seat None: state_changed, round_started (seats),
+    the dealer's card_dealt, insurance_offered, hole_card_revealed and
+    reshuffled. In addition:
+
+        sat             balance            (seat)
+        left                               (seat)
+        turn_started    hand               (seat)
+
+    Args:
+        seats (int): Number of seats.
+        deck (Deck): The shoe (defaults to a new one for the rules).
+        rules (RuleSet): Rules to play by (defaults to the house rules).
+        rng (numpy.random.Generator): Generator for a default deck.
+    """
+
+    def __init__(self, seats=SEATS, deck=None, rules=None, rng=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        if deck is None:
+            deck = Deck(self.rules.num_decks, rng=rng, shuffle_policy=CutCardPolicy(self.rules.penetration))
+        self.deck = deck
+        self.players = [None] * seats
+        self.listeners = []
+        self.state = BETTING
+        self.turn = None
+        self.dealer_hand = Hand()
+        self.insurance_open = False
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def emit(self, seat, event, **data):
+        for listener in self.listeners:
+            listener(seat, event, data)
+
+    def set_state(self, state):
+        self.state = state
+        self.emit(None, "state_changed", state=state)
+
+    def require(self, *states):
+        if self.state not in states:
+            raise InvalidAction(f"Can't do that while the table is in the {self.state.replace('_', ' ')} state.")
+
+    def player(self, seat):
+        player = self.players[seat] if 0 <= seat < len(self.players) else None
+        if player is None:
+            raise InvalidAction("Nobody is sitting in that seat.")
+        return player
+
+    def require_turn(self, seat):
+        """
+        Returns the player at seat if it is their turn to act.
+        """
+        self.require(*PLAYING_STATES)
+        if seat != self.turn:
+            raise InvalidAction("It isn't your turn.")
+        return self.players[seat]
+
+    def in_round(self, seat):
+        player = self.players[seat]
+        return player is not None and player.in_round
+
+    @property
+    def full(self):
+        return all(player is not None for player in self.players)
+
+    def sit(self, seat=None, balance=STARTING_BALANCE):
+        """
+        Seats a player, at the given seat or the first free one. They join the next round dealt.
+
+        Returns:
+            int: The seat.
+        """
+        if seat is None:
+            if self.full:
+                raise InvalidAction("Table is full.")
+            seat = self.players.index(None)
+        elif self.players[seat] is not None:
+            raise InvalidAction("That seat is taken.")
+        self.players[seat] = Player(balance, self.rules.max_hands)
+        self.emit(seat, "sat", balance=balance)
+        return seat
+
+    def leave(self, seat):
+        """
+        Removes a player. Bets still in play are forfeited, and if it was their turn, play moves on.
+        """
+        player = self.player(seat)
+        self.players[seat] = None
+        self.emit(seat, "left")
+        if not player.in_round:
+            if self.state == BETTING and player.bet:
+                self.deal_if_everyone_bet()
+            return
+        if seat == self.turn:
+            self.next_turn()
+        elif self.state in PLAYING_STATES and not any(self.in_round(index) for index in range(len(self.players))):
+            self.end_round()
+
+    # Player handles
+
+    def hand_name(self, player):
+        return SEAT_HANDS[min(player.seat.active, player.seat.num_hands - 1)]
+
+    def current_hand(self, seat):
+        return self.player(seat).seat.current
+
+    def hands(self, seat):
+        seat = self.player(seat).seat
+        return seat.hands[:seat.num_hands]
+
+    def hand_named(self, seat, hand_name):
+        if hand_name == "dealer":
+            return self.dealer_hand
+        return self.player(seat).seat.hands[SEAT_HANDS.index(hand_name)]
+
+    def can_double(self, seat):
+        player = self.players[seat]
+        return (
+            self.state in PLAYING_STATES
+            and seat == self.turn
+            and len(player.seat.current.cards) == 2
+            and self.rules.allows_double(player.seat.current.total, after_split=player.seat.num_hands > 1)
+            and player.seat.current_bet <= player.balance
+        )
+
+    def can_split(self, seat):
+        player = self.players[seat]
+        return (
+            self.state in PLAYING_STATES
+            and seat == self.turn
+            and player.seat.can_split
+            and player.seat.current_bet <= player.balance
+        )
+
+    def can_surrender(self, seat):
+        player = self.players[seat]
+        return (
+            self.state in PLAYING_STATES
+            and seat == self.turn
+            and self.rules.surrender
+            and player.seat.num_hands == 1
+            and len(player.seat.hands[0].cards) == 2
+            and not player.insurance_bet
+        )
+
+    # Dealing
+
+    def draw_card(self):
+        """
+        Draws a card, rebuilding the shoe only if it runs out mid-round.
+        """
+        card = self.deck.draw_card()
+        if card is None:
+            self.deck.reshuffle()
+            self.emit(None, "reshuffled")
+            card = self.deck.draw_card()
+        return card
+
+    def deal_to(self, seat, hand_name, face_up=True):
+        hand = self.hand_named(seat, hand_name)
+        card = self.draw_card()
+        hand.add_card(card)
+        self.emit(seat, "card_dealt", hand=hand_name, card=card, index=len(hand.cards) - 1, face_up=face_up)
+        return card
+
+    def place_bet(self, seat, bet):
+        """
+        Places a seat's bet for the next round, dealing it once every seated player has bet.
+        """
+        self.require(BETTING)
+        player = self.player(seat)
+        if player.bet:
+            raise InvalidAction("You have already bet on this round.")
+        if bet <= 0:
+            raise InvalidAction("Bet must be greater than 0.")
+        if bet > player.balance:
+            raise InvalidAction("Insufficient balance!")
+
+        player.bet = bet
+        player.balance -= bet
+        self.emit(seat, "bet_placed", bet=bet, balance=player.balance)
+        self.deal_if_everyone_bet()
+
+    def deal_if_everyone_bet(self):
+        if all(player is None or player.bet for player in self.players) and any(self.players):
+            self.deal()
+
+    def deal(self):
+        """
+        Deals a round to every seat that has bet, and the dealer.
+        """
+        self.require(BETTING)
+        seats = [index for index, player in enumerate(self.players) if player is not None and player.bet]
+        if not seats:
+            raise InvalidAction("Nobody has bet yet.")
+        self.set_state(DEALING)
+
+        for index in seats:
+            player = self.players[index]
+            player.seat.reset(player.bet)
+            player.insurance_bet = 0
+            player.in_round = True
+        self.dealer_hand = Hand()
+        self.emit(None, "round_started", seats=seats)
+
+        # One card to each seat and the dealer, then a second, the dealer's face down
+        for index in seats:
+            self.deal_to(index, "player")
+        upcard = self.deal_to(None, "dealer")
+        for index in seats:
+            self.deal_to(index, "player")
+        self.deal_to(None, "dealer", face_up=False)
+
+        # A natural is paid without playing
+        if self.rules.pays_naturals:
+            for index in seats:
+                if self.players[index].seat.natural:
+                    self.players[index].seat.finish(STOOD)
+
+        self.insurance_open = upcard[0] == "Ace" and self.rules.insurance
+        if self.insurance_open:
+            self.emit(None, "insurance_offered")
+        self.turn = -1
+        self.next_turn()
+
+    def next_turn(self):
+        """
+        Passes the turn to the next seat with a hand to play, or to the dealer after the last.
+        """
+        for index in range(self.turn + 1, len(self.players)):
+            player = self.players[index]
+            if player is not None and player.in_round and not player.seat.done:
+                self.turn = index
+                self.emit(index, "turn_started", hand=self.hand_name(player))
+                self.set_state(INSURANCE if self.insurance_open else PLAYER_TURN)
+                return
+        self.turn = None
+        if any(self.in_round(index) for index in range(len(self.players))):
+            self.dealer_turn()
+        else:
+            # Everyone surrendered, folded or left; the hole card is still shown, for the round log
+            self.emit(None, "hole_card_revealed", card=self.dealer_hand.cards[1], total=self.dealer_hand.total)
+            self.end_round()
+
+    def play_on(self):
+        """
+        Closes insurance for the seat acting: any action but insurance declines it.
+        """
+        if self.state == INSURANCE:
+            self.set_state(PLAYER_TURN)
+
+    # Player actions
+
+    def place_insurance(self, seat):
+        """
+        Places an insurance bet of half the seat's bet, before it plays on. It pays 2:1 if the dealer has blackjack.
+        """
+        player = self.require_turn(seat)
+        if self.state != INSURANCE:
+            raise InvalidAction("Insurance isn't on offer.")
+        insurance_bet = player.bet // 2
+        if insurance_bet > player.balance:
+            raise InvalidAction("Insufficient balance for insurance!")
+
+        player.insurance_bet = insurance_bet
+        player.balance -= insurance_bet
+        self.emit(seat, "insurance_placed", insurance_bet=insurance_bet, balance=player.balance)
+        self.play_on()
+
+    def split_hand(self, seat):
+        """
+        Splits the seat's current hand in two if its two cards are of the same rank.
+        """
+        player = self.require_turn(seat)
+        hands = player.seat
+        if not hands.current.is_pair:
+            raise InvalidAction("Cannot split: Cards must be of the same rank.")
+        if hands.num_hands == len(hands.hands):
+            raise InvalidAction("Cannot split: No more hands allowed.")
+        if hands.current_bet > player.balance:
+            raise InvalidAction("Insufficient balance to split!")
+
+        hand_name = self.hand_name(player)
+        new_index = hands.split()
+        player.balance -= hands.bets[new_index]
+        self.emit(
+            seat,
+            "hand_split",
+            hand=hand_name,
+            new_hand=SEAT_HANDS[new_index],
+            card=hands.hands[new_index].cards[0],
+            bet=hands.bets[new_index],
+            balance=player.balance,
+        )
+        self.play_on()
+
+    def hit(self, seat):
+        """
+        Draws another card to the seat's current hand.
+        """
+        player = self.require_turn(seat)
+        self.play_on()
+        hand_name = self.hand_name(player)
+        self.emit(seat, "hit", hand=hand_name)
+        self.deal_to(seat, hand_name)
+        if player.seat.current.is_bust:
+            self.emit(seat, "bust", hand=hand_name)
+            self.finish_hand(seat, BUST)
+
+    def double_down(self, seat):
+        """
+        Doubles the bet on the seat's current two-card hand, draws exactly one more card and stands.
+        """
+        player = self.require_turn(seat)
+        hands = player.seat
+        if len(hands.current.cards) != 2:
+            raise InvalidAction("You can only double down on two cards.")
+        if not self.rules.allows_double(hands.current.total, after_split=hands.num_hands > 1):
+            raise InvalidAction("The table rules don't allow doubling on this hand.")
+        if hands.current_bet > player.balance:
+            raise InvalidAction("Insufficient balance to double down!")
+        self.play_on()
+
+        hand_name = self.hand_name(player)
+        player.balance -= hands.double()
+        self.emit(seat, "doubled", hand=hand_name, bet=hands.current_bet, balance=player.balance)
+        self.deal_to(seat, hand_name)
+        if hands.current.is_bust:
+            self.emit(seat, "bust", hand=hand_name)
+            self.finish_hand(seat, BUST)
+        else:
+            self.finish_hand(seat, DOUBLED)
+
+    def stand(self, seat):
+        """
+        Stands on the seat's current hand.
+        """
+        player = self.require_turn(seat)
+        self.play_on()
+        self.emit(seat, "stood", hand=self.hand_name(player))
+        self.finish_hand(seat, STOOD)
+
+    def finish_hand(self, seat, status):
+        """
+        Moves on to the seat's next hand after a split, or else to the next seat.
+        """
+        hands = self.players[seat].seat
+        hands.finish(status)
+        if not hands.done:
+            self.set_state(SPLIT_HAND)
+            self.emit(seat, "next_hand_started", hand=self.hand_name(self.players[seat]))
+            return
+        self.next_turn()
+
+    def surrender(self, seat):
+        """
+        Gives up the seat's first two cards for half its bet back (rounded down), if the rules allow it.
+        """
+        player = self.require_turn(seat)
+        if not self.rules.surrender:
+            raise InvalidAction("The table rules don't allow surrender.")
+        if player.seat.num_hands > 1 or len(player.seat.hands[0].cards) != 2:
+            raise InvalidAction("You can only surrender your first two cards.")
+        if player.insurance_bet:
+            raise InvalidAction("Cannot surrender after taking insurance.")
+
+        refund = player.bet // 2
+        player.seat.finish(SURRENDERED)
+        self.emit(seat, "surrendered", hand="player")
+        player.balance += refund
+        self.emit(
+            seat,
+            "hand_settled",
+            hand="player",
+            outcome=OUTCOME_NAMES[SURRENDER],
+            total=player.seat.hands[0].total,
+            dealer_total=None,
+            payout=refund,
+        )
+        self.leave_round(seat, refund - player.bet)
+
+    def fold(self, seat):
+        """
+        Gives up the seat's round. Every bet it has on the table is lost.
+        """
+        player = self.require_turn(seat)
+        self.emit(seat, "folded")
+        self.leave_round(seat, -(player.seat.total_bet + player.insurance_bet))
+
+    def leave_round(self, seat, net):
+        """
+        Settles a seat that is out of the round before the dealer plays, and passes the turn on.
+        """
+        player = self.players[seat]
+        player.in_round = False
+        player.bet = 0
+        self.emit(seat, "round_settled", balance=player.balance, net=net)
+        self.next_turn()
+
+    # Dealer and settlement
+
+    def dealer_turn(self):
+        """
+        Reveals the dealer's face-down card and draws until the rules say to stand.
+        """
+        self.set_state(DEALER_TURN)
+        self.emit(None, "hole_card_revealed", card=self.dealer_hand.cards[1], total=self.dealer_hand.total)
+
+        # The dealer only plays if some hand is still standing that isn't an already decided natural
+        rules = self.rules
+        playing = [player.seat for player in self.players if player is not None and player.in_round]
+        if any(seat.any_standing and not (rules.pays_naturals and seat.natural) for seat in playing):
+            while rules.dealer_hits(self.dealer_hand.total, self.dealer_hand.is_soft):
+                self.deal_to(None, "dealer")
+
+        self.determine_winner()
+
+    def determine_winner(self):
+        """
+        Settles every seat in the round against the dealer, then returns to betting.
+        """
+        self.set_state(SETTLE)
+        dealer_total = self.dealer_hand.total
+        dealer_natural = self.dealer_hand.is_blackjack
+        for index, player in enumerate(self.players):
+            if player is None or not player.in_round:
+                continue
+            start_balance = player.balance
+            staked = player.seat.total_bet + player.insurance_bet
+            results = player.seat.settle(dealer_total, dealer_natural, self.rules.blackjack_pays)
+            for hand, (outcome, payout) in enumerate(results):
+                player.balance += payout
+                self.emit(
+                    index,
+                    "hand_settled",
+                    hand=SEAT_HANDS[hand],
+                    outcome=OUTCOME_NAMES[outcome],
+                    total=player.seat.hands[hand].total,
+                    dealer_total=dealer_total,
+                    payout=payout,
+                )
+            if player.insurance_bet:
+                payout = player.insurance_bet * 3 if dealer_natural else 0  # Insurance pays 2:1
+                player.balance += payout
+                self.emit(index, "insurance_settled", won=dealer_natural, payout=payout)
+            player.in_round = False
+            player.bet = 0
+            self.emit(index, "round_settled", balance=player.balance, net=player.balance - start_balance - staked)
+        self.end_round()
+
+    def end_round(self):
+        """
+        Runs the shoe's shuffle policy, now that every card is back from the seats, and reopens betting.
+        """
+        self.turn = None
+        self.insurance_open = False
+        if self.deck.end_round():
+            self.emit(None, "reshuffled")
+        self.set_state(BETTING)
@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from components.rules import NUM_DECKS, DEALER_STAND_TOTAL
+from components.shuffle import DEFAULT_PENETRATION
+from components.simulation import SimulationResult, simulate
+from components.variants import install, tables_for
+
+CHUNK_ROUNDS = 1_000_000  # Rounds simulated per task
+
+
+def _run_chunk(num_rounds, seed_sequence, num_decks, num_shoes, player_stand_on, penetration, policy, rules):
+    rng = np.random.default_rng(seed_sequence)
+    return simulate(
+        num_rounds, num_decks, num_shoes, player_stand_on, rng=rng, penetration=penetration, policy=policy, rules=rules
+    )
+
+
+def run_parallel(num_rounds, seed, workers=None, chunk_rounds=CHUNK_ROUNDS, num_decks=NUM_DECKS,
+                 num_shoes=4096, player_stand_on=DEALER_STAND_TOTAL, penetration=DEFAULT_PENETRATION,
+                 on_progress=None, policy=None, rules=None):
+    """
+    Simulates rounds across a pool of worker processes.
+
+    The run is cut into fixed-size chunks, each with its own RNG stream
+    spawned from seed, and the chunk results are merged as they arrive. Only
+    the aggregated counts cross process boundaries, and since merging just
+    adds integers the result is the same for a given seed however many
+    workers are used.
+
+    Args:
+        num_rounds (int): Number of rounds to play.
+        seed (int): Root seed; every chunk's stream is derived from it.
+        workers (int): Number of processes (defaults to the CPU count).
+        chunk_rounds (int): Rounds per task.
+        num_decks (int): Number of decks in each shoe.
+        num_shoes (int): Shoes simulated side by side within a task.
+        player_stand_on (int): Total at which the simulated player stops hitting.
+        penetration (float): Fraction of each shoe dealt before it is replaced.
+        on_progress (callable): Called with the running SimulationResult after each chunk.
+        policy (PlayerPolicy): How the player plays; defaults to hitting below player_stand_on.
+        rules (RuleSet): Rules to play by; their deck count and penetration replace num_decks and penetration.
+
+    Returns:
+        SimulationResult: Counts for all rounds played.
+    """
+    workers = workers or os.cpu_count() or 1
+    num_chunks = -(-num_rounds // chunk_rounds)
+    seeds = np.random.SeedSequence(seed).spawn(num_chunks)
+    result = SimulationResult()
+
+    if workers == 1:
+        # Same chunks and streams as a pool run, without the process overhead
+        for chunk, seed_sequence in enumerate(seeds):
+            rounds = min(chunk_rounds, num_rounds - chunk * chunk_rounds)
+            result.merge(_run_chunk(
+                rounds, seed_sequence, num_decks, num_shoes, player_stand_on, penetration, policy, rules
+            ))
+            if on_progress:
+                on_progress(result)
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk, seed_sequence in enumerate(seeds):
+            rounds = min(chunk_rounds, num_rounds - chunk * chunk_rounds)
+            pending.add(pool.submit(
+                _run_chunk, rounds, seed_sequence, num_decks, num_shoes, player_stand_on, penetration, policy, rules
+            ))
+            # Keep a couple of tasks queued per worker rather than submitting the whole run up front
+            if len(pending) >= 2 * workers:
+                pending = _merge_completed(pending, result, on_progress)
+        while pending:
+            pending = _merge_completed(pending, result, on_progress)
+    return result
+
+
+def _run_variant_chunk(num_rounds, seed_sequence, rules, num_shoes):
+    rng = np.random.default_rng(seed_sequence)
+    return simulate(num_rounds, num_shoes=num_shoes, rng=rng, tables=tables_for(rules))
+
+
+def run_sweep(rule_sets, num_rounds, seed, workers=None, chunk_rounds=CHUNK_ROUNDS, num_shoes=4096,
+              on_progress=None):
+    """
+    Simulates basic strategy under each of many rule variants across a pool of worker processes.
+
+    Every variant's tables (components.variants) are built, or read from the
+    cache, once in this process before any rounds are played, and handed to
+    each worker once as it starts, so tasks carry nothing but a RuleSet.
+    Every variant plays the same chunk seeds, spawned from seed, so
+    differences between variants aren't drowned in unrelated shuffles, and
+    as in run_parallel the results don't depend on the number of workers.
+
+    Args:
+        rule_sets (list): RuleSets to simulate, e.g. from RuleSet.grid.
+        num_rounds (int): Rounds to play per variant.
+        seed (int): Root seed for every chunk's stream.
+        workers (int): Number of processes (defaults to the CPU count).
+        chunk_rounds (int): Rounds per task.
+        num_shoes (int): Shoes simulated side by side within a task.
+        on_progress (callable): Called with the variant's index and running SimulationResult after each chunk.
+
+    Returns:
+        list: A SimulationResult per rule set, in order.
+    """
+    rule_sets = list(rule_sets)
+    tables = [tables_for(rules) for rules in rule_sets]
+    workers = workers or os.cpu_count() or 1
+    num_chunks = -(-num_rounds // chunk_rounds)
+    seeds = np.random.SeedSequence(seed).spawn(num_chunks)
+    tasks = [
+        (index, (min(chunk_rounds, num_rounds - chunk * chunk_rounds), seed_sequence, rules, num_shoes))
+        for index, rules in enumerate(rule_sets)
+        for chunk, seed_sequence in enumerate(seeds)
+    ]
+    results = [SimulationResult() for _ in rule_sets]
+
+    def merge(index, result):
+        results[index].merge(result)
+        if on_progress:
+            on_progress(index, results[index])
+
+    if workers == 1:
+        for index, args in tasks:
+            merge(index, _run_variant_chunk(*args))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=install, initargs=(tables,)) as pool:
+        pending = {}
+        for index, args in tasks:
+            pending[pool.submit(_run_variant_chunk, *args)] = index
+            # Keep a couple of tasks queued per worker rather than submitting the whole sweep up front
+            while len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(pending.pop(future), future.result())
+        for future in list(pending):
+            merge(pending.pop(future), future.result())
+    return results
+
+
+def _merge_completed(pending, result, on_progress):
+    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        result.merge(future.result())
+        if on_progress:
+            on_progress(result)
+    return pending
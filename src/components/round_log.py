@@ -0,0 +1,230 @@
+"""
+Append-only binary log of everything that happens at a table, and a memory-mapped reader for it.
+
+A log file is a 16-byte header followed by 32-byte records:
+
+    time_ns  uint64  wall-clock time of the event
+    round    uint64  round number, counting on from the end of the existing file
+    balance  int64   player's balance after the event
+    amount   int32   bet, payout or net result, depending on kind
+    kind     uint8   KIND_* constant
+    hand     uint8   HAND_* constant
+    card     uint8   card code (components.shoe.CARDS), or NO_CARD
+    code     uint8   action, outcome or face-up flag, depending on kind
+"""
+import os
+import struct
+import time
+
+import numpy as np
+
+from components.shoe import CARD_CODES
+
+MAGIC = b"BJRLOG\x00\x01"
+HEADER = struct.Struct("<8sII")  # Magic, record size, reserved
+RECORD = struct.Struct("<QQqiBBBB")
+RECORD_DTYPE = np.dtype([
+    ("time_ns", "<u8"),
+    ("round", "<u8"),
+    ("balance", "<i8"),
+    ("amount", "<i4"),
+    ("kind", "u1"),
+    ("hand", "u1"),
+    ("card", "u1"),
+    ("code", "u1"),
+])
+
+# Record kinds
+KIND_BET = 1  # amount: bet
+KIND_CARD = 2  # hand, card (NO_CARD if face down), code: 1 if face up
+KIND_HIT = 3  # hand
+KIND_STAND = 4  # hand
+KIND_INSURANCE = 5  # amount: insurance bet
+KIND_SPLIT = 6  # hand: the new hand, card: the card moved to it, amount: its bet
+KIND_FOLD = 7
+KIND_REVEAL = 8  # card: dealer's hole card
+KIND_HAND_SETTLED = 9  # hand, code: OUTCOME_*, amount: payout
+KIND_INSURANCE_SETTLED = 10  # code: 1 if it paid, amount: payout
+KIND_ROUND_SETTLED = 11  # amount: net result of the round
+KIND_RESHUFFLE = 12
+KIND_DOUBLE = 13  # hand, amount: the hand's bet after doubling
+KIND_SURRENDER = 14  # hand
+
+HANDS = {"player": 0, "second": 1, "dealer": 2, "third": 3, "fourth": 4}
+HAND_NONE = 255
+NO_CARD = 255
+
+OUTCOMES = {"lose": 0, "push": 1, "win": 2, "blackjack": 3, "surrender": 4}
+
+
+class RoundRecorder:
+    """
+    Writes a table's events to an append-only round log.
+
+    Records for a round are packed into a reusable buffer and written with a
+    single call when the round settles (or the buffer fills), so recording
+    costs one struct pack per event. Subscribe it to a Table:
+
+        recorder = RoundRecorder("table.bjlog")
+        table.subscribe(recorder)
+    """
+
+    def __init__(self, path, buffer_records=1024, flush_each_round=True):
+        self.path = path
+        self.flush_each_round = flush_each_round  # Flush to the OS after every round for the audit trail
+        self.buffer = bytearray(RECORD.size * buffer_records)
+        self.used = 0
+        self.balance = 0
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            self.truncate_torn_tail(path)
+        self.round = 0 if new_file else self.last_round(path) + 1
+        self.file = open(path, "ab")
+        if new_file:
+            self.file.write(HEADER.pack(MAGIC, RECORD.size, 0))
+
+    @staticmethod
+    def truncate_torn_tail(path):
+        """
+        Cuts off a record left half-written by a crash, so appended records stay aligned.
+        """
+        with open(path, "r+b") as f:
+            check_header(f.read(HEADER.size))
+            size = os.fstat(f.fileno()).st_size
+            end = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size
+            if end != size:
+                f.truncate(end)
+
+    @staticmethod
+    def last_round(path):
+        """
+        Returns the round number of the last whole record in a log, or -1 if it has none.
+        """
+        with open(path, "rb") as f:
+            check_header(f.read(HEADER.size))
+            count = (os.fstat(f.fileno()).st_size - HEADER.size) // RECORD.size
+            if not count:
+                return -1
+            f.seek(HEADER.size + (count - 1) * RECORD.size)
+            return RECORD.unpack(f.read(RECORD.size))[1]
+
+    def record(self, kind, amount=0, hand=HAND_NONE, card=NO_CARD, code=0):
+        if self.used == len(self.buffer):
+            self.flush()
+        RECORD.pack_into(self.buffer, self.used, time.time_ns(), self.round, self.balance, amount, kind, hand, card, code)
+        self.used += RECORD.size
+
+    def __call__(self, event, data):
+        """
+        Table listener: turns an event into a record.
+        """
+        if event == "card_dealt":
+            card = CARD_CODES[data["card"]] if data["face_up"] else NO_CARD
+            self.record(KIND_CARD, hand=HANDS[data["hand"]], card=card, code=int(data["face_up"]))
+        elif event == "bet_placed":
+            self.balance = data["balance"]
+            self.record(KIND_BET, amount=data["bet"])
+        elif event == "hit":
+            self.record(KIND_HIT, hand=HANDS[data["hand"]])
+        elif event == "stood":
+            self.record(KIND_STAND, hand=HANDS[data["hand"]])
+        elif event == "insurance_placed":
+            self.balance = data["balance"]
+            self.record(KIND_INSURANCE, amount=data["insurance_bet"])
+        elif event == "hand_split":
+            self.balance = data["balance"]
+            self.record(KIND_SPLIT, amount=data["bet"], hand=HANDS[data["new_hand"]], card=CARD_CODES[data["card"]])
+        elif event == "doubled":
+            self.balance = data["balance"]
+            self.record(KIND_DOUBLE, amount=data["bet"], hand=HANDS[data["hand"]])
+        elif event == "folded":
+            self.record(KIND_FOLD)
+        elif event == "surrendered":
+            self.record(KIND_SURRENDER, hand=HANDS[data["hand"]])
+        elif event == "hole_card_revealed":
+            self.record(KIND_REVEAL, hand=HANDS["dealer"], card=CARD_CODES[data["card"]])
+        elif event == "hand_settled":
+            self.balance += data["payout"]
+            self.record(KIND_HAND_SETTLED, amount=data["payout"], hand=HANDS[data["hand"]], code=OUTCOMES[data["outcome"]])
+        elif event == "insurance_settled":
+            self.balance += data["payout"]
+            self.record(KIND_INSURANCE_SETTLED, amount=data["payout"], code=int(data["won"]))
+        elif event == "round_settled":
+            self.balance = data["balance"]
+            self.record(KIND_ROUND_SETTLED, amount=data["net"])
+            self.round += 1
+            if self.flush_each_round:
+                self.flush()
+        elif event == "reshuffled":
+            self.record(KIND_RESHUFFLE)
+
+    def flush(self):
+        if self.used:
+            self.file.write(memoryview(self.buffer)[:self.used])
+            self.used = 0
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def check_header(header):
+    if len(header) < HEADER.size:
+        raise ValueError("Not a round log: file is too short.")
+    magic, record_size, _ = HEADER.unpack(header)
+    if magic != MAGIC or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError("Not a round log, or written by an incompatible version.")
+
+
+class RoundLog:
+    """
+    Read-only view of a round log as a NumPy structured array.
+
+    The file is memory-mapped, so opening it is instant and queries only
+    touch the pages they read. A record half-written by a live recorder at
+    the end of the file is ignored.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            check_header(f.read(HEADER.size))
+        count = (os.path.getsize(path) - HEADER.size) // RECORD_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.empty(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def of_kind(self, kind):
+        """
+        Returns the records of one KIND_* as a structured array.
+        """
+        return self.records[self.records["kind"] == kind]
+
+    @property
+    def num_rounds(self):
+        return int(np.count_nonzero(self.records["kind"] == KIND_ROUND_SETTLED))
+
+    def net_results(self):
+        """
+        Returns every settled round's net result, in round order.
+        """
+        return self.of_kind(KIND_ROUND_SETTLED)["amount"]
+
+    def outcome_counts(self):
+        """
+        Returns how many hands were won, lost and pushed.
+        """
+        codes = np.bincount(self.of_kind(KIND_HAND_SETTLED)["code"], minlength=len(OUTCOMES))
+        return {outcome: int(codes[code]) for outcome, code in OUTCOMES.items()}
+
+    def card_counts(self):
+        """
+        Returns how often each card code was dealt face up or revealed.
+        """
+        cards = self.records["card"][np.isin(self.records["kind"], (KIND_CARD, KIND_REVEAL))]
+        return np.bincount(cards[cards != NO_CARD], minlength=len(CARD_CODES))
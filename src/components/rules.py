@@ -0,0 +1,208 @@
+"""
+Table rules shared by the GUI and the headless simulators.
+
+The constants are the fixed facts of the game. RuleSet describes the parts
+that vary between tables (decks, the dealer's soft 17, payouts, doubling,
+splitting, surrender and penetration); the defaults are the house rules
+this table has always played.
+"""
+import itertools
+from fractions import Fraction
+
+from components.shuffle import DEFAULT_PENETRATION
+
+NUM_DECKS = 8  # Number of decks in the shoe
+BLACKJACK = 21  # Highest total before a hand busts
+DEALER_STAND_TOTAL = 17  # Dealer hits while below this total
+MAX_CARDS_PER_HAND = 21  # Most cards any hand can hold without busting: 21 Aces, from six decks or more
+MAX_HANDS = 4  # Most hands a seat can split into, counting the original
+
+
+def max_cards_per_hand(num_decks=NUM_DECKS):
+    """
+    Returns the most cards a hand dealt from num_decks decks can hold without busting.
+
+    That's as many of the shoe's lowest cards as add up to 21: eleven from a
+    single deck (A,A,A,A,2,2,2,2,3,3,3), up to MAX_CARDS_PER_HAND from six decks.
+    """
+    total = cards = 0
+    for value in range(1, 10):
+        count = min(4 * num_decks, (BLACKJACK - total) // value)
+        total += count * value
+        cards += count
+    return cards
+
+
+def parse_payout(payout):
+    """
+    Returns a payout ratio such as "3:2", 1.5 or Fraction(6, 5) as a Fraction, or None for None.
+    """
+    if payout is None:
+        return None
+    if isinstance(payout, str):
+        won, _, staked = payout.partition(":")
+        ratio = Fraction(int(won), int(staked or 1))
+    else:
+        ratio = Fraction(payout).limit_denominator(100)
+    if ratio <= 0:
+        raise ValueError(f"Payout must be positive: {payout}")
+    return ratio
+
+
+class RuleSet:
+    """
+    One variant of the game's rules, declared as plain values.
+
+    Rule sets are immutable and hashable, so they key the caches of
+    per-variant tables (components.variants), and as_dict/from_dict turn them
+    into JSON for sweep configurations.
+
+    Args:
+        num_decks (int): Number of decks in the shoe.
+        hit_soft_17 (bool): The dealer hits soft 17 (H17) rather than standing on every 17 (S17).
+        blackjack_pays (str or Fraction): What a natural pays, e.g. "3:2" or "6:5". A natural then
+            beats any other 21 and a dealer natural beats every player hand, doubles and splits
+            included, since the dealer doesn't peek. None, the house rule, treats naturals as
+            ordinary 21s paid 1:1.
+        double_on (tuple): Totals a two-card hand may double on, e.g. (9, 10, 11); None for any.
+        double_after_split (bool): Split hands may double.
+        max_hands (int): Most hands a seat can split into, up to MAX_HANDS; 1 disables splitting.
+        surrender (bool): The player may give up half the bet instead of playing the first two cards.
+        insurance (bool): Insurance is offered when the dealer shows an Ace.
+        penetration (float): Fraction of the shoe dealt before the cut card.
+    """
+
+    __slots__ = (
+        "num_decks", "hit_soft_17", "blackjack_pays", "double_on", "double_after_split", "max_hands",
+        "surrender", "insurance", "penetration",
+    )
+
+    def __init__(self, num_decks=NUM_DECKS, hit_soft_17=False, blackjack_pays=None, double_on=None,
+                 double_after_split=True, max_hands=MAX_HANDS, surrender=False, insurance=True,
+                 penetration=DEFAULT_PENETRATION):
+        if num_decks < 1:
+            raise ValueError("A shoe needs at least one deck.")
+        if not 1 <= max_hands <= MAX_HANDS:
+            raise ValueError(f"max_hands must be between 1 and {MAX_HANDS}.")
+        if not 0 < penetration <= 1:
+            raise ValueError("Penetration must be between 0 and 1.")
+        values = (
+            int(num_decks),
+            bool(hit_soft_17),
+            parse_payout(blackjack_pays),
+            None if double_on is None else tuple(sorted(set(double_on))),
+            bool(double_after_split),
+            int(max_hands),
+            bool(surrender),
+            bool(insurance),
+            float(penetration),
+        )
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RuleSet is immutable; use replace() for a variant.")
+
+    @property
+    def key(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, RuleSet) and self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        changed = {name: value for name, value in self.as_dict().items() if value != DEFAULT_RULES_DICT[name]}
+        return "RuleSet(" + ", ".join(f"{name}={value!r}" for name, value in changed.items()) + ")"
+
+    def __reduce__(self):
+        return (RuleSet, self.key)
+
+    def replace(self, **changes):
+        """
+        Returns a copy with some rules changed.
+        """
+        return RuleSet.from_dict(dict(self.as_dict(), **changes))
+
+    def as_dict(self):
+        """
+        Returns the rules as JSON-friendly values, as accepted by from_dict.
+        """
+        rules = {name: getattr(self, name) for name in self.__slots__}
+        if self.blackjack_pays is not None:
+            rules["blackjack_pays"] = f"{self.blackjack_pays.numerator}:{self.blackjack_pays.denominator}"
+        if self.double_on is not None:
+            rules["double_on"] = list(self.double_on)
+        return rules
+
+    @classmethod
+    def from_dict(cls, rules):
+        unknown = set(rules) - set(cls.__slots__)
+        if unknown:
+            raise ValueError(f"Unknown rules: {', '.join(sorted(unknown))}")
+        return cls(**rules)
+
+    @classmethod
+    def grid(cls, base=None, **options):
+        """
+        Returns every combination of the given rule values, for parameter sweeps.
+
+        Args:
+            base (RuleSet): Rules left unchanged by options (defaults to the house rules).
+            **options: A list of values for each rule to vary, e.g. num_decks=[1, 6, 8].
+
+        Returns:
+            list: RuleSets, varying the last option fastest.
+        """
+        base = base if base is not None else RuleSet()
+        names = list(options)
+        return [base.replace(**dict(zip(names, values))) for values in itertools.product(*options.values())]
+
+    @property
+    def pays_naturals(self):
+        return self.blackjack_pays is not None
+
+    @property
+    def strategy_key(self):
+        """
+        A short name for the rules that change basic strategy, e.g. "6d-h17-nat-sur", for cache files.
+
+        Rules that don't change the chart (payout ratios, insurance and
+        penetration) are left out, so variants that only differ in those share
+        a chart. So are the defaults for doubling after splits and the split
+        limit, which keeps the house rules' key short.
+        """
+        parts = [f"{self.num_decks}d"]
+        if self.hit_soft_17:
+            parts.append("h17")
+        if self.pays_naturals:
+            parts.append("nat")
+        if self.double_on is not None:
+            parts.append("d" + ".".join(str(total) for total in self.double_on))
+        if self.surrender:
+            parts.append("sur")
+        if not self.double_after_split:
+            parts.append("nodas")
+        if self.max_hands != MAX_HANDS:
+            parts.append(f"sp{self.max_hands}")
+        return "-".join(parts)
+
+    def dealer_hits(self, total, soft):
+        """
+        Returns whether the dealer draws to a hand with this total.
+        """
+        return total < DEALER_STAND_TOTAL or (self.hit_soft_17 and soft and total == DEALER_STAND_TOTAL)
+
+    def allows_double(self, total, after_split=False):
+        """
+        Returns whether a two-card hand with this total may double.
+        """
+        if after_split and not self.double_after_split:
+            return False
+        return self.double_on is None or total in self.double_on
+
+
+DEFAULT_RULES = RuleSet()
+DEFAULT_RULES_DICT = DEFAULT_RULES.as_dict()
@@ -0,0 +1,147 @@
+import time
+
+from components import metrics
+
+
+class Tween:
+    """
+    A canvas item moving in a straight line between two points.
+    """
+
+    __slots__ = ("item", "start_pos", "end_pos", "start_time", "duration", "started", "on_start", "on_done")
+
+    def __init__(self, item, start_pos, end_pos, start_time, duration, on_start=None, on_done=None):
+        self.item = item
+        self.start_pos = start_pos
+        self.end_pos = end_pos
+        self.start_time = start_time
+        self.duration = duration
+        self.started = False
+        self.on_start = on_start
+        self.on_done = on_done
+
+    def position(self, now):
+        """
+        Returns the item's position at time now and whether the move has finished.
+        """
+        t = (now - self.start_time) / self.duration if self.duration > 0 else 1.0
+        if t >= 1.0:
+            return self.end_pos, True
+        x = self.start_pos[0] + (self.end_pos[0] - self.start_pos[0]) * t
+        y = self.start_pos[1] + (self.end_pos[1] - self.start_pos[1]) * t
+        return (x, y), False
+
+
+class AnimationScheduler:
+    """
+    Runs canvas tweens from the Tk event loop with after() instead of blocking.
+
+    Every active tween is advanced in a single tick per frame, so Tk redraws
+    once per frame however many cards are moving. Moves queued in quick
+    succession are staggered, but never so much that the last one finishes
+    more than budget_ms after it was queued.
+    """
+
+    def __init__(self, canvas, frame_ms=16, duration_ms=400, stagger_ms=100, budget_ms=800):
+        self.canvas = canvas
+        self.frame_ms = frame_ms  # Time between frames
+        self.duration_ms = duration_ms  # Default length of a single move
+        self.stagger_ms = stagger_ms  # Gap between the starts of queued moves
+        self.budget_ms = budget_ms  # Longest a queued move may take to finish
+        self.tweens = []
+        self.last_start = 0.0
+        self.after_id = None
+        self.last_tick = None  # Time of the previous frame while animating, for frame-time metrics
+
+    @property
+    def busy(self):
+        return bool(self.tweens)
+
+    def move(self, item, start_pos, end_pos, duration_ms=None, on_start=None, on_done=None):
+        """
+        Queues a move of a canvas item and returns immediately.
+
+        The item is hidden until its move starts.
+
+        Args:
+            item (int): The canvas item to move.
+            start_pos (tuple): Starting position (x, y) of the item.
+            end_pos (tuple): Ending position (x, y) of the item.
+            duration_ms (int): Length of the move; defaults to duration_ms.
+            on_start (callable): Called when the item starts moving.
+            on_done (callable): Called once the item reaches end_pos.
+        """
+        now = time.perf_counter()
+        duration = min(self.duration_ms if duration_ms is None else duration_ms, self.budget_ms) / 1000
+        # Stagger behind the previous move, but finish within the budget
+        start_time = max(now, self.last_start + self.stagger_ms / 1000)
+        start_time = min(start_time, now + self.budget_ms / 1000 - duration)
+        self.last_start = start_time
+
+        self.canvas.itemconfigure(item, state="hidden")
+        self.canvas.coords(item, *start_pos)
+        self.tweens.append(Tween(item, start_pos, end_pos, start_time, duration, on_start, on_done))
+        if self.after_id is None:
+            self.after_id = self.canvas.after(0, self.tick)
+
+    @metrics.timed("scheduler.tick")
+    def tick(self):
+        """
+        Advances every active tween by one frame.
+        """
+        self.after_id = None
+        now = time.perf_counter()
+        if metrics.ENABLED and self.last_tick is not None:
+            metrics.REGISTRY.record_frame(now - self.last_tick, self.frame_ms)
+        running = []
+        finished = []
+        for tween in self.tweens:
+            if now < tween.start_time:
+                running.append(tween)
+                continue
+            if not tween.started:
+                tween.started = True
+                self.canvas.itemconfigure(tween.item, state="normal")
+                if tween.on_start:
+                    tween.on_start()
+            pos, done = tween.position(now)
+            self.canvas.coords(tween.item, *pos)
+            (finished if done else running).append(tween)
+        self.tweens = running
+
+        for tween in finished:
+            if tween.on_done:
+                tween.on_done()
+        if self.tweens and self.after_id is None:
+            self.after_id = self.canvas.after(self.frame_ms, self.tick)
+        self.last_tick = now if self.after_id is not None else None
+
+    def cancel(self, item):
+        """
+        Drops an item's queued or running move, leaving the item where it is.
+        """
+        self.tweens = [tween for tween in self.tweens if tween.item != item]
+
+    def retarget(self, item, end_pos):
+        """
+        Sends an item's queued or running move to a new end position.
+
+        Returns:
+            bool: Whether the item had a move to retarget.
+        """
+        for tween in self.tweens:
+            if tween.item == item:
+                tween.end_pos = end_pos
+                return True
+        return False
+
+    def cancel_all(self):
+        """
+        Drops every queued and running tween without finishing them.
+        """
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        self.tweens = []
+        self.last_start = 0.0
+        self.last_tick = None
@@ -0,0 +1,358 @@
+"""
+A player's seat: up to MAX_HANDS hands with their bets and statuses, in storage allocated up front.
+
+Splitting moves a card into the next unused hand slot rather than creating
+a hand, so a seat allocates nothing per split however often it resplits.
+Seat serves a single Table with Hand objects; SeatArray keeps the hands of
+many seats in NumPy arrays, as hand_values states, so a simulation plays
+splits and doubles at every seat with a few array operations per step.
+"""
+import math
+
+import numpy as np
+
+from components.hand import Hand
+from components.hand_values import EMPTY_STATE, NEXT_STATE, STATE_BUST, STATE_TOTALS
+from components.rules import BLACKJACK, MAX_HANDS
+
+# Names of a seat's hands in events, in the order they are played
+SEAT_HANDS = ("player", "second", "third", "fourth")[:MAX_HANDS]
+
+# Hand statuses
+PLAYING = 0  # Being played, or waiting its turn after a split
+STOOD = 1
+BUST = 2
+DOUBLED = 3  # Took one card at twice the bet
+SURRENDERED = 4  # Gave up half the bet instead of playing
+
+# Settlement outcomes, as codes for SeatArray and by name for Table events
+LOSE = 0
+PUSH = 1
+WIN = 2
+NATURAL = 3  # A natural, paid at the rules' blackjack payout
+SURRENDER = 4
+OUTCOME_NAMES = ("lose", "push", "win", "blackjack", "surrender")
+
+
+def payout_units(blackjack_pays=None, surrender=False):
+    """
+    Returns each outcome's net result per unit bet, as whole numbers of a fraction of the bet.
+
+    Keeping payouts such as 6:5 as integers lets simulations add up results
+    exactly, whatever order chunks are merged in.
+
+    Returns:
+        tuple: The net results (numpy.ndarray indexed by outcome code) and the
+        number of units per bet they are counted in.
+    """
+    scale = math.lcm(blackjack_pays.denominator if blackjack_pays is not None else 1, 2 if surrender else 1)
+    natural = blackjack_pays * scale if blackjack_pays is not None else scale
+    units = np.array([-scale, 0, scale, int(natural), -scale // 2], dtype=np.int64)
+    units.flags.writeable = False
+    return units, scale
+
+
+DEFAULT_PAYOUTS, _ = payout_units()
+
+
+def settle_hand(total, bust, bet, dealer_total):
+    """
+    Returns the outcome and payout (returned stake included) of one hand against the dealer.
+    """
+    if bust:
+        return LOSE, 0  # A busted hand loses even if the dealer busts
+    if dealer_total > BLACKJACK or total > dealer_total:
+        return WIN, bet * 2  # Player wins double the bet
+    if total < dealer_total:
+        return LOSE, 0  # Player loses the bet (balance already deducted)
+    return PUSH, bet  # Return the bet on a tie
+
+
+def natural_payout(bet, blackjack_pays):
+    """
+    Returns what a winning natural pays back, stake included, rounding the winnings down.
+    """
+    return bet + bet * blackjack_pays.numerator // blackjack_pays.denominator
+
+
+class Seat:
+    """
+    One player's hands at a Table.
+
+    The Hand objects are created once and cleared each round. Hands are
+    played in slot order; active is the slot being played, and equals
+    num_hands once every hand is finished.
+
+    Args:
+        max_hands (int): Most hands the seat can split into.
+    """
+
+    __slots__ = ("hands", "bets", "status", "num_hands", "active")
+
+    def __init__(self, max_hands=MAX_HANDS):
+        self.hands = [Hand() for _ in range(max_hands)]
+        self.bets = [0] * max_hands
+        self.status = [PLAYING] * max_hands
+        self.num_hands = 1
+        self.active = 0
+
+    def reset(self, bet=0):
+        """
+        Clears the hands for a new round with one hand carrying bet.
+        """
+        for index in range(self.num_hands):
+            self.hands[index].clear_hand()
+        self.bets[0] = bet
+        self.status[0] = PLAYING
+        self.num_hands = 1
+        self.active = 0
+
+    @property
+    def current(self):
+        """
+        The hand being played, or the last hand once all are finished.
+        """
+        return self.hands[min(self.active, self.num_hands - 1)]
+
+    @property
+    def current_bet(self):
+        return self.bets[min(self.active, self.num_hands - 1)]
+
+    @property
+    def done(self):
+        return self.active >= self.num_hands
+
+    @property
+    def total_bet(self):
+        return sum(self.bets[index] for index in range(self.num_hands))
+
+    @property
+    def can_split(self):
+        return not self.done and self.num_hands < len(self.hands) and self.hands[self.active].is_pair
+
+    @property
+    def any_standing(self):
+        """
+        Whether any hand is still in the round, so the dealer has to play.
+        """
+        return any(self.status[index] in (STOOD, DOUBLED) for index in range(self.num_hands))
+
+    @property
+    def natural(self):
+        """
+        Whether the seat holds a natural: two cards totalling 21, not from a split.
+        """
+        return self.num_hands == 1 and self.hands[0].is_blackjack
+
+    def split(self):
+        """
+        Moves the current hand's second card into the next free slot, with an equal bet.
+
+        Returns:
+            int: The new hand's slot.
+        """
+        index = self.num_hands
+        card = self.hands[self.active].pop_card()
+        self.hands[index].add_card(card)
+        self.bets[index] = self.bets[self.active]
+        self.status[index] = PLAYING
+        self.num_hands += 1
+        return index
+
+    def double(self):
+        """
+        Doubles the current hand's bet.
+
+        Returns:
+            int: The amount added.
+        """
+        bet = self.bets[self.active]
+        self.bets[self.active] += bet
+        return bet
+
+    def finish(self, status):
+        """
+        Marks the current hand finished and moves on to the next.
+        """
+        self.status[self.active] = status
+        self.active += 1
+
+    def settle(self, dealer_total, dealer_natural=False, blackjack_pays=None):
+        """
+        Settles every hand against the dealer's total in one pass.
+
+        Args:
+            dealer_total (int): The dealer's final total.
+            dealer_natural (bool): Whether the dealer holds a natural.
+            blackjack_pays (Fraction): What a natural pays, or None if naturals are ordinary 21s.
+
+        Returns:
+            list: (outcome, payout) for each hand, in slot order.
+        """
+        if blackjack_pays is not None:
+            if self.natural:
+                if dealer_natural:
+                    return [(PUSH, self.bets[0])]
+                return [(NATURAL, natural_payout(self.bets[0], blackjack_pays))]
+            if dealer_natural:
+                return [(LOSE, 0)] * self.num_hands  # The dealer didn't peek, so doubles and splits are lost too
+        results = []
+        for index in range(self.num_hands):
+            hand = self.hands[index]
+            results.append(settle_hand(hand.total, hand.is_bust, self.bets[index], dealer_total))
+        return results
+
+
+class SeatArray:
+    """
+    The hands of many seats in NumPy arrays, for simulations that play every seat in lockstep.
+
+    Arrays have a row per seat and a column per hand slot. Hands are
+    hand_values states, cards are rank indexes and bets are in units of the
+    initial bet. Methods take arrays of seat rows, or of hand indexes into the
+    flattened arrays (row * max_hands + slot), so a step can work on just the
+    seats still acting. Seats left out of reset have no hands this round.
+
+    Args:
+        num_seats (int): Number of seats.
+        max_hands (int): Most hands a seat can split into.
+    """
+
+    def __init__(self, num_seats, max_hands=MAX_HANDS):
+        shape = (num_seats, max_hands)
+        self.max_hands = max_hands
+        self.slots = np.arange(max_hands)
+        self.states = np.zeros(shape, dtype=np.uint8)
+        self.first_ranks = np.zeros(shape, dtype=np.uint8)  # Rank of each hand's first card
+        self.num_cards = np.zeros(shape, dtype=np.uint8)
+        self.pairs = np.zeros(shape, dtype=bool)  # Two cards of one rank; only tracked if seats can split
+        self.bets = np.zeros(shape, dtype=np.int64)
+        self.status = np.zeros(shape, dtype=np.uint8)
+        self.num_hands = np.zeros(num_seats, dtype=np.intp)
+        self.active = np.zeros(num_seats, dtype=np.intp)
+        # Flat views, indexed by hand index
+        self.hand_states = self.states.reshape(-1)
+        self.hand_first_ranks = self.first_ranks.reshape(-1)
+        self.hand_num_cards = self.num_cards.reshape(-1)
+        self.hand_pairs = self.pairs.reshape(-1)
+        self.hand_bets = self.bets.reshape(-1)
+        self.hand_status = self.status.reshape(-1)
+
+    def reset(self, rows):
+        """
+        Starts a round at the given seats, each with one empty hand and a bet of one unit.
+        """
+        self.states.fill(EMPTY_STATE)
+        self.num_cards.fill(0)
+        self.pairs.fill(False)
+        self.status.fill(PLAYING)
+        self.bets.fill(0)
+        self.bets[rows, 0] = 1
+        self.num_hands.fill(0)
+        self.num_hands[rows] = 1
+        self.active.fill(0)
+
+    def current_hands(self, rows):
+        """
+        Returns the hand index of the hand being played at each of the given seats.
+        """
+        return rows * self.max_hands + self.active[rows]
+
+    def deal(self, hands, ranks):
+        """
+        Adds a card of each rank to the matching hand.
+        """
+        count = self.hand_num_cards[hands]
+        self.hand_states[hands] = NEXT_STATE[self.hand_states[hands], ranks]
+        self.hand_num_cards[hands] = count + 1
+        if self.max_hands > 1:
+            first = self.hand_first_ranks[hands]
+            self.hand_first_ranks[hands] = np.where(count == 0, ranks, first)
+            self.hand_pairs[hands] = (count == 1) & (ranks == first)
+
+    def split(self, rows):
+        """
+        Splits the current hand at the given seats, moving its second card to a new hand with an equal bet.
+        """
+        slot = self.active[rows]
+        new = self.num_hands[rows]
+        rank = self.first_ranks[rows, slot]  # Both cards of a pair share the rank
+        for column in (slot, new):
+            self.states[rows, column] = NEXT_STATE[EMPTY_STATE, rank]
+            self.first_ranks[rows, column] = rank
+            self.num_cards[rows, column] = 1
+            self.pairs[rows, column] = False
+            self.status[rows, column] = PLAYING
+        self.bets[rows, new] = self.bets[rows, slot]
+        self.num_hands[rows] += 1
+
+    def double(self, rows):
+        """
+        Doubles the current hand's bet at the given seats.
+        """
+        self.hand_bets[self.current_hands(rows)] *= 2
+
+    def finish(self, rows, status):
+        """
+        Marks the current hand at the given seats finished with status and moves on.
+        """
+        self.hand_status[self.current_hands(rows)] = status
+        self.active[rows] += 1
+
+    def done(self, rows):
+        """
+        Returns which of the given seats have finished every hand.
+        """
+        return self.active[rows] >= self.num_hands[rows]
+
+    def hand_mask(self):
+        """
+        Returns which slots hold a hand this round.
+        """
+        return self.slots < self.num_hands[:, None]
+
+    def any_standing(self):
+        """
+        Returns which seats still have a hand in the round, so the dealer has to play.
+        """
+        return (self.hand_mask() & ((self.status == STOOD) | (self.status == DOUBLED))).any(axis=1)
+
+    def naturals(self):
+        """
+        Returns which seats hold a natural on their unsplit first hand.
+        """
+        return (self.num_hands == 1) & (self.num_cards[:, 0] == 2) & (STATE_TOTALS[self.states[:, 0]] == BLACKJACK)
+
+    def settle(self, dealer_states, payouts=DEFAULT_PAYOUTS, dealer_naturals=None):
+        """
+        Settles every hand at every seat against its dealer in one pass.
+
+        Args:
+            dealer_states (numpy.ndarray): The dealer's final state per seat.
+            payouts (numpy.ndarray): Net result per unit bet of each outcome, from payout_units.
+            dealer_naturals (numpy.ndarray): Which dealers hold a natural, if naturals are paid
+                (RuleSet.blackjack_pays); None settles naturals as ordinary 21s.
+
+        Returns:
+            tuple: Outcome codes and net results in the units of payouts, both
+            per slot, and the mask of slots that hold a hand.
+        """
+        hands = self.hand_mask()
+        totals = STATE_TOTALS[self.states]
+        standing = hands & ((self.status == STOOD) | (self.status == DOUBLED))
+        dealer_totals = STATE_TOTALS[dealer_states][:, None]
+        dealer_bust = STATE_BUST[dealer_states][:, None]
+        wins = standing & (dealer_bust | (totals > dealer_totals))
+        pushes = standing & ~dealer_bust & (totals == dealer_totals)
+        outcomes = np.where(wins, WIN, np.where(pushes, PUSH, LOSE)).astype(np.uint8)
+        if dealer_naturals is not None:
+            # A natural beats any other 21, and a dealer natural beats everything else
+            naturals = np.zeros_like(hands)
+            naturals[:, 0] = self.naturals()
+            dealer_naturals = dealer_naturals[:, None]
+            outcomes[dealer_naturals & hands] = LOSE
+            outcomes[naturals & ~dealer_naturals] = NATURAL
+            outcomes[naturals & dealer_naturals] = PUSH
+        outcomes[hands & (self.status == SURRENDERED)] = SURRENDER
+        net = np.where(hands, self.bets * payouts[outcomes], 0)
+        return outcomes, net, hands
@@ -0,0 +1,123 @@
+import numpy as np
+
+from components.rules import NUM_DECKS
+from components.shuffle import fast_rng
+
+SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
+
+# Card codes index this table: code = suit_index * 13 + rank_index, the same order as Deck.create_deck
+CARDS = tuple((rank, suit) for suit in SUITS for rank in RANKS)
+CARD_CODES = {card: code for code, card in enumerate(CARDS)}
+
+# Hi-Lo tags by rank index: +1 for 2-6, 0 for 7-9, -1 for tens and Aces
+HI_LO = (1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1, -1)
+# Per-code lookups so drawing a card updates the counts without any arithmetic on the code
+CODE_RANKS = tuple(code % 13 for code in range(52))
+CODE_HI_LO = tuple(HI_LO[rank] for rank in CODE_RANKS)
+
+
+def card_rank(code):
+    """
+    Returns the rank index (0 for '2' through 12 for 'Ace') of a card code.
+    """
+    return code % 13
+
+
+class Shoe:
+    """
+    A shoe of card codes stored as a uint8 array with a cursor.
+
+    Drawing only advances the cursor and reshuffling permutes the array in
+    place, so a shoe never allocates after it is built. Pass buffer to place
+    the shoe in a row of a larger array when many shoes are kept at once.
+
+    The shoe also keeps the undrawn cards per rank and the Hi-Lo running
+    count up to date as cards are drawn, so reading them never scans the shoe.
+    """
+
+    __slots__ = ("num_decks", "cards", "position", "rng", "rank_counts", "running_count")
+
+    def __init__(self, num_decks=NUM_DECKS, rng=None, buffer=None):
+        self.num_decks = num_decks
+        if buffer is None:
+            buffer = np.empty(52 * num_decks, dtype=np.uint8)
+        self.cards = buffer
+        self.cards.reshape(num_decks, 52)[:] = np.arange(52, dtype=np.uint8)
+        self.position = 0
+        self.rng = rng if rng is not None else fast_rng()
+        self.reset_counts()
+
+    def __len__(self):
+        return len(self.cards) - self.position
+
+    def draw(self):
+        """
+        Draws the next card code, or returns None if the shoe is empty.
+        """
+        if self.position >= len(self.cards):
+            return None
+        code = self.cards.item(self.position)
+        self.position += 1
+        self.rank_counts[CODE_RANKS[code]] -= 1
+        self.running_count += CODE_HI_LO[code]
+        return code
+
+    def remaining(self):
+        """
+        Returns a view of the undrawn card codes, next card first.
+        """
+        return self.cards[self.position:]
+
+    def shuffle(self):
+        """
+        Shuffles the undrawn cards in place.
+        """
+        self.rng.shuffle(self.cards[self.position:])
+
+    def reshuffle(self):
+        """
+        Returns every drawn card to the shoe and shuffles it in place.
+        """
+        self.position = 0
+        self.reset_counts()
+        self.rng.shuffle(self.cards)
+
+    def recycle(self):
+        """
+        Returns the drawn cards to random positions among the undrawn ones.
+
+        Each card is swapped into a uniformly chosen slot of the undrawn part,
+        so a shuffled shoe stays uniformly shuffled at a cost of one swap per card.
+        """
+        position = self.position
+        if not position:
+            return
+        cards = self.cards
+        size = len(cards)
+        # One bounded draw per returning card: slot i picks from [i, size)
+        targets = self.rng.integers(np.arange(position), size).tolist()
+        for i in range(position - 1, -1, -1):
+            j = targets[i]
+            cards[i], cards[j] = cards[j], cards[i]
+        self.position = 0
+        self.reset_counts()
+
+    def reset_counts(self):
+        """
+        Resets the count indexes for a full shoe.
+        """
+        self.rank_counts = [4 * self.num_decks] * 13  # Undrawn cards by rank index
+        self.running_count = 0
+
+    @property
+    def decks_remaining(self):
+        return (len(self.cards) - self.position) / 52
+
+    @property
+    def true_count(self):
+        """
+        The Hi-Lo running count per deck left in the shoe (0 once the shoe is empty).
+        """
+        decks = self.decks_remaining
+        return self.running_count / decks if decks else 0.0
@@ -0,0 +1,71 @@
+import numpy as np
+
+DEFAULT_PENETRATION = 0.75  # Fraction of the shoe dealt before the cut card comes out
+
+
+def fast_rng(seed=None):
+    """
+    Returns a NumPy Generator on the SFC64 bit generator, the fastest NumPy ships.
+
+    Args:
+        seed (int or numpy.random.SeedSequence): Seed for a reproducible stream.
+    """
+    return np.random.Generator(np.random.SFC64(seed))
+
+
+class CutCardPolicy:
+    """
+    Reshuffles between rounds once the cut card has come out.
+
+    Args:
+        penetration (float): Fraction of the shoe dealt before reshuffling.
+    """
+
+    def __init__(self, penetration=DEFAULT_PENETRATION):
+        if not 0 < penetration <= 1:
+            raise ValueError("Penetration must be between 0 and 1.")
+        self.penetration = penetration
+
+    def due(self, shoe):
+        """
+        Returns whether end_round would act on the shoe, i.e. the cut card has come out.
+        """
+        return shoe.position >= int(len(shoe.cards) * self.penetration)
+
+    def end_round(self, shoe):
+        """
+        Returns True if the shoe was reshuffled.
+        """
+        if self.due(shoe):
+            shoe.reshuffle()
+            return True
+        return False
+
+
+class ContinuousShufflePolicy:
+    """
+    A continuous shuffling machine: each round's discards go straight back into the shoe.
+
+    Only the cards dealt that round are reinserted, at random positions among
+    the undealt cards, so the cost is proportional to the cards played rather
+    than the size of the shoe.
+    """
+
+    def due(self, shoe):
+        return shoe.position > 0
+
+    def end_round(self, shoe):
+        shoe.recycle()
+        return False
+
+
+class EmptyShoePolicy:
+    """
+    Never reshuffles between rounds; the shoe is only rebuilt when it runs out mid-hand.
+    """
+
+    def due(self, shoe):
+        return False
+
+    def end_round(self, shoe):
+        return False
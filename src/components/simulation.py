@@ -0,0 +1,447 @@
+from fractions import Fraction
+
+import numpy as np
+
+from components.hand_values import (
+    EMPTY_STATE, MAX_HARD, NEXT_STATE, NUM_STATES, PAD, RANK_HARD_VALUES, STATE_BUST, STATE_SOFT, STATE_TOTALS,
+)
+from components.rules import (
+    NUM_DECKS, BLACKJACK, DEALER_STAND_TOTAL, DEFAULT_RULES, MAX_HANDS, max_cards_per_hand,
+)
+from components.seat import (
+    SeatArray, payout_units, LOSE, PUSH, WIN, NATURAL, SURRENDER, PLAYING, STOOD, BUST, DOUBLED, SURRENDERED,
+)
+from components.shoe import RANKS
+from components.shuffle import DEFAULT_PENETRATION
+from components.strategy import DOUBLE, DOUBLE_OR_STAND, HIT, SPLIT, SURRENDER as CHART_SURRENDER, SURRENDER_OR_STAND
+
+# Histogram bins for final totals; every bust lands in the last bin
+HISTOGRAM_BINS = BLACKJACK + 2
+
+# Player plays, as stored in PlayerPolicy tables
+PLAY_STAND = 0
+PLAY_HIT = 1
+PLAY_DOUBLE = 2
+PLAY_SPLIT = 3
+PLAY_SURRENDER = 4
+
+# Status a hand ends a step with after each play, before checking for a bust
+FINISHED_STATUS = np.array([STOOD, PLAYING, DOUBLED, PLAYING, SURRENDERED], dtype=np.uint8)
+
+# Whether the dealer draws in each state: standing on every 17 (S17), then hitting soft 17 (H17)
+DEALER_HITS = (
+    STATE_TOTALS < DEALER_STAND_TOTAL,
+    (STATE_TOTALS < DEALER_STAND_TOTAL) | (STATE_SOFT & (STATE_TOTALS == DEALER_STAND_TOTAL)),
+)
+for _table in DEALER_HITS:
+    _table.flags.writeable = False
+
+
+def max_cards_per_round(num_decks, max_hands=1):
+    """
+    Returns the most cards a round can use, so no round starts in a shoe that could run out.
+
+    Every hand stops once its hard total passes 21, so a round's cards add up
+    to at most MAX_HARD per player hand plus what the dealer can reach. A small
+    shoe holds too few low cards to fill every hand, which keeps single-deck
+    shoes playable with splits.
+    """
+    budget = max_hands * MAX_HARD + (DEALER_STAND_TOTAL - 1 + 10)
+    values = np.sort(np.repeat(RANK_HARD_VALUES, 4 * num_decks))
+    fits = int(np.searchsorted(np.cumsum(values), budget, side="right"))
+    return min((max_hands + 1) * max_cards_per_hand(num_decks), fits)
+
+
+class PlayerPolicy:
+    """
+    How the simulated player plays, as lookup tables over hand_values states.
+
+    actions[state, upcard, pair] is the play with every option open, where
+    pair is the rank index of a splittable pair or PAD; no_double[state, upcard]
+    is the play when doubling (or surrendering) isn't allowed. Looking up every
+    seat's next play is then one indexing step.
+
+    Args:
+        actions (numpy.ndarray): (NUM_STATES, 13, PAD + 1) PLAY_* codes.
+        no_double (numpy.ndarray): (NUM_STATES, 13) PLAY_HIT or PLAY_STAND codes.
+        max_hands (int): Most hands a seat may split into.
+    """
+
+    def __init__(self, actions, no_double, max_hands=1):
+        self.actions = actions
+        self.no_double = no_double
+        self.max_hands = max_hands
+
+    @classmethod
+    def stand_on(cls, total):
+        """
+        Hits below total and never doubles or splits.
+        """
+        plays = np.where(STATE_TOTALS < total, PLAY_HIT, PLAY_STAND).astype(np.uint8)
+        no_double = np.repeat(plays[:, None], len(RANKS), axis=1)
+        return cls(np.repeat(no_double[:, :, None], PAD + 1, axis=2), no_double)
+
+    @classmethod
+    def from_chart(cls, chart, max_hands=MAX_HANDS, rules=None):
+        """
+        Plays a StrategyChart, doubling, splitting (and resplitting up to max_hands) and surrendering where it says to.
+
+        Args:
+            chart (StrategyChart): The chart to play.
+            max_hands (int): Most hands a seat may split into.
+            rules (RuleSet): Rules to play by; their split limit replaces max_hands, and the
+                chart's doubles and surrenders are only played where they allow them.
+        """
+        if rules is not None:
+            max_hands = rules.max_hands
+        plays = {
+            HIT: PLAY_HIT, DOUBLE: PLAY_DOUBLE, DOUBLE_OR_STAND: PLAY_DOUBLE, SPLIT: PLAY_SPLIT,
+            CHART_SURRENDER: PLAY_SURRENDER, SURRENDER_OR_STAND: PLAY_SURRENDER,
+        }
+        fallbacks = {HIT: PLAY_HIT, DOUBLE: PLAY_HIT, CHART_SURRENDER: PLAY_HIT}
+        actions = np.zeros((NUM_STATES, len(RANKS), PAD + 1), dtype=np.uint8)
+        no_double = np.zeros((NUM_STATES, len(RANKS)), dtype=np.uint8)
+        for state in range(NUM_STATES):
+            hard, aces = divmod(state, 2)
+            for upcard, upcard_rank in enumerate(RANKS):
+                cell = chart.cell(hard, aces, upcard_rank)
+                play = plays.get(cell, PLAY_STAND)
+                if rules is not None and (
+                    (play == PLAY_DOUBLE and not rules.allows_double(int(STATE_TOTALS[state])))
+                    or (play == PLAY_SURRENDER and not rules.surrender)
+                ):
+                    play = fallbacks.get(cell, PLAY_STAND)
+                actions[state, upcard, :] = play
+                no_double[state, upcard] = fallbacks.get(cell, PLAY_STAND)
+        # Pairs only differ from their total where the chart splits them
+        for pair, pair_rank in enumerate(RANKS):
+            value = RANK_HARD_VALUES[pair]
+            state = 2 * (2 * value) + int(pair_rank == "Ace")
+            for upcard, upcard_rank in enumerate(RANKS):
+                if chart.cell(2 * value, pair_rank == "Ace", upcard_rank, pair_rank) == SPLIT:
+                    actions[state, upcard, pair] = PLAY_SPLIT
+        return cls(actions, no_double, max_hands)
+
+
+class SimulationResult:
+    """
+    Aggregated counts from a batch of simulated rounds.
+
+    Wins, losses, pushes and player busts count hands, which only outnumber
+    rounds when hands are split; wins include naturals. Net results are in
+    units of the initial bet, kept as an exact Fraction when payouts such as
+    6:5 aren't whole, so house_edge is the average fraction of each initial
+    bet the player loses.
+    """
+
+    def __init__(self):
+        self.rounds = 0
+        self.hands = 0
+        self.wins = 0
+        self.losses = 0
+        self.pushes = 0
+        self.player_busts = 0
+        self.dealer_busts = 0
+        self.doubles = 0
+        self.splits = 0
+        self.naturals = 0
+        self.surrenders = 0
+        self.net = 0
+        self.player_totals = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        self.dealer_totals = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+
+    @property
+    def house_edge(self):
+        return float(-self.net / self.rounds) if self.rounds else 0.0
+
+    def merge(self, other):
+        """
+        Adds the counts of another result into this one.
+
+        Args:
+            other (SimulationResult): The result to fold in.
+
+        Returns:
+            SimulationResult: This result, for chaining.
+        """
+        self.rounds += other.rounds
+        self.hands += other.hands
+        self.wins += other.wins
+        self.losses += other.losses
+        self.pushes += other.pushes
+        self.player_busts += other.player_busts
+        self.dealer_busts += other.dealer_busts
+        self.doubles += other.doubles
+        self.splits += other.splits
+        self.naturals += other.naturals
+        self.surrenders += other.surrenders
+        self.net += other.net
+        self.player_totals += other.player_totals
+        self.dealer_totals += other.dealer_totals
+        return self
+
+    def as_dict(self):
+        return {
+            "rounds": self.rounds,
+            "hands": self.hands,
+            "wins": self.wins,
+            "losses": self.losses,
+            "pushes": self.pushes,
+            "player_busts": self.player_busts,
+            "dealer_busts": self.dealer_busts,
+            "doubles": self.doubles,
+            "splits": self.splits,
+            "naturals": self.naturals,
+            "surrenders": self.surrenders,
+            "net": int(self.net) if self.net.denominator == 1 else float(self.net),
+            "house_edge": self.house_edge,
+            "player_totals": self.player_totals.tolist(),
+            "dealer_totals": self.dealer_totals.tolist(),
+        }
+
+
+def build_shoes(num_shoes, num_decks=NUM_DECKS, rng=None):
+    """
+    Builds a batch of independently shuffled shoes of rank indices.
+
+    Args:
+        num_shoes (int): Number of shoes to build.
+        num_decks (int): Number of decks in each shoe.
+        rng (numpy.random.Generator): Source of randomness.
+
+    Returns:
+        numpy.ndarray: A (num_shoes, 52 * num_decks) uint8 array of ranks.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    shoe = np.tile(np.repeat(np.arange(13, dtype=np.uint8), 4), num_decks)
+    shoes = np.tile(shoe, (num_shoes, 1))
+    return rng.permuted(shoes, axis=1, out=shoes)
+
+
+def _draw(shoes, rows, cursor):
+    """
+    Draws the next card from each of the given shoes.
+
+    Returns:
+        numpy.ndarray: The rank drawn from each shoe.
+    """
+    ranks = shoes[rows, cursor[rows]]
+    cursor[rows] += 1
+    return ranks
+
+
+def check_policy(policy, rules):
+    """
+    Raises ValueError if a policy makes plays the rules don't allow.
+
+    Doubles after a split are left to play_shoes, which refuses them as they come up.
+    """
+    if policy.max_hands > rules.max_hands:
+        raise ValueError(f"The policy splits to {policy.max_hands} hands, but the rules allow {rules.max_hands}.")
+    if not rules.surrender and (policy.actions == PLAY_SURRENDER).any():
+        raise ValueError("The policy surrenders, but the rules don't allow surrender.")
+    if rules.double_on is not None:
+        doubled = STATE_TOTALS[np.flatnonzero((policy.actions == PLAY_DOUBLE).any(axis=(1, 2)))]
+        refused = sorted({int(total) for total in doubled if not rules.allows_double(int(total))})
+        if refused:
+            raise ValueError(f"The policy doubles on totals the rules don't allow: {refused}")
+
+
+def play_shoes(shoes, player_stand_on=DEALER_STAND_TOTAL, max_rounds=None, penetration=DEFAULT_PENETRATION,
+               policy=None, rules=None, tables=None):
+    """
+    Plays rounds through a batch of shoes in lockstep until each shoe reaches its cut card.
+
+    Each round follows the Table flow: the player and dealer get two cards each
+    (start_game), a natural is settled at once if the rules pay naturals, the
+    player plays each hand by the policy, doubling, splitting and surrendering
+    where it and the rules allow (hit, double_down, split_hand, surrender),
+    the dealer draws by the rules unless no player hand is left standing
+    (dealer_turn), and every hand is settled at the rules' payouts
+    (determine_winner). Each step, every seat still playing takes one action
+    on its current hand; seats drop out of the step arrays as they finish, so
+    a split costs a few more (ever smaller) steps rather than a slower path.
+
+    Args:
+        shoes (numpy.ndarray): Shoes from build_shoes.
+        player_stand_on (int): Total at which the simulated player stops hitting, when no policy is given.
+        max_rounds (int): Stop once this many rounds have been played.
+        penetration (float): Fraction of each shoe dealt before the cut card, as in CutCardPolicy.
+        policy (PlayerPolicy): How the player plays; defaults to the tables' basic strategy if
+            tables are given, else PlayerPolicy.stand_on(player_stand_on).
+        rules (RuleSet): Rules to play by (defaults to the house rules). The shoes and
+            penetration arguments stand in for their deck count and penetration.
+        tables (VariantTables): The rules' precomputed tables (components.variants), used
+            in place of rules and of building the dealer and payout tables here.
+
+    Returns:
+        SimulationResult: Counts for every round played.
+
+    Raises:
+        ValueError: If the policy makes plays the rules don't allow (see check_policy).
+    """
+    if tables is not None:
+        rules = tables.rules
+        policy = policy if policy is not None else tables.policy
+        dealer_hits, payouts, payout_scale = tables.dealer_hits, tables.payouts, tables.payout_scale
+    else:
+        rules = rules if rules is not None else DEFAULT_RULES
+        policy = policy if policy is not None else PlayerPolicy.stand_on(player_stand_on)
+        dealer_hits = DEALER_HITS[rules.hit_soft_17]
+        payouts, payout_scale = payout_units(rules.blackjack_pays, rules.surrender)
+    check_policy(policy, rules)
+    splits = policy.max_hands > 1
+    doubles = bool((policy.actions == PLAY_DOUBLE).any())
+    surrenders = bool((policy.actions == PLAY_SURRENDER).any())
+    # Plays for hands that aren't splittable pairs, indexed by state * 13 + upcard
+    plays = policy.actions[:, :, PAD].reshape(-1)
+    no_double = policy.no_double.reshape(-1)
+
+    result = SimulationResult()
+    num_shoes, shoe_size = shoes.shape
+    cursor = np.zeros(num_shoes, dtype=np.intp)
+    seats = SeatArray(num_shoes, policy.max_hands)
+    dealer_state = np.empty(num_shoes, dtype=np.uint8)
+    dealer_naturals = np.zeros(num_shoes, dtype=bool)
+    # No round starts past the cut card, or so late that the shoe could run out mid-round
+    cut = min(int(shoe_size * penetration), shoe_size - max_cards_per_round(shoe_size // 52, policy.max_hands) + 1)
+
+    while True:
+        rows = np.flatnonzero(cursor < cut)
+        if max_rounds is not None:
+            rows = rows[:max_rounds - result.rounds]
+        if not rows.size:
+            return result
+
+        seats.reset(rows)
+        dealer_state.fill(EMPTY_STATE)
+        first_hands = rows * policy.max_hands
+
+        # Deal like real blackjack: player, dealer, player, dealer
+        seats.deal(first_hands, _draw(shoes, rows, cursor))
+        upcard = _draw(shoes, rows, cursor)
+        dealer_state[rows] = NEXT_STATE[EMPTY_STATE, upcard]
+        seats.deal(first_hands, _draw(shoes, rows, cursor))
+        dealer_state[rows] = NEXT_STATE[dealer_state[rows], _draw(shoes, rows, cursor)]
+        upcards = np.zeros(num_shoes, dtype=np.uint8)
+        upcards[rows] = upcard
+
+        # A paid natural stands without playing, and the dealer has nothing to draw for
+        acting = rows
+        settled = np.zeros(num_shoes, dtype=bool)
+        if rules.pays_naturals:
+            dealer_naturals[:] = STATE_TOTALS[dealer_state] == BLACKJACK
+            naturals = rows[seats.naturals()[rows]]
+            seats.finish(naturals, STOOD)
+            settled[naturals] = True
+            acting = rows[~settled[rows]]
+
+        # Player's turn: every seat still playing takes one action on its current hand per step
+        while acting.size:
+            hands = seats.current_hands(acting)
+            state = seats.hand_states[hands]
+            key = state.astype(np.intp) * len(RANKS) + upcards[acting]
+            play = plays[key]
+            if splits:
+                # Only pairs, at seats with a free slot, look beyond the hand's total
+                pairs = np.flatnonzero(seats.hand_pairs[hands])
+                pairs = pairs[seats.num_hands[acting[pairs]] < policy.max_hands]
+                play[pairs] = policy.actions[state[pairs], upcards[acting[pairs]], seats.hand_first_ranks[hands[pairs]]]
+            if doubles:
+                wants = np.flatnonzero(play == PLAY_DOUBLE)
+                refused = seats.hand_num_cards[hands[wants]] != 2
+                if not rules.double_after_split:
+                    refused |= seats.num_hands[acting[wants]] > 1
+                wants = wants[refused]
+                play[wants] = no_double[key[wants]]
+                doubling = acting[play == PLAY_DOUBLE]
+                seats.double(doubling)
+                result.doubles += doubling.size
+            if surrenders:
+                # Only the first two cards, before any split, can be surrendered
+                wants = np.flatnonzero(play == PLAY_SURRENDER)
+                wants = wants[(seats.hand_num_cards[hands[wants]] != 2) | (seats.num_hands[acting[wants]] > 1)]
+                play[wants] = no_double[key[wants]]
+                result.surrenders += int(np.count_nonzero(play == PLAY_SURRENDER))
+            if splits:
+                splitting = acting[play == PLAY_SPLIT]
+                seats.split(splitting)
+                result.splits += splitting.size
+
+            drawing = np.flatnonzero((play == PLAY_HIT) | (play == PLAY_DOUBLE))
+            drawn = hands[drawing]
+            seats.deal(drawn, _draw(shoes, acting[drawing], cursor))
+            # Standing, doubling, surrendering or busting finishes a hand; hitting without busting plays on
+            status = FINISHED_STATUS[play]
+            status[drawing[STATE_BUST[seats.hand_states[drawn]]]] = BUST
+            finished = status != PLAYING
+            seats.finish(acting[finished], status[finished])
+            acting = acting[~seats.done(acting)]
+
+        # Dealer's turn, skipped when no player hand is left standing
+        standing = np.zeros(num_shoes, dtype=bool)
+        standing[rows] = True
+        standing &= seats.any_standing() & ~settled
+        hitting = np.flatnonzero(standing & dealer_hits[dealer_state])
+        while hitting.size:
+            dealer_state[hitting] = NEXT_STATE[dealer_state[hitting], _draw(shoes, hitting, cursor)]
+            hitting = hitting[dealer_hits[dealer_state[hitting]]]
+        dealer_total = STATE_TOTALS[dealer_state]
+
+        # Settle every hand at once: a busted hand loses before the dealer's hand matters
+        outcomes, net, hands = seats.settle(
+            dealer_state, payouts, dealer_naturals if rules.pays_naturals else None
+        )
+        outcomes = outcomes[hands]
+        totals = STATE_TOTALS[seats.states[hands]]
+        result.rounds += rows.size
+        result.hands += outcomes.size
+        result.naturals += int(np.count_nonzero(outcomes == NATURAL))
+        result.wins += int(np.count_nonzero((outcomes == WIN) | (outcomes == NATURAL)))
+        result.pushes += int(np.count_nonzero(outcomes == PUSH))
+        result.losses += int(np.count_nonzero((outcomes == LOSE) | (outcomes == SURRENDER)))
+        result.player_busts += int(np.count_nonzero(totals > BLACKJACK))
+        result.dealer_busts += int(np.count_nonzero(standing & STATE_BUST[dealer_state]))
+        result.net += Fraction(int(net.sum()), payout_scale)
+        result.player_totals += np.bincount(np.minimum(totals, HISTOGRAM_BINS - 1), minlength=HISTOGRAM_BINS)
+        result.dealer_totals += np.bincount(
+            np.minimum(dealer_total[standing], HISTOGRAM_BINS - 1), minlength=HISTOGRAM_BINS
+        )
+
+
+def simulate(num_rounds, num_decks=NUM_DECKS, num_shoes=4096, player_stand_on=DEALER_STAND_TOTAL, rng=None,
+             penetration=DEFAULT_PENETRATION, policy=None, rules=None, tables=None):
+    """
+    Simulates num_rounds rounds of blackjack without a GUI.
+
+    Args:
+        num_rounds (int): Number of rounds to play.
+        num_decks (int): Number of decks in each shoe.
+        num_shoes (int): Number of shoes played side by side in each batch.
+        player_stand_on (int): Total at which the simulated player stops hitting.
+        rng (numpy.random.Generator): Source of randomness; seed it for reproducible runs.
+        penetration (float): Fraction of each shoe dealt before it is replaced.
+        policy (PlayerPolicy): How the player plays; defaults to hitting below player_stand_on.
+        rules (RuleSet): Rules to play by; their deck count and penetration replace num_decks and penetration.
+        tables (VariantTables): Precomputed tables for the rules, which then stand in for rules
+            (and for policy, if none is given); see play_shoes.
+
+    Returns:
+        SimulationResult: Counts for all rounds played.
+    """
+    if tables is not None:
+        rules = tables.rules
+    if rules is not None:
+        num_decks, penetration = rules.num_decks, rules.penetration
+    rng = rng if rng is not None else np.random.default_rng()
+    result = SimulationResult()
+    while result.rounds < num_rounds:
+        remaining = num_rounds - result.rounds
+        # Roughly one round per 5-6 cards; don't build far more shoes than the tail needs
+        shoes_needed = -(-remaining * 6 // int(52 * num_decks * penetration))
+        shoes = build_shoes(min(num_shoes, max(shoes_needed, 1)), num_decks, rng)
+        result.merge(play_shoes(
+            shoes, player_stand_on, max_rounds=remaining, penetration=penetration, policy=policy, rules=rules,
+            tables=tables,
+        ))
+    return result
@@ -0,0 +1,256 @@
+"""
+Compact binary snapshots of a table's state, for crash recovery and resumable simulations.
+
+A snapshot is a fixed 46-byte header, the table's rules as JSON
+(RuleSet.as_dict), then each of the seat's hands as a 10-byte record
+followed by its card codes (components.shoe.CARDS), then the dealer's
+cards, the whole shoe in dealing order and the shuffle generator's state
+if the shoe uses SFC64 (as fast_rng does):
+
+    magic            8 bytes
+    state            uint8   index into STATES
+    flags            uint8   FLAG_* bits
+    num_hands        uint8   hands in the seat
+    active           uint8   slot of the hand being played
+    dealer length    uint8
+    (padding)        uint8
+    num_decks        uint16
+    position         uint32  cards already drawn from the shoe
+    balance          int64
+    bet              int64
+    insurance_bet    int64
+    rules length     uint16
+
+    per hand: bet int64, status uint8, length uint8, then the cards
+
+    rng state        4 x uint64, uint32 has_uint32, uint32 uinteger (with FLAG_RNG)
+
+Counts kept by the shoe are rebuilt from the drawn cards on restore rather
+than stored. Listeners, the shuffle policy and the card images are not
+part of the state, so a snapshot restores into an existing table without
+disturbing its subscribers. Take snapshots between player actions; a
+table restored in a transient state (dealing, the dealer's turn or
+settling) has no action that moves it on. A corrupt or truncated snapshot
+raises ValueError rather than restoring a table that can't be played.
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from components.deck import Deck
+from components.hand import Hand
+from components.rules import RuleSet
+from components.seat import PLAYING, STOOD, BUST, DOUBLED, SURRENDERED
+from components.shoe import CARD_CODES, CARDS, HI_LO
+from components.shuffle import CutCardPolicy
+from components.table import (
+    Table, BETTING, DEALING, INSURANCE, PLAYER_TURN, SPLIT_HAND, DEALER_TURN, SETTLE,
+)
+
+MAGIC = b"BJSNAP\x00\x03"
+HEADER = struct.Struct("<8sBBBBBxHIqqqH")
+HAND = struct.Struct("<qBB")
+RNG_STATE = struct.Struct("<4QII")
+
+STATES = (BETTING, DEALING, INSURANCE, PLAYER_TURN, SPLIT_HAND, DEALER_TURN, SETTLE)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+STATUSES = (PLAYING, STOOD, BUST, DOUBLED, SURRENDERED)
+
+FLAG_RNG = 1  # The shuffle generator's state follows the shoe
+
+CODE_HI_LO = np.array(HI_LO, dtype=np.int64)
+
+
+def _hand_codes(hand):
+    return bytes(CARD_CODES[card] for card in hand.cards)
+
+
+def _fill_hand(hand, codes):
+    for code in codes:
+        hand.add_card(CARDS[code])
+    return hand
+
+
+def _read_header(data):
+    """
+    Returns a snapshot's header fields and its RuleSet.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Not a table snapshot: data is too short.")
+    fields = HEADER.unpack_from(data)
+    if fields[0] != MAGIC:
+        raise ValueError("Not a table snapshot, or written by an incompatible version.")
+    rules_end = HEADER.size + fields[-1]
+    if len(data) < rules_end:
+        raise ValueError("Table snapshot is truncated or corrupt.")
+    try:
+        rules = RuleSet.from_dict(json.loads(data[HEADER.size:rules_end]))
+    except (TypeError, ValueError) as error:  # Bad JSON and bad text are ValueErrors too
+        raise ValueError(f"Table snapshot has invalid rules: {error}") from error
+    return fields, rules
+
+
+def dumps(table):
+    """
+    Returns a snapshot of a table's state as bytes.
+
+    Costs a struct pack and a copy of the shoe, a few microseconds, so it
+    can be taken after every action.
+    """
+    shoe = table.deck.shoe
+    seat = table.seat
+    flags = 0
+    rng_state = b""
+    bit_generator = shoe.rng.bit_generator
+    if isinstance(bit_generator, np.random.SFC64):
+        state = bit_generator.state
+        rng_state = RNG_STATE.pack(*state["state"]["state"].tolist(), state["has_uint32"], state["uinteger"])
+        flags |= FLAG_RNG
+
+    dealer = _hand_codes(table.dealer_hand)
+    rules = json.dumps(table.rules.as_dict(), separators=(",", ":")).encode()
+    parts = [HEADER.pack(
+        MAGIC,
+        STATE_CODES[table.state],
+        flags,
+        seat.num_hands,
+        seat.active,
+        len(dealer),
+        shoe.num_decks,
+        shoe.position,
+        table.balance,
+        table.bet,
+        table.insurance_bet,
+        len(rules),
+    ), rules]
+    for index in range(seat.num_hands):
+        cards = _hand_codes(seat.hands[index])
+        parts.append(HAND.pack(seat.bets[index], seat.status[index], len(cards)))
+        parts.append(cards)
+    parts += [dealer, shoe.cards.tobytes(), rng_state]
+    return b"".join(parts)
+
+
+def restore(table, data):
+    """
+    Restores a snapshot into an existing table, reusing its deck and shoe.
+
+    Args:
+        table (Table): The table to restore into. It must play by the snapshot's rules,
+            and its shoe must have as many decks as the snapshot's.
+        data (bytes): A snapshot from dumps.
+
+    Returns:
+        Table: The same table.
+
+    Raises:
+        ValueError: If the snapshot is corrupt or doesn't fit the table.
+    """
+    fields, rules = _read_header(data)
+    (_, state, flags, num_hands, active, dealer_len, num_decks, position,
+     balance, bet, insurance_bet, rules_len) = fields
+    shoe = table.deck.shoe
+    seat = table.seat
+    if rules != table.rules:
+        raise ValueError(f"Snapshot is of a table playing {rules.as_dict()}, not this table's rules.")
+    if num_decks != shoe.num_decks:
+        raise ValueError(f"Snapshot is of a {num_decks}-deck shoe, but the table has {shoe.num_decks}.")
+    if not 1 <= num_hands <= len(seat.hands) or active > num_hands or state >= len(STATES):
+        raise ValueError("Table snapshot is corrupt.")
+    offset = HEADER.size + rules_len
+    hands = []
+    for _ in range(num_hands):
+        if len(data) < offset + HAND.size:
+            raise ValueError("Table snapshot is truncated or corrupt.")
+        hand_bet, status, length = HAND.unpack_from(data, offset)
+        if status not in STATUSES:
+            raise ValueError("Table snapshot is corrupt.")
+        offset += HAND.size
+        hands.append((hand_bet, status, data[offset:offset + length]))
+        offset += length
+    dealer = data[offset:offset + dealer_len]
+    offset += dealer_len
+    size = len(shoe.cards)
+    expected = offset + size + (RNG_STATE.size if flags & FLAG_RNG else 0)
+    if len(data) != expected or position > size:
+        raise ValueError("Table snapshot is truncated or corrupt.")
+    cards = np.frombuffer(data, dtype=np.uint8, count=size, offset=offset)
+    # Every card of the shoe exactly once per deck, and nothing in the hands that isn't a card
+    if (np.bincount(cards, minlength=len(CARDS)) != num_decks).any() or any(
+        code >= len(CARDS) for _, _, codes in hands for code in codes
+    ) or any(code >= len(CARDS) for code in dealer):
+        raise ValueError("Table snapshot holds invalid card codes.")
+
+    shoe.cards[:] = cards
+    shoe.position = position
+    drawn = np.bincount(shoe.cards[:position] % 13, minlength=13)
+    shoe.rank_counts = (4 * num_decks - drawn).tolist()
+    shoe.running_count = int(drawn @ CODE_HI_LO)
+    if flags & FLAG_RNG and isinstance(shoe.rng.bit_generator, np.random.SFC64):
+        *words, has_uint32, uinteger = RNG_STATE.unpack_from(data, offset + size)
+        shoe.rng.bit_generator.state = {
+            "bit_generator": "SFC64",
+            "state": {"state": np.array(words, dtype=np.uint64)},
+            "has_uint32": has_uint32,
+            "uinteger": uinteger,
+        }
+
+    table.state = STATES[state]
+    table.balance = balance
+    table.bet = bet
+    table.insurance_bet = insurance_bet
+    seat.reset()
+    for index, (hand_bet, status, cards) in enumerate(hands):
+        _fill_hand(seat.hands[index], cards)
+        seat.bets[index] = hand_bet
+        seat.status[index] = status
+    seat.num_hands = num_hands
+    seat.active = active
+    table.dealer_hand = _fill_hand(Hand(), dealer)
+    return table
+
+
+def loads(data, rng=None, shuffle_policy=None):
+    """
+    Builds a new table, with its own deck, from a snapshot, playing by the snapshot's rules.
+
+    Args:
+        data (bytes): A snapshot from dumps.
+        rng (numpy.random.Generator): Generator for the new shoe; its state is
+            replaced by the snapshot's if both are SFC64.
+        shuffle_policy: Shuffle policy for the new deck (defaults to a cut card at the rules' penetration).
+    """
+    fields, rules = _read_header(data)
+    num_decks = fields[6]
+    if shuffle_policy is None:
+        shuffle_policy = CutCardPolicy(rules.penetration)
+    return restore(Table(Deck(num_decks, rng=rng, shuffle_policy=shuffle_policy), rules=rules), data)
+
+
+def save(table, path, sync=False):
+    """
+    Writes a snapshot to a file atomically, so a crash mid-write leaves the previous one intact.
+
+    Args:
+        table (Table): The table to snapshot.
+        path (str): File to write.
+        sync (bool): Also flush the file to disk, to survive power loss rather than just a crash.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(dumps(table))
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def load(path, table=None):
+    """
+    Reads a snapshot file into a table, or a new one if table is None.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    return restore(table, data) if table is not None else loads(data)
@@ -0,0 +1,93 @@
+from components.rules import MAX_CARDS_PER_HAND
+
+# A hand can hold every card of a 21 and then one more that busts it; enough for any shoe
+SLOTS_PER_HAND = MAX_CARDS_PER_HAND + 1
+
+
+class SpritePool:
+    """
+    A retained layer of canvas image items, reused round after round.
+
+    Each hand gets a fixed set of items up front; cards are shown by
+    reconfiguring a free item instead of creating a new one, so the number
+    of canvas items never grows. The pool remembers what every item shows
+    and only sends Tk the options that changed, and it holds a reference
+    to each item's image so Tk never draws a collected PhotoImage.
+
+    coords, itemconfigure, after and after_cancel mirror the canvas so an
+    AnimationScheduler can drive the pool in place of the canvas.
+    """
+
+    def __init__(self, canvas, hands, slots=SLOTS_PER_HAND, anchor="nw"):
+        self.canvas = canvas
+        self.items = {
+            hand: [canvas.create_image(0, 0, anchor=anchor, state="hidden") for _ in range(slots)]
+            for hand in hands
+        }
+        self.used = {hand: 0 for hand in hands}
+        self.positions = {}
+        self.states = {item: "hidden" for items in self.items.values() for item in items}
+        self.images = {}  # Pinned image for every item
+
+    def sprite(self, hand, index):
+        """
+        Returns the item showing a hand's index-th card.
+        """
+        return self.items[hand][index]
+
+    def acquire(self, hand, image, pos, state="normal"):
+        """
+        Shows an image at pos on the hand's next free item.
+
+        Returns:
+            int: The canvas item.
+        """
+        item = self.items[hand][self.used[hand]]
+        self.used[hand] += 1
+        self.itemconfigure(item, image=image, state=state)
+        self.coords(item, *pos)
+        return item
+
+    def release_last(self, hand):
+        """
+        Hides the hand's most recently acquired item.
+        """
+        self.used[hand] -= 1
+        self.itemconfigure(self.items[hand][self.used[hand]], state="hidden")
+
+    def release_all(self):
+        """
+        Hides every item, ready for a new round.
+        """
+        for hand, items in self.items.items():
+            for item in items[:self.used[hand]]:
+                self.itemconfigure(item, state="hidden")
+            self.used[hand] = 0
+
+    def coords(self, item, x, y):
+        pos = (round(x), round(y))
+        if self.positions.get(item) != pos:
+            self.positions[item] = pos
+            self.canvas.coords(item, *pos)
+
+    def itemconfigure(self, item, **options):
+        image = options.get("image")
+        if image is not None:
+            if self.images.get(item) is image:
+                del options["image"]
+            else:
+                self.images[item] = image
+        state = options.get("state")
+        if state is not None:
+            if self.states.get(item) == state:
+                del options["state"]
+            else:
+                self.states[item] = state
+        if options:
+            self.canvas.itemconfigure(item, **options)
+
+    def after(self, ms, callback, *args):
+        return self.canvas.after(ms, callback, *args)
+
+    def after_cancel(self, after_id):
+        self.canvas.after_cancel(after_id)
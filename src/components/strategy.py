@@ -0,0 +1,362 @@
+"""
+Basic strategy solver and the compact chart it produces.
+
+The solver works out the expected value of standing, hitting, doubling,
+splitting and surrendering for every hand against every dealer upcard,
+under a RuleSet: the dealer hits below DEALER_STAND_TOTAL, and soft 17 too
+under H17 (Table.dealer_turn), every win pays 1:1 and ties push
+(Table.determine_winner), a dealer natural beats a player's 21 when naturals
+are paid. A split hand starts from its single card, may double on its
+first two cards where the rules allow doubling after splits, and may split
+again while the split limit allows.
+
+The player's side is an infinite-deck approximation: every player draw,
+including the cards of a split, comes from the full shoe's proportions, and
+no card the player holds is removed from it. The dealer's outcomes come from
+dealer_odds, which removes each card the dealer draws from the full shoe
+(but not the player's cards). Charts from a deck count are therefore close
+to, not exactly, composition-dependent basic strategy.
+"""
+import os
+import struct
+from functools import lru_cache
+
+from components.card_images import CACHE_DIR
+from components.dealer_odds import FULL_DECK, HARD_VALUES, VALUE_INDEX, stand_ev
+from components.rules import BLACKJACK, NUM_DECKS, RuleSet
+
+# Upcards and pairs are indexed by value like dealer_odds compositions: Ace, 2-9, then ten-valued cards
+VALUE_RANKS = ("Ace", "2", "3", "4", "5", "6", "7", "8", "9", "10")
+LABELS = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "T")
+
+# Chart actions, one byte per cell
+STAND = "S"
+HIT = "H"
+DOUBLE = "D"  # Double if allowed, otherwise hit
+DOUBLE_OR_STAND = "d"  # Double if allowed, otherwise stand
+SPLIT = "P"
+NO_SPLIT = "-"  # Pair row only: play the hand by its total
+SURRENDER = "R"  # Surrender if allowed, otherwise hit
+SURRENDER_OR_STAND = "r"  # Surrender if allowed, otherwise stand
+
+# Chart rows
+HARD_TOTALS = range(4, BLACKJACK + 1)
+SOFT_TOTALS = range(12, BLACKJACK + 1)
+HARD_OFFSET = 0
+SOFT_OFFSET = HARD_OFFSET + len(HARD_TOTALS) * 10
+PAIR_OFFSET = SOFT_OFFSET + len(SOFT_TOTALS) * 10
+CHART_SIZE = PAIR_OFFSET + 10 * 10
+
+MAGIC = b"BJSTRAT\x01"
+HEADER = struct.Struct("<8sIII")  # Magic, solver version, number of decks, chart size
+SOLVER_VERSION = 2  # Bump whenever the solver's results change, so cached charts are solved again
+
+
+def shoe_composition(num_decks=NUM_DECKS):
+    """
+    Returns the composition of a full shoe, in dealer_odds order.
+    """
+    return tuple(count * num_decks for count in FULL_DECK)
+
+
+@lru_cache(maxsize=None)
+def _probabilities(composition):
+    remaining = sum(composition)
+    return tuple(count / remaining for count in composition)
+
+
+def _total(hard, aces):
+    return hard + 10 if aces and hard + 10 <= BLACKJACK else hard
+
+
+@lru_cache(maxsize=None)
+def _stand_ev(hard, aces, upcard, composition, hit_soft_17=False, naturals=False):
+    return stand_ev(_total(hard, aces), VALUE_RANKS[upcard], composition, hit_soft_17, naturals)
+
+
+@lru_cache(maxsize=None)
+def _best_ev(hard, aces, upcard, composition, hit_soft_17=False, naturals=False):
+    """
+    Returns the EV of playing a hand on with the better of stand and hit at every step.
+    """
+    if hard > BLACKJACK:
+        return -1.0
+    return max(
+        _stand_ev(hard, aces, upcard, composition, hit_soft_17, naturals),
+        _hit_ev(hard, aces, upcard, composition, hit_soft_17, naturals),
+    )
+
+
+@lru_cache(maxsize=None)
+def _hit_ev(hard, aces, upcard, composition, hit_soft_17=False, naturals=False):
+    ev = 0.0
+    for index, p in enumerate(_probabilities(composition)):
+        if p:
+            ev += p * _best_ev(hard + HARD_VALUES[index], aces or index == 0, upcard, composition, hit_soft_17, naturals)
+    return ev
+
+
+@lru_cache(maxsize=None)
+def _double_ev(hard, aces, upcard, composition, hit_soft_17=False, naturals=False):
+    ev = 0.0
+    for index, p in enumerate(_probabilities(composition)):
+        if not p:
+            continue
+        new_hard = hard + HARD_VALUES[index]
+        if new_hard > BLACKJACK:
+            ev -= p
+        else:
+            ev += p * _stand_ev(new_hard, aces or index == 0, upcard, composition, hit_soft_17, naturals)
+    return 2 * ev
+
+
+@lru_cache(maxsize=None)
+def _split_hand_ev(pair, hands, upcard, composition, hit_soft_17=False, naturals=False, doubles=None):
+    """
+    Returns the EV of one hand holding a card of a split pair, which may split again into up to hands hands.
+
+    doubles are the totals the hand may double on after its second card: None for any, () for none.
+    """
+    hard, aces = HARD_VALUES[pair], pair == 0
+    dealer = (hit_soft_17, naturals)
+    ev = 0.0
+    for index, p in enumerate(_probabilities(composition)):
+        if not p:
+            continue
+        new_hard, new_aces = hard + HARD_VALUES[index], aces or index == 0
+        best = _best_ev(new_hard, new_aces, upcard, composition, *dealer)
+        if doubles is None or _total(new_hard, new_aces) in doubles:
+            best = max(best, _double_ev(new_hard, new_aces, upcard, composition, *dealer))
+        if index == pair and hands > 1:
+            best = max(best, _split_ev(pair, hands, upcard, composition, *dealer, doubles))
+        ev += p * best
+    return ev
+
+
+@lru_cache(maxsize=None)
+def _split_ev(pair, hands, upcard, composition, hit_soft_17=False, naturals=False, doubles=None):
+    # Each hand keeps one card of the pair and is played on from there, for one bet each. The
+    # two hands share the allowance of hands evenly, which slightly undercounts resplits when
+    # an odd number of hands is allowed.
+    dealer = (hit_soft_17, naturals, doubles)
+    return (_split_hand_ev(pair, hands // 2, upcard, composition, *dealer)
+            + _split_hand_ev(pair, hands - hands // 2, upcard, composition, *dealer))
+
+
+def action_evs(hard, aces, upcard, composition=None, pair=None, rules=None):
+    """
+    Returns the expected value of each action for a two-card hand, per unit of the original bet.
+
+    Args:
+        hard (int): Hand total counting Aces as 1.
+        aces (bool): Whether the hand holds an Ace.
+        upcard (int): Dealer upcard as a VALUE_RANKS index.
+        composition (tuple): Cards in the shoe, in dealer_odds order. Defaults to a full shoe.
+        pair (int): Value index of the pair, if the hand is one, to include splitting (where
+            the rules allow more than one hand).
+        rules (RuleSet): Rules to play by (defaults to the house rules).
+
+    Returns:
+        dict: EVs keyed by "stand", "hit", "double" (where the rules allow it),
+        "split" (for pairs) and "surrender" (where allowed).
+    """
+    rules = rules if rules is not None else RuleSet()
+    composition = shoe_composition(rules.num_decks) if composition is None else tuple(composition)
+    dealer = (rules.hit_soft_17, rules.pays_naturals)
+    evs = {
+        "stand": _stand_ev(hard, aces, upcard, composition, *dealer),
+        "hit": _hit_ev(hard, aces, upcard, composition, *dealer),
+    }
+    if rules.allows_double(_total(hard, aces)):
+        evs["double"] = _double_ev(hard, aces, upcard, composition, *dealer)
+    if pair is not None and rules.max_hands > 1:
+        doubles = (rules.double_on if rules.double_after_split else ())
+        evs["split"] = _split_ev(pair, rules.max_hands, upcard, composition, *dealer, doubles)
+    if rules.surrender:
+        evs["surrender"] = -0.5
+    return evs
+
+
+def _chart_action(evs):
+    best = max(evs, key=evs.get)
+    if best == "double":
+        return DOUBLE if evs["hit"] >= evs["stand"] else DOUBLE_OR_STAND
+    if best == "surrender":
+        return SURRENDER if evs["hit"] >= evs["stand"] else SURRENDER_OR_STAND
+    return STAND if best == "stand" else HIT
+
+
+def solve(num_decks=NUM_DECKS, rules=None):
+    """
+    Solves basic strategy for a shoe of num_decks.
+
+    Args:
+        num_decks (int): Number of decks in the shoe.
+        rules (RuleSet): Rules to solve for; their deck count replaces num_decks.
+
+    Returns:
+        StrategyChart: The best action for every hard, soft and pair hand against every upcard.
+    """
+    rules = rules if rules is not None else RuleSet(num_decks)
+    composition = shoe_composition(rules.num_decks)
+    chart = bytearray(CHART_SIZE)
+    for upcard in range(10):
+        for row, total in enumerate(HARD_TOTALS):
+            action = _chart_action(action_evs(total, False, upcard, composition, rules=rules))
+            chart[HARD_OFFSET + row * 10 + upcard] = ord(action)
+        for row, total in enumerate(SOFT_TOTALS):
+            action = _chart_action(action_evs(total - 10, True, upcard, composition, rules=rules))
+            chart[SOFT_OFFSET + row * 10 + upcard] = ord(action)
+        for pair in range(10):
+            hard = 2 * HARD_VALUES[pair]
+            evs = action_evs(hard, pair == 0, upcard, composition, pair=pair, rules=rules)
+            split = "split" in evs and evs["split"] > max(ev for action, ev in evs.items() if action != "split")
+            chart[PAIR_OFFSET + pair * 10 + upcard] = ord(SPLIT if split else NO_SPLIT)
+    return StrategyChart(chart, rules.num_decks)
+
+
+def cache_info():
+    """
+    Returns hit/miss statistics for the player EV cache.
+    """
+    return _best_ev.cache_info()
+
+
+def clear_cache():
+    for cached in (_probabilities, _stand_ev, _best_ev, _hit_ev, _double_ev, _split_hand_ev, _split_ev):
+        cached.cache_clear()
+
+
+class StrategyChart:
+    """
+    A solved strategy as a flat table of one-byte actions.
+
+    Rows of ten upcards (Ace, 2-9, ten) for hard totals, then soft totals,
+    then pairs, so a lookup is two index calculations and a byte read.
+    """
+
+    __slots__ = ("table", "num_decks")
+
+    def __init__(self, table, num_decks=NUM_DECKS):
+        if len(table) != CHART_SIZE:
+            raise ValueError("Strategy chart has the wrong size.")
+        self.table = bytes(table)
+        self.num_decks = num_decks
+
+    def cell(self, hard, aces, upcard_rank, pair_rank=None):
+        """
+        Returns the chart entry for a hand, before considering which actions are allowed.
+        """
+        upcard = VALUE_INDEX[upcard_rank]
+        if pair_rank is not None:
+            pair_action = chr(self.table[PAIR_OFFSET + VALUE_INDEX[pair_rank] * 10 + upcard])
+            if pair_action == SPLIT:
+                return SPLIT
+        total = _total(hard, aces)
+        if total > BLACKJACK:
+            return STAND
+        if total < SOFT_TOTALS.start and total != hard:
+            return HIT  # A lone Ace after a split
+        if total != hard:
+            return chr(self.table[SOFT_OFFSET + (total - SOFT_TOTALS.start) * 10 + upcard])
+        return chr(self.table[HARD_OFFSET + (max(total, HARD_TOTALS.start) - HARD_TOTALS.start) * 10 + upcard])
+
+    def action(self, hand, upcard, can_double=False, can_split=False, can_surrender=False):
+        """
+        Returns the recommended action for a hand.
+
+        Args:
+            hand (Hand): The player's hand.
+            upcard (tuple): The dealer's face-up card.
+            can_double (bool): Whether doubling down is allowed for this hand.
+            can_split (bool): Whether the hand may be split.
+            can_surrender (bool): Whether the hand may be surrendered.
+
+        Returns:
+            str: "stand", "hit", "double", "split" or "surrender".
+        """
+        pair_rank = hand.cards[0][0] if can_split and hand.is_pair else None
+        cell = self.cell(hand.hard_total, hand.aces > 0, upcard[0], pair_rank)
+        if cell == SPLIT:
+            return "split"
+        if cell in (DOUBLE, DOUBLE_OR_STAND):
+            if can_double and len(hand.cards) == 2:
+                return "double"
+            return "hit" if cell == DOUBLE else "stand"
+        if cell in (SURRENDER, SURRENDER_OR_STAND):
+            if can_surrender:
+                return "surrender"
+            return "hit" if cell == SURRENDER else "stand"
+        return "hit" if cell == HIT else "stand"
+
+    def format(self):
+        """
+        Returns the chart as text, one row per hand and one column per upcard.
+        """
+        columns = list(range(1, 10)) + [0]  # 2-9, ten, then Ace, as charts are usually printed
+        lines = ["     " + "".join(f"{LABELS[upcard]:>3}" for upcard in columns)]
+
+        def row(label, offset):
+            cells = self.table[offset:offset + 10].decode()
+            lines.append(f"{label:<5}" + "".join(f"{cells[upcard]:>3}" for upcard in columns))
+
+        for index, total in enumerate(HARD_TOTALS):
+            row(f"H{total}", HARD_OFFSET + index * 10)
+        for index, total in enumerate(SOFT_TOTALS):
+            row(f"S{total}", SOFT_OFFSET + index * 10)
+        for pair, label in enumerate(LABELS):
+            row(f"{label},{label}", PAIR_OFFSET + pair * 10)
+        return "\n".join(lines)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, SOLVER_VERSION, self.num_decks, CHART_SIZE) + self.table)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError("Not a strategy chart: file is too short.")
+        magic, version, num_decks, size = HEADER.unpack_from(data)
+        if magic != MAGIC or size != CHART_SIZE:
+            raise ValueError("Not a strategy chart, or written by an incompatible version.")
+        if version != SOLVER_VERSION:
+            raise ValueError("Strategy chart was solved by another version of the solver.")
+        return cls(data[HEADER.size:], num_decks)
+
+
+_charts = {}
+
+
+def chart_for(num_decks=NUM_DECKS, cache_dir=CACHE_DIR, rules=None):
+    """
+    Returns the strategy chart for a shoe, shared across the process.
+
+    Solved charts are saved in the cache directory, so after the first run
+    a chart is a single small file read. Charts saved by another solver
+    version are solved again and overwritten. Rule sets that play the same
+    strategy (RuleSet.strategy_key) share a chart.
+
+    Args:
+        num_decks (int): Number of decks in the shoe.
+        cache_dir (str): Directory solved charts are kept in.
+        rules (RuleSet): Rules to solve for; their deck count replaces num_decks.
+    """
+    rules = rules if rules is not None else RuleSet(num_decks)
+    key = rules.strategy_key
+    chart = _charts.get(key)
+    if chart is not None:
+        return chart
+    path = os.path.join(cache_dir, f"strategy_{key}.bin")
+    try:
+        chart = StrategyChart.load(path)
+    except (OSError, ValueError):
+        chart = solve(rules=rules)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            chart.save(path)
+        except OSError:
+            pass  # Read-only cache directory: solve again next run
+    _charts[key] = chart
+    return chart
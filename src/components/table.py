@@ -0,0 +1,475 @@
+from components.deck import Deck
+from components.hand import Hand
+from components.metrics import timed
+from components.rules import DEFAULT_RULES
+from components.seat import Seat, SEAT_HANDS, OUTCOME_NAMES, SURRENDER, STOOD, BUST, DOUBLED, SURRENDERED
+from components.shuffle import CutCardPolicy
+
+# Table states
+BETTING = "betting"  # Waiting for a bet; the only state place_bet is allowed in
+DEALING = "dealing"  # Initial four cards are going out
+INSURANCE = "insurance"  # Dealer shows an Ace; insurance may be placed before playing on
+PLAYER_TURN = "player_turn"  # Playing the first (or only) hand
+SPLIT_HAND = "split_hand"  # Playing a later hand after a split
+DEALER_TURN = "dealer_turn"  # Dealer reveals and draws to DEALER_STAND_TOTAL (and on soft 17 under H17)
+SETTLE = "settle"  # Bets are being paid out
+
+# States in which the player can act on a hand
+PLAYING_STATES = (INSURANCE, PLAYER_TURN, SPLIT_HAND)
+
+STARTING_BALANCE = 1000
+
+
+class InvalidAction(ValueError):
+    """
+    Raised when an action isn't allowed in the table's current state or the player can't afford it.
+    """
+
+
+class Table:
+    """
+    A single-seat blackjack table with no UI.
+
+    The table is a state machine driven by the player actions place_bet,
+    hit, stand, double_down, split_hand, surrender, place_insurance and fold,
+    played by a RuleSet. The player's hands live in a Seat and can be split
+    (and resplit) into up to the rules' max_hands hands, played one after
+    another. A natural, when the rules pay naturals, settles as soon as it is
+    dealt. Everything that happens is reported as events to subscribers,
+    called as listener(event, data) with an event name and a dict of details:
+
+        state_changed      state
+        bet_placed         bet, balance
+        round_started
+        reshuffled
+        card_dealt         hand ("player", "second", "third", "fourth" or "dealer"), card, index, face_up
+        insurance_offered
+        insurance_placed   insurance_bet, balance
+        hand_split         hand, new_hand, card, bet, balance
+        next_hand_started  hand
+        hit                hand
+        doubled            hand, bet, balance
+        stood              hand
+        bust               hand
+        surrendered        hand
+        hole_card_revealed card, total
+        folded
+        hand_settled       hand, outcome ("win", "lose", "push", "blackjack" or "surrender"), total,
+                           dealer_total (None after a surrender), payout
+        insurance_settled  won, payout
+        round_settled      balance, net
+    """
+
+    def __init__(self, deck=None, balance=STARTING_BALANCE, rng=None, rules=None):
+        self.rules = rules if rules is not None else DEFAULT_RULES
+        if deck is None:
+            deck = Deck(self.rules.num_decks, rng=rng, shuffle_policy=CutCardPolicy(self.rules.penetration))
+        self.deck = deck
+        self.shoe_owner = None  # SharedShoe running the deck's shuffles, if the deck is shared
+        self.listeners = []
+        self.state = BETTING
+
+        self.balance = balance
+        self.bet = 0
+        self.insurance_bet = 0
+
+        self.seat = Seat(self.rules.max_hands)  # The player's hands, bets and statuses
+        self.dealer_hand = Hand()
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def emit(self, event, **data):
+        for listener in self.listeners:
+            listener(event, data)
+
+    def set_state(self, state):
+        self.state = state
+        self.emit("state_changed", state=state)
+
+    @property
+    def player_hand(self):
+        """
+        The player's first hand.
+        """
+        return self.seat.hands[0]
+
+    @property
+    def hands(self):
+        """
+        The player's hands this round, in the order they are played.
+        """
+        return self.seat.hands[:self.seat.num_hands]
+
+    @property
+    def current_hand(self):
+        """
+        The hand the player is acting on.
+        """
+        return self.seat.current
+
+    @property
+    def current_hand_name(self):
+        return SEAT_HANDS[min(self.seat.active, self.seat.num_hands - 1)]
+
+    @property
+    def can_split(self):
+        return self.state in PLAYING_STATES and self.seat.can_split and self.seat.current_bet <= self.balance
+
+    @property
+    def can_double(self):
+        return (
+            self.state in PLAYING_STATES
+            and len(self.seat.current.cards) == 2
+            and self.rules.allows_double(self.seat.current.total, after_split=self.seat.num_hands > 1)
+            and self.seat.current_bet <= self.balance
+        )
+
+    @property
+    def can_surrender(self):
+        return (
+            self.state in PLAYING_STATES
+            and self.rules.surrender
+            and self.seat.num_hands == 1
+            and len(self.player_hand.cards) == 2
+            and not self.insurance_bet
+        )
+
+    def require(self, *states):
+        if self.state not in states:
+            raise InvalidAction(f"Can't do that while the table is in the {self.state.replace('_', ' ')} state.")
+
+    def end_round(self):
+        """
+        Gives the deck's shuffle policy its turn between rounds, off the dealing path.
+
+        A shared deck is left to its SharedShoe, which waits for every table dealing from it.
+        """
+        if self.shoe_owner is not None:
+            self.shoe_owner.round_ended(self)
+        elif self.deck.end_round():
+            self.emit("reshuffled")
+
+    @timed("table.draw_card")
+    def draw_card(self):
+        """
+        Draws a card from the deck. If the deck is empty, reshuffles the shoe and continues.
+
+        With a cut card this only happens if the shoe runs out mid-round.
+        """
+        card = self.deck.draw_card()
+        if card is None:  # Deck is empty
+            self.deck.reshuffle()
+            self.emit("reshuffled")
+            card = self.deck.draw_card()
+        return card
+
+    def deal_to(self, hand_name, face_up=True):
+        hand = self.hand_named(hand_name)
+        card = self.draw_card()
+        hand.add_card(card)
+        self.emit("card_dealt", hand=hand_name, card=card, index=len(hand.cards) - 1, face_up=face_up)
+        return card
+
+    def hand_named(self, hand_name):
+        if hand_name == "dealer":
+            return self.dealer_hand
+        return self.seat.hands[SEAT_HANDS.index(hand_name)]
+
+    def place_bet(self, bet):
+        """
+        Places a bet and deals a new round.
+
+        Args:
+            bet (int): The amount to bet.
+        """
+        self.require(BETTING)
+        if bet <= 0:
+            raise InvalidAction("Bet must be greater than 0.")
+        if bet > self.balance:
+            raise InvalidAction("Insufficient balance!")
+        if self.shoe_owner is not None and self.shoe_owner.shuffle_due:
+            raise InvalidAction("Waiting for the other seats to finish before the shoe is shuffled.")
+
+        self.bet = bet
+        self.balance -= bet
+        self.emit("bet_placed", bet=bet, balance=self.balance)
+        self.start_game()
+
+    def start_game(self):
+        self.set_state(DEALING)
+
+        # Reset hands and side bets
+        self.seat.reset(self.bet)
+        self.dealer_hand = Hand()
+        self.insurance_bet = 0
+        self.emit("round_started")
+
+        # Deal cards like real blackjack
+        self.deal_to("player")
+        dealer_card1 = self.deal_to("dealer")
+        self.deal_to("player")
+        self.deal_to("dealer", face_up=False)  # Dealer's second card is face down
+
+        # A natural is paid without playing
+        if self.rules.pays_naturals and self.seat.natural:
+            self.seat.finish(STOOD)
+            self.dealer_turn()
+            return
+
+        # Check if the dealer's face-up card is an Ace
+        if dealer_card1[0] == "Ace" and self.rules.insurance:
+            self.set_state(INSURANCE)
+            self.emit("insurance_offered")
+        else:
+            self.set_state(PLAYER_TURN)
+
+    def place_insurance(self):
+        """
+        Places an insurance bet of half the original bet. It pays 2:1 if the dealer has blackjack.
+        """
+        self.require(INSURANCE)
+        insurance_bet = self.bet // 2  # Insurance bet is up to half of the original bet
+        if insurance_bet > self.balance:
+            raise InvalidAction("Insufficient balance for insurance!")
+
+        self.insurance_bet = insurance_bet
+        self.balance -= insurance_bet
+        self.emit("insurance_placed", insurance_bet=insurance_bet, balance=self.balance)
+        self.set_state(PLAYER_TURN)
+
+    def split_hand(self):
+        """
+        Splits the current hand in two if its two cards are of the same rank, up to MAX_HANDS hands.
+
+        The second card moves to a new hand with a bet equal to the current
+        hand's, which is played after the hands before it.
+        """
+        self.require(*PLAYING_STATES)
+        seat = self.seat
+        if not seat.current.is_pair:
+            raise InvalidAction("Cannot split: Cards must be of the same rank.")
+        if seat.num_hands == len(seat.hands):
+            raise InvalidAction("Cannot split: No more hands allowed.")
+        if seat.current_bet > self.balance:
+            raise InvalidAction("Insufficient balance to split!")
+
+        hand_name = self.current_hand_name
+        new_index = seat.split()
+        self.balance -= seat.bets[new_index]
+        self.emit(
+            "hand_split",
+            hand=hand_name,
+            new_hand=SEAT_HANDS[new_index],
+            card=seat.hands[new_index].cards[0],
+            bet=seat.bets[new_index],
+            balance=self.balance,
+        )
+        if self.state == INSURANCE:
+            self.set_state(PLAYER_TURN)
+
+    def hit(self):
+        """
+        Draws another card to the current hand.
+        """
+        self.require(*PLAYING_STATES)
+        if self.state == INSURANCE:
+            self.set_state(PLAYER_TURN)  # Playing on declines insurance
+        hand_name = self.current_hand_name
+        self.emit("hit", hand=hand_name)
+        self.deal_to(hand_name)
+        if self.current_hand.is_bust:
+            self.emit("bust", hand=hand_name)
+            self.finish_hand(BUST)
+
+    def double_down(self):
+        """
+        Doubles the bet on the current two-card hand, draws exactly one more card and stands.
+        """
+        self.require(*PLAYING_STATES)
+        seat = self.seat
+        if len(seat.current.cards) != 2:
+            raise InvalidAction("You can only double down on two cards.")
+        if not self.rules.allows_double(seat.current.total, after_split=seat.num_hands > 1):
+            raise InvalidAction("The table rules don't allow doubling on this hand.")
+        if seat.current_bet > self.balance:
+            raise InvalidAction("Insufficient balance to double down!")
+        if self.state == INSURANCE:
+            self.set_state(PLAYER_TURN)  # Playing on declines insurance
+
+        hand_name = self.current_hand_name
+        self.balance -= seat.double()
+        self.emit("doubled", hand=hand_name, bet=seat.current_bet, balance=self.balance)
+        self.deal_to(hand_name)
+        if self.current_hand.is_bust:
+            self.emit("bust", hand=hand_name)
+            self.finish_hand(BUST)
+        else:
+            self.finish_hand(DOUBLED)
+
+    def stand(self):
+        """
+        Stands on the current hand.
+        """
+        self.require(*PLAYING_STATES)
+        self.emit("stood", hand=self.current_hand_name)
+        self.finish_hand(STOOD)
+
+    def finish_hand(self, status):
+        """
+        Moves on to the next hand after a split, or else to the dealer's turn.
+        """
+        self.seat.finish(status)
+        if not self.seat.done:
+            self.set_state(SPLIT_HAND)
+            self.emit("next_hand_started", hand=self.current_hand_name)
+            return
+        self.dealer_turn()
+
+    def surrender(self):
+        """
+        Gives up the first two cards for half the bet back (rounded down), if the rules allow it.
+        """
+        self.require(*PLAYING_STATES)
+        if not self.rules.surrender:
+            raise InvalidAction("The table rules don't allow surrender.")
+        if self.seat.num_hands > 1 or len(self.player_hand.cards) != 2:
+            raise InvalidAction("You can only surrender your first two cards.")
+        if self.insurance_bet:
+            raise InvalidAction("Cannot surrender after taking insurance.")
+
+        refund = self.bet // 2
+        self.seat.finish(SURRENDERED)
+        self.emit("surrendered", hand="player")
+        self.set_state(SETTLE)
+        self.reveal_hole_card()
+        self.balance += refund
+        self.emit(
+            "hand_settled",
+            hand="player",
+            outcome=OUTCOME_NAMES[SURRENDER],
+            total=self.player_hand.total,
+            dealer_total=None,
+            payout=refund,
+        )
+        self.end_round()
+        self.emit("round_settled", balance=self.balance, net=refund - self.bet)
+        self.set_state(BETTING)
+
+    def fold(self):
+        """
+        Gives up the round. Every bet on the table is lost.
+        """
+        self.require(*PLAYING_STATES)
+        self.emit("folded")
+        self.set_state(SETTLE)
+        self.reveal_hole_card()
+        self.end_round()
+        net = -(self.seat.total_bet + self.insurance_bet)
+        self.emit("round_settled", balance=self.balance, net=net)
+        self.set_state(BETTING)
+
+    def reveal_hole_card(self):
+        """
+        Turns the dealer's face-down card over, in every round, including those that end before the dealer plays.
+        """
+        self.emit("hole_card_revealed", card=self.dealer_hand.cards[1], total=self.dealer_hand.total)
+
+    def dealer_turn(self):
+        """
+        Reveals the dealer's face-down card and draws until the rules say to stand.
+        """
+        self.set_state(DEALER_TURN)
+        self.reveal_hole_card()
+
+        # The dealer only plays if a player hand is still standing, and a paid natural is already decided
+        rules = self.rules
+        if self.seat.any_standing and not (rules.pays_naturals and self.seat.natural):
+            while rules.dealer_hits(self.dealer_hand.total, self.dealer_hand.is_soft):
+                self.deal_to("dealer")
+
+        self.determine_winner()
+
+    @timed("table.determine_winner")
+    def determine_winner(self):
+        """
+        Settles every player hand and the insurance bet, then returns to betting.
+        """
+        self.set_state(SETTLE)
+        start_balance = self.balance
+        dealer_total = self.dealer_hand.total
+        staked = self.seat.total_bet + self.insurance_bet
+
+        results = self.seat.settle(dealer_total, self.dealer_hand.is_blackjack, self.rules.blackjack_pays)
+        for index, (outcome, payout) in enumerate(results):
+            self.balance += payout
+            self.emit(
+                "hand_settled",
+                hand=SEAT_HANDS[index],
+                outcome=OUTCOME_NAMES[outcome],
+                total=self.seat.hands[index].total,
+                dealer_total=dealer_total,
+                payout=payout,
+            )
+
+        if self.insurance_bet:
+            won = self.dealer_hand.is_blackjack
+            payout = self.insurance_bet * 3 if won else 0  # Insurance pays 2:1
+            self.balance += payout
+            self.emit("insurance_settled", won=won, payout=payout)
+
+        self.end_round()
+        self.emit("round_settled", balance=self.balance, net=self.balance - start_balance - staked)
+        self.set_state(BETTING)
+
+
+class SharedShoe:
+    """
+    One Deck dealt to several single-seat Tables, e.g. scripted players sharing a shoe.
+
+    A shuffle policy puts the drawn cards back into the shoe, so it must not
+    run while any table still holds cards. Tables joined here leave
+    end_round to the SharedShoe: once the policy is due (the cut card is
+    out, or for a continuous shuffler any card was dealt) new bets are
+    refused, and the policy runs as the last table with cards out settles.
+
+    Args:
+        deck (Deck): The shoe the tables deal from.
+    """
+
+    def __init__(self, deck):
+        self.deck = deck
+        self.tables = []
+        self.shuffle_due = False
+
+    def join(self, table):
+        """
+        Deals the table from this shoe from its next round on.
+        """
+        table.deck = self.deck
+        table.shoe_owner = self
+        self.tables.append(table)
+
+    def leave(self, table):
+        self.tables.remove(table)
+        table.shoe_owner = None
+        if self.shuffle_due and all(other.state == BETTING for other in self.tables):
+            self.shuffle()
+
+    def round_ended(self, table):
+        """
+        Called by a table as its round settles, before it returns to betting.
+        """
+        if not self.shuffle_due:
+            self.shuffle_due = self.deck.shuffle_policy.due(self.deck.shoe)
+        if self.shuffle_due and all(other is table or other.state == BETTING for other in self.tables):
+            self.shuffle()
+
+    def shuffle(self):
+        self.shuffle_due = False
+        if self.deck.end_round():
+            for table in self.tables:
+                table.emit("reshuffled")
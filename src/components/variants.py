@@ -0,0 +1,84 @@
+"""
+Per-variant lookup tables, built once per rule set and shared read-only by everything that plays it.
+
+A rule variant needs its basic strategy chart, the policy tables the
+vectorized simulation plays from, the dealer's drawing rule and its payout
+table. Solving the chart is the slow part, so charts are kept on disk by
+strategy.chart_for and the rest is memoized per process by tables_for.
+Worker pools are handed the parent's tables once, as each worker starts
+(install), so tasks only need to name their RuleSet and no worker rebuilds
+a table the parent already has.
+"""
+from components.card_images import CACHE_DIR
+from components.rules import DEFAULT_RULES
+from components.seat import payout_units
+from components.simulation import DEALER_HITS, PlayerPolicy
+from components.strategy import chart_for
+
+
+class VariantTables:
+    """
+    Everything simulation.play_shoes needs for one RuleSet, precomputed.
+
+    The arrays are read-only, since one set of tables is shared by every
+    simulation of the variant in a process.
+
+    Attributes:
+        rules (RuleSet): The variant.
+        chart (StrategyChart): Basic strategy under the rules.
+        policy (PlayerPolicy): The chart as simulation lookup tables.
+        dealer_hits (numpy.ndarray): Whether the dealer draws, per hand_values state.
+        payouts (numpy.ndarray): Net result per unit bet of each settlement outcome, in payout_scale units.
+        payout_scale (int): Units per bet of payouts.
+    """
+
+    __slots__ = ("rules", "chart", "policy", "dealer_hits", "payouts", "payout_scale")
+
+    def __init__(self, rules, cache_dir=CACHE_DIR):
+        self.rules = rules
+        self.chart = chart_for(cache_dir=cache_dir, rules=rules)
+        self.policy = PlayerPolicy.from_chart(self.chart, rules=rules)
+        self.dealer_hits = DEALER_HITS[rules.hit_soft_17]
+        self.payouts, self.payout_scale = payout_units(rules.blackjack_pays, rules.surrender)
+        self._freeze()
+
+    def _freeze(self):
+        for array in (self.policy.actions, self.policy.no_double, self.dealer_hits, self.payouts):
+            array.flags.writeable = False
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._freeze()  # Pickling drops the read-only flags
+
+
+_tables = {}
+
+
+def tables_for(rules=None, cache_dir=CACHE_DIR):
+    """
+    Returns the tables for a rule set (defaults to the house rules), building them on first use in this process.
+    """
+    rules = rules if rules is not None else DEFAULT_RULES
+    tables = _tables.get(rules)
+    if tables is None:
+        tables = _tables[rules] = VariantTables(rules, cache_dir)
+    return tables
+
+
+def install(tables):
+    """
+    Adds tables built elsewhere to this process's cache, e.g. as a worker pool's initializer.
+
+    Args:
+        tables (list): VariantTables, typically built by the parent process with tables_for.
+    """
+    for variant in tables:
+        _tables[variant.rules] = variant
+
+
+def clear_cache():
+    _tables.clear()
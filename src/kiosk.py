@@ -0,0 +1,372 @@
+"""
+Runs the blackjack table on a pygame surface instead of Tk, for kiosks and large displays.
+
+Keys: type a bet and press Enter, then H to hit, S to stand, D to double
+down, P to split, I for insurance, F to fold and R to surrender (where the
+table's --rules allow it). Esc quits.
+
+The table is snapshotted to a state file after every action, and restored
+from it on start, so a restart mid-hand keeps the bet, the hands and the shoe.
+"""
+import argparse
+import json
+import os
+import time
+
+import pygame
+
+from components.animations import Animator, DirtyRenderer, SurfaceImages
+from components import snapshot
+from components.audio import AudioEngine
+from components.card_images import CACHE_DIR, CARD_SIZE
+from components.deck import Deck
+from components.rules import BLACKJACK, DEFAULT_RULES, RuleSet
+from components.sprite_pool import SLOTS_PER_HAND
+from components.seat import SEAT_HANDS
+from components.shuffle import CutCardPolicy
+from components.table import Table, InvalidAction, BETTING, DEALER_TURN, SETTLE
+
+FPS = 60
+STATE_FILE = os.path.join(CACHE_DIR, "kiosk_table.bin")
+
+# Layout of the Tk window, scaled to the screen
+BASE_SIZE = (800, 700)
+HAND_POSITIONS = {
+    "player": (200, 300),
+    "second": (350, 300),
+    "third": (500, 300),
+    "fourth": (650, 300),
+    "dealer": (200, 100),
+}
+ROW_WIDTH = 600  # Room for the dealer's cards, and the player's until they split
+HAND_WIDTH = 150  # Room for each hand once the player has split
+CARD_SPACING = 50  # Gap between cards, closed up when a hand has more cards than fit its room
+DECK_POSITION = (50, 200)
+LABEL_POSITIONS = {
+    "balance": (50, 520),
+    "bet": (300, 520),
+    "player_total": (50, 560),
+    "dealer_total": (300, 560),
+    "message": (50, 600),
+}
+TEXT_COLOR = (255, 255, 255)
+FONT_SIZE = 24
+
+HAND_NAMES = {"player": "First Hand", "second": "Second Hand", "third": "Third Hand", "fourth": "Fourth Hand"}
+RESULT_MESSAGES = {
+    "win": "You win!", "lose": "Dealer wins!", "push": "It's a tie!", "blackjack": "Blackjack!",
+    "surrender": "You surrendered.",
+}
+
+
+class Label:
+    """
+    A line (or lines) of text drawn as a sprite, re-rendered only when the text changes.
+    """
+
+    def __init__(self, renderer, font, pos):
+        self.renderer = renderer
+        self.font = font
+        self.text = None
+        self.sprite = renderer.add(font.render("", True, TEXT_COLOR), pos)
+
+    def set(self, text):
+        if text == self.text:
+            return
+        self.text = text
+        lines = [self.font.render(line, True, TEXT_COLOR) for line in text.split("\n")]
+        surface = pygame.Surface(
+            (max(line.get_width() for line in lines), sum(line.get_height() for line in lines)), pygame.SRCALPHA
+        )
+        y = 0
+        for line in lines:
+            surface.blit(line, (0, y))
+            y += line.get_height()
+        self.renderer.set_image(self.sprite, surface)
+
+
+class KioskGame:
+    """
+    A Table subscriber that draws the game with DirtyRenderer and reads input from the keyboard.
+
+    Args:
+        screen (pygame.Surface): The display surface.
+        state_file (str): Where to keep the table's snapshot, or None to not keep one.
+        rules (RuleSet): Rules the table plays by. A snapshot saved under other rules isn't restored.
+    """
+
+    def __init__(self, screen, state_file=None, rules=DEFAULT_RULES):
+        self.screen = screen
+        width, height = screen.get_size()
+        self.scale = min(width / BASE_SIZE[0], height / BASE_SIZE[1])
+        self.card_images = SurfaceImages((round(CARD_SIZE[0] * self.scale), round(CARD_SIZE[1] * self.scale)))
+
+        self.deck = Deck(rules.num_decks, shuffle_policy=CutCardPolicy(rules.penetration))
+        self.table = Table(self.deck, rules=rules)
+        self.results = []
+        self.bet_text = ""
+
+        self.audio = AudioEngine()
+
+        self.renderer = DirtyRenderer(screen)
+        self.animator = Animator(self.renderer)
+        self.renderer.add(self.card_images["back"], self.at(DECK_POSITION))
+
+        # A fixed set of card sprites per hand, reused every round
+        self.cards = {
+            hand: [self.renderer.add(self.card_images["back"], visible=False) for _ in range(SLOTS_PER_HAND)]
+            for hand in HAND_POSITIONS
+        }
+        self.used = {hand: 0 for hand in HAND_POSITIONS}
+
+        font = pygame.font.Font(None, round(FONT_SIZE * self.scale))
+        self.labels = {name: Label(self.renderer, font, self.at(pos)) for name, pos in LABEL_POSITIONS.items()}
+        self.labels["balance"].set(f"Balance: {self.table.balance}")
+        self.labels["bet"].set("Bet: ")
+        self.labels["message"].set("Type a bet and press Enter.")
+
+        self.table.subscribe(self.on_table_event)
+
+        self.state_file = state_file
+        if state_file is not None:
+            os.makedirs(os.path.dirname(state_file) or ".", exist_ok=True)
+            if os.path.exists(state_file):
+                self.restore()
+
+    def restore(self):
+        """
+        Restores the table from the state file and redraws it as it was.
+        """
+        try:
+            snapshot.load(self.state_file, self.table)
+        except (OSError, ValueError) as error:
+            print(f"Couldn't restore the table: {error}")
+            return
+        table = self.table
+        names = [SEAT_HANDS[index] for index in range(len(table.hands))] + ["dealer"]
+        for hand in names:
+            cards = table.hand_named(hand).cards
+            for index, card in enumerate(cards):
+                face_up = not (hand == "dealer" and index == 1 and table.state != BETTING)
+                sprite = self.cards[hand][index]
+                self.renderer.set_image(sprite, self.card_images[card if face_up else "back"])
+                self.renderer.place(sprite, self.card_position(hand, index, len(cards)))
+                self.renderer.show(sprite)
+            self.used[hand] = len(cards)
+        self.labels["balance"].set(f"Balance: {table.balance}")
+        if table.state == BETTING:
+            return
+        self.update_player_total()
+        self.labels["dealer_total"].set("Dealer Total: ?")
+        self.labels["message"].set("Game restored. Play on.")
+
+    def at(self, pos):
+        return (round(pos[0] * self.scale), round(pos[1] * self.scale))
+
+    def card_position(self, hand, index, count):
+        """
+        Returns where a hand's index-th card goes while the hand holds count cards.
+        """
+        x, y = HAND_POSITIONS[hand]
+        spacing = min(CARD_SPACING, (self.hand_width(hand) - CARD_SIZE[0]) / max(count - 1, 1))
+        return self.at((x + index * spacing, y))
+
+    def hand_width(self, hand):
+        return ROW_WIDTH if hand == "dealer" or len(self.table.hands) == 1 else HAND_WIDTH
+
+    def close_up(self, hand, count):
+        """
+        Moves a hand's earlier cards closer together once it holds more cards than fit its room.
+        """
+        if (count - 1) * CARD_SPACING <= self.hand_width(hand) - CARD_SIZE[0]:
+            return
+        for index in range(count - 1):
+            sprite = self.cards[hand][index]
+            pos = self.card_position(hand, index, count)
+            if not self.animator.retarget(sprite, pos):
+                self.renderer.place(sprite, pos)
+
+    def run(self):
+        clock = pygame.time.Clock()
+        last = time.perf_counter()
+        self.audio.start()  # The window is up, so the device can open in the background
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    return
+                if event.type == pygame.KEYDOWN:
+                    self.on_key(event)
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.renderer.invalidate()
+            now = time.perf_counter()
+            self.renderer.render(self.animator.advance(now - last))
+            last = now
+            clock.tick(FPS)
+
+    def on_key(self, event):
+        actions = {
+            pygame.K_h: self.table.hit,
+            pygame.K_s: self.table.stand,
+            pygame.K_d: self.table.double_down,
+            pygame.K_p: self.table.split_hand,
+            pygame.K_i: self.table.place_insurance,
+            pygame.K_f: self.table.fold,
+            pygame.K_r: self.table.surrender,
+        }
+        if event.unicode.isdigit():
+            self.bet_text += event.unicode
+        elif event.key == pygame.K_BACKSPACE:
+            self.bet_text = self.bet_text[:-1]
+        elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            if self.bet_text:
+                self.perform(self.table.place_bet, int(self.bet_text))
+        elif event.key in actions:
+            self.perform(actions[event.key])
+        self.labels["bet"].set(f"Bet: {self.bet_text}")
+
+    def perform(self, action, *args):
+        try:
+            action(*args)
+        except InvalidAction as error:
+            self.labels["message"].set(str(error))
+            return
+        if self.state_file is not None:
+            snapshot.save(self.table, self.state_file)
+
+    def on_table_event(self, event, data):
+        handler = getattr(self, f"on_{event}", None)
+        if handler:
+            handler(**data)
+
+    def show_card(self, hand, image, start_pos, end_pos):
+        sprite = self.cards[hand][self.used[hand]]
+        self.used[hand] += 1
+        self.renderer.set_image(sprite, image)
+        self.animator.move(sprite, start_pos, end_pos, on_start=self.play_card_sound)
+        return sprite
+
+    def play_card_sound(self):
+        self.audio.play("deal")
+
+    def on_bet_placed(self, bet, balance):
+        self.labels["balance"].set(f"Balance: {balance}")
+
+    def on_round_started(self):
+        self.animator.cancel_all()
+        for hand, sprites in self.cards.items():
+            for sprite in sprites[:self.used[hand]]:
+                self.renderer.show(sprite, False)
+            self.used[hand] = 0
+        self.results = []
+        self.labels["message"].set("")
+        self.labels["player_total"].set("Player Total: 0")
+        self.labels["dealer_total"].set("Dealer Total: ?")
+
+    def on_reshuffled(self):
+        self.audio.play("shuffle")
+        if self.table.state == SETTLE:
+            self.results.append("Shoe reshuffled.")
+        else:
+            self.labels["message"].set("Deck is empty! Reshuffling...")
+
+    def on_card_dealt(self, hand, card, index, face_up):
+        image = self.card_images[card if face_up else "back"]
+        self.show_card(hand, image, self.at(DECK_POSITION), self.card_position(hand, index, index + 1))
+        self.close_up(hand, index + 1)
+        if hand == "dealer":
+            if self.table.state == DEALER_TURN:
+                self.update_dealer_total()
+        else:
+            self.update_player_total()
+
+    def on_insurance_offered(self):
+        self.labels["message"].set("Dealer shows an Ace! Press I for insurance.")
+
+    def on_insurance_placed(self, insurance_bet, balance):
+        self.labels["balance"].set(f"Balance: {balance}")
+        self.labels["message"].set(f"Insurance bet placed: {insurance_bet}")
+
+    def on_hand_split(self, hand, new_hand, card, bet, balance):
+        self.labels["balance"].set(f"Balance: {balance}")
+        # Stop the split card's deal if it's still on its way before hiding its sprite
+        self.used[hand] -= 1
+        self.animator.cancel(self.cards[hand][self.used[hand]])
+        self.renderer.show(self.cards[hand][self.used[hand]], False)
+        self.show_card(
+            new_hand, self.card_images[card], self.card_position(hand, 1, 2), self.card_position(new_hand, 0, 1)
+        )
+        self.labels["message"].set(f"Hand split! Play your {HAND_NAMES[hand].lower()}.")
+        self.update_player_total()
+
+    def on_next_hand_started(self, hand):
+        self.labels["message"].set(f"Now playing your {HAND_NAMES[hand].lower()}.")
+        self.update_player_total()
+
+    def on_doubled(self, hand, bet, balance):
+        self.labels["balance"].set(f"Balance: {balance}")
+        self.labels["message"].set(f"Doubled down! Bet is now {bet}.")
+
+    def on_bust(self, hand):
+        self.labels["message"].set("Bust! You went over 21.")
+
+    def on_hole_card_revealed(self, card, total):
+        self.renderer.set_image(self.cards["dealer"][1], self.card_images[card])
+        self.update_dealer_total()
+
+    def on_folded(self):
+        self.results.append("Player folded. Game over.")
+
+    def on_hand_settled(self, hand, outcome, total, dealer_total, payout):
+        message = RESULT_MESSAGES[outcome]
+        if total > BLACKJACK:
+            message = "Bust! You went over 21."
+        elif outcome == "win" and dealer_total > BLACKJACK:
+            message = "Dealer busts! You win!"
+        self.results.append(f"{HAND_NAMES[hand]}: {message}")
+
+    def on_insurance_settled(self, won, payout):
+        self.results.append("Insurance pays!" if won else "Insurance lost.")
+
+    def on_round_settled(self, balance, net):
+        if net:
+            self.audio.play("win" if net > 0 else "lose")
+        if self.results:
+            self.labels["message"].set("\n".join(self.results))
+        self.labels["balance"].set(f"Balance: {balance}")
+
+    def update_player_total(self):
+        self.labels["player_total"].set(f"Player Total: {self.table.current_hand.total}")
+
+    def update_dealer_total(self):
+        self.labels["dealer_total"].set(f"Dealer Total: {self.table.dealer_hand.total}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play blackjack on a pygame display.")
+    parser.add_argument("--size", default="800x700", help="Window size as WIDTHxHEIGHT")
+    parser.add_argument("--fullscreen", action="store_true", help="Use the whole screen at its native resolution")
+    parser.add_argument("--state-file", default=STATE_FILE, help="Snapshot file the table is saved to and restored from")
+    parser.add_argument("--new-game", action="store_true", help="Start a fresh table instead of restoring the saved one")
+    parser.add_argument("--rules", default="{}",
+                        help='JSON object of table rules, e.g. \'{"num_decks": 6, "surrender": true}\'')
+    args = parser.parse_args()
+    rules = RuleSet.from_dict(json.loads(args.rules))
+
+    # The mixer is left to AudioEngine, which opens it in the background with a small buffer once run() starts
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_caption("Blackjack Game")
+    if args.fullscreen:
+        screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        screen = pygame.display.set_mode(tuple(int(n) for n in args.size.split("x")))
+    if args.new_game and os.path.exists(args.state_file):
+        os.remove(args.state_file)
+    game = KioskGame(screen, state_file=args.state_file or None, rules=rules)
+    game.run()
+    game.audio.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,39 @@
+import os
 import tkinter as tk
 from tkinter import Toplevel, Scale
+from components import metrics
+from components.audio import AudioEngine
+from components.card_images import CARD_SIZE
 from components.deck import Deck
-from components.hand import Hand
-import time
-import pygame  # For playing sound effects
+from components.round_log import RoundRecorder
+from components.rules import BLACKJACK
+from components.table import Table, InvalidAction, BETTING, INSURANCE, DEALER_TURN, SETTLE, PLAYING_STATES
+from components.scheduler import AnimationScheduler
+from components.sprite_pool import SpritePool
+from components.strategy import chart_for
+
+# Where each hand's first card lands on the canvas; split hands sit side by side, HAND_WIDTH apart
+HAND_POSITIONS = {
+    "player": (200, 300),
+    "second": (350, 300),
+    "third": (500, 300),
+    "fourth": (650, 300),
+    "dealer": (200, 100),
+}
+ROW_WIDTH = 600  # Room for the dealer's cards, and the player's until they split
+HAND_WIDTH = 150  # Room for each hand once the player has split
+CARD_SPACING = 50  # Gap between cards, closed up when a hand has more cards than fit its room
+DECK_POSITION = (50, 200)
+
+HAND_NAMES = {"player": "First Hand", "second": "Second Hand", "third": "Third Hand", "fourth": "Fourth Hand"}
+METRICS_INTERVAL_MS = 5000  # How often metrics are written to BLACKJACK_METRICS_FILE
+STATS_REFRESH_MS = 1000
+
+HINT_MESSAGES = {"stand": "Stand", "hit": "Hit", "double": "Double down", "split": "Split", "surrender": "Surrender"}
+RESULT_MESSAGES = {
+    "win": "You win!", "lose": "Dealer wins!", "push": "It's a tie!", "blackjack": "Blackjack!",
+    "surrender": "You surrendered.",
+}
 
 class BlackjackGame:
     def __init__(self, master):
@@ -14,26 +44,34 @@ class BlackjackGame:
         # Set the window icon
         self.master.iconbitmap("src/assets/msc/icon.ico")
 
-        # Initialize balance, bet, and insurance
-        self.balance = 1000  # Starting balance
-        self.bet = 0  # Current bet
-        self.insurance_bet = 0  # Insurance bet
+        # Sound effects; the audio device opens in the background once the window is up, so startup never waits on it
+        self.audio = AudioEngine()
+        self.master.after_idle(self.audio.start)
 
-        # Variables for splitting
-        self.second_hand = None
-        self.second_hand_bet = 0
-        self.playing_second_hand = False
+        # The table holds all game state and rules; the window just follows its events
+        self.deck = Deck()
+        self.table = Table(self.deck)
 
-        # Initialize pygame mixer for sound effects
-        pygame.mixer.init()
-        self.card_draw_sound = pygame.mixer.Sound("src/assets/sounds/card_draw.wav")
-        self.card_draw_sound.set_volume(0.2)  # Default volume (20%)
+        # Basic strategy for the hint button, loaded on the first hint (solved once per rule set and cached on disk)
+        self.strategy = None
 
-        self.deck = Deck()
-        self.player_hand = Hand()
-        self.dealer_hand = Hand()
+        # Keep an audit trail of every round if a log file is configured
+        log_path = os.environ.get("BLACKJACK_ROUND_LOG")
+        self.recorder = RoundRecorder(log_path) if log_path else None
+        if self.recorder:
+            self.table.subscribe(self.recorder)
+
+        self.results = []
+        self.button_states = {}
+        self.stats_label = None
+
+        # Periodically write the metrics out for scraping if instrumentation is on
+        self.metrics_path = os.environ.get("BLACKJACK_METRICS_FILE") if metrics.ENABLED else None
+        if self.metrics_path:
+            self.master.after(METRICS_INTERVAL_MS, self.dump_metrics)
 
         self.setup_ui()
+        self.table.subscribe(self.on_table_event)
 
     def setup_ui(self):
         # Setup menu bar
@@ -43,12 +81,14 @@ class BlackjackGame:
         # Add "Game" menu
         game_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="Game", menu=game_menu)
-        game_menu.add_command(label="Start Game", command=self.start_game)
+        game_menu.add_command(label="Start Game", command=self.place_bet)
 
         # Add "Settings" menu
         settings_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="Settings", menu=settings_menu)
         settings_menu.add_command(label="Volume", command=self.open_settings)
+        if metrics.ENABLED:
+            settings_menu.add_command(label="Stats", command=self.open_stats)
 
         # Setup canvas for cards
         self.canvas = tk.Canvas(self.master, width=800, height=400, bg='green')
@@ -56,13 +96,20 @@ class BlackjackGame:
 
         # Initialize the deck image (card back)
         self.deck_image = self.deck.card_images["back"]  # Ensure this is set correctly
+        self.canvas.create_image(*DECK_POSITION, image=self.deck_image, anchor=tk.NW)
+
+        # A fixed set of card items per hand, reused every round
+        self.sprites = SpritePool(self.canvas, HAND_POSITIONS, anchor=tk.NW)
+
+        # Card moves run from the event loop so the UI stays responsive while dealing
+        self.animations = AnimationScheduler(self.sprites)
 
         # Frame for betting and balance
         betting_frame = tk.Frame(self.master)
         betting_frame.pack(pady=10)
 
         # Balance label
-        self.balance_label = tk.Label(betting_frame, text=f"Balance: {self.balance}", font=("Arial", 14))
+        self.balance_label = tk.Label(betting_frame, text=f"Balance: {self.table.balance}", font=("Arial", 14))
         self.balance_label.pack(side=tk.LEFT, padx=10)
 
         # Bet entry
@@ -83,6 +130,9 @@ class BlackjackGame:
         
         self.stand_button = tk.Button(button_frame, text="Stand", command=self.stand, state=tk.DISABLED)
         self.stand_button.pack(side=tk.LEFT, padx=10)
+
+        self.double_button = tk.Button(button_frame, text="Double", command=self.double_down, state=tk.DISABLED)
+        self.double_button.pack(side=tk.LEFT, padx=10)
         
         self.fold_button = tk.Button(button_frame, text="Fold", command=self.fold, state=tk.DISABLED)
         self.fold_button.pack(side=tk.LEFT, padx=10)
@@ -99,6 +149,10 @@ class BlackjackGame:
         self.split_button = tk.Button(bottom_button_frame, text="Split", command=self.split_hand, state=tk.DISABLED)
         self.split_button.pack(side=tk.LEFT, padx=10)
 
+        # Add Hint button
+        self.hint_button = tk.Button(bottom_button_frame, text="Hint", command=self.show_hint, state=tk.DISABLED)
+        self.hint_button.pack(side=tk.LEFT, padx=10)
+
 
         # Frame for totals
         totals_frame = tk.Frame(self.master)
@@ -137,356 +191,307 @@ class BlackjackGame:
             orient="horizontal",
             command=self.set_volume
         )
-        volume_slider.set(int(self.card_draw_sound.get_volume() * 100))  # Set slider to current volume
+        volume_slider.set(int(self.audio.get_volume() * 100))  # Set slider to current volume
         volume_slider.pack()
 
-    def set_volume(self, volume):
+    def open_stats(self):
         """
-        Sets the volume for the card draw sound effect.
+        Opens a window with live call counts, latencies and frame times.
         """
-        self.card_draw_sound.set_volume(int(volume) / 100)
+        if self.stats_label is not None:
+            return  # Already open
+        stats_window = Toplevel(self.master)
+        stats_window.title("Stats")
+        self.stats_label = tk.Label(stats_window, font=("Courier", 10), justify=tk.LEFT)
+        self.stats_label.pack(padx=10, pady=10)
+        stats_window.protocol("WM_DELETE_WINDOW", lambda: self.close_stats(stats_window))
+        self.refresh_stats()
+
+    def refresh_stats(self):
+        if self.stats_label is None:
+            return
+        self.stats_label.config(text=metrics.REGISTRY.format_table())
+        self.master.after(STATS_REFRESH_MS, self.refresh_stats)
+
+    def close_stats(self, stats_window):
+        self.stats_label = None
+        stats_window.destroy()
 
-    def draw_card_with_reshuffle(self):
+    def dump_metrics(self):
         """
-        Draws a card from the deck. If the deck is empty, reshuffles the shoe and continues.
+        Writes the metrics to BLACKJACK_METRICS_FILE and schedules the next dump.
         """
-        card = self.deck.draw_card()
-        if card is None:  # Deck is empty
-            self.message_label.config(text="Deck is empty! Reshuffling...")
-            self.master.update()  # Update the UI to show the reshuffle message
-            self.deck.reshuffle()
-            card = self.deck.draw_card()  # Draw a card after reshuffling
-        return card
-
-    def start_game(self):
-        self.deck.shuffle()
-
-        # Reset hands and UI
-        self.player_hand = Hand()
-        self.dealer_hand = Hand()
-        self.canvas.delete("all")
-        self.canvas.create_image(50, 200, image=self.deck_image, anchor=tk.NW)
-        self.message_label.config(text="")
-        self.player_total_label.config(text="Player Total: 0")
-        self.dealer_total_label.config(text="Dealer Total: ?")
-
-        # Deal cards like real blackjack
-        player_card1 = self.draw_card_with_reshuffle()
-        self.animate_card(player_card1, (50, 200), (200, 300), overlap_offset=0)  # Player's first card
-        self.player_hand.add_card(player_card1)
-
-        dealer_card1 = self.draw_card_with_reshuffle()
-        self.animate_card(dealer_card1, (50, 200), (200, 100), overlap_offset=0)  # Dealer's first card
-        self.dealer_hand.add_card(dealer_card1)
-
-        player_card2 = self.draw_card_with_reshuffle()
-        self.animate_card(player_card2, (50, 200), (200, 300), overlap_offset=50)  # Player's second card
-        self.player_hand.add_card(player_card2)
-
-        dealer_card2 = self.draw_card_with_reshuffle()
-        self.animate_card("back", (50, 200), (200, 100), overlap_offset=50)  # Dealer's second card (face down)
-        self.dealer_hand.add_card(dealer_card2)  # Add the face-down card to the dealer's hand
-
-        # Update player's total
-        self.update_player_total()
-
-        # Check if the dealer's face-up card is an Ace
-        if dealer_card1[0] == "Ace":
-            self.message_label.config(text="Dealer shows an Ace! Place insurance?")
-            self.insurance_button.config(state=tk.NORMAL)  # Enable the insurance button
-
-        # Enable Split button if the first two cards are of the same rank
-        if self.player_hand.cards[0][0] == self.player_hand.cards[1][0]:
-            self.split_button.config(state=tk.NORMAL)
-
-        # Enable Hit, Stand, and Fold buttons
-        self.hit_button.config(state=tk.NORMAL)
-        self.stand_button.config(state=tk.NORMAL)
-        self.fold_button.config(state=tk.NORMAL)
+        try:
+            metrics.REGISTRY.dump(self.metrics_path)
+        except OSError as error:
+            print(f"Could not write metrics: {error}")
+        self.master.after(METRICS_INTERVAL_MS, self.dump_metrics)
 
-    def animate_card(self, card, start_pos, end_pos, overlap_offset=50):
+    def set_volume(self, volume):
         """
-        Animates a card moving from start_pos to end_pos on the canvas.
-
-        Args:
-            card (tuple or str): The card to animate (e.g., ('Ace', 'Spades')) or "back" for face-down.
-            start_pos (tuple): Starting position (x, y) of the card.
-            end_pos (tuple): Ending position (x, y) of the card.
-            overlap_offset (int): Offset for overlapping cards within the same hand.
+        Sets the volume for the sound effects.
         """
-        # Play the card draw sound effect
-        self.card_draw_sound.play()
-
-        # Adjust the end position for overlapping cards
-        end_pos = (end_pos[0] + overlap_offset, end_pos[1])
-
-        card_image = self.deck.card_images[card]
-        card_id = self.canvas.create_image(start_pos[0], start_pos[1], image=card_image, anchor=tk.NW)
+        self.audio.set_volume(int(volume) / 100)
 
-        # Animation loop
-        steps = 20
-        dx = (end_pos[0] - start_pos[0]) / steps
-        dy = (end_pos[1] - start_pos[1]) / steps
-
-        for i in range(steps):
-            self.canvas.move(card_id, dx, dy)
-            self.master.update()
-            time.sleep(0.02)  # 20ms delay for smooth animation
+    def perform(self, action, *args):
+        """
+        Runs a table action, showing the reason in the message label if it isn't allowed.
+        """
+        try:
+            action(*args)
+        except InvalidAction as error:
+            self.message_label.config(text=str(error))
 
-        # Keep a reference to the card image to prevent garbage collection
-        if end_pos[1] > 200:  # Player's hand
-            self.player_card_image = card_image
-        else:  # Dealer's hand
-            self.dealer_card_image = card_image
+    def place_bet(self):
+        """
+        Places a bet from the bet entry and deals a new round.
+        """
+        try:
+            bet = int(self.bet_entry.get())
+        except ValueError:
+            self.message_label.config(text="Invalid bet amount.")
+            return
+        self.perform(self.table.place_bet, bet)
 
     def hit(self):
         """
         Player chooses to draw another card.
         """
-        new_card = self.draw_card_with_reshuffle()
-
-        if self.playing_second_hand:
-            # Hits for the second hand (offset by 25px)
-            x_offset = 150 + len(self.second_hand.cards) * 50  # Offset for new card
-            self.animate_card(new_card, (50, 200), (x_offset, 325))  # Push down by 25px
-            self.second_hand.add_card(new_card)
-        else:
-            # Hits for the first hand
-            x_offset = 150 + len(self.player_hand.cards) * 50  # Offset for new card
-            self.animate_card(new_card, (50, 200), (x_offset, 300))
-            self.player_hand.add_card(new_card)
-
-        # Update player's total and check for bust
-        self.update_player_total()
-        if self.calculate_hand_total(self.player_hand if not self.playing_second_hand else self.second_hand) > 21:
-            self.declare_bust()
+        self.perform(self.table.hit)
 
     def stand(self):
         """
         Player chooses to stand. Dealer reveals the face-down card and plays.
         """
-        if self.playing_second_hand:
-            # Finish the second hand and proceed to the dealer's turn
-            self.playing_second_hand = False
-            self.message_label.config(text="Now playing the dealer's turn.")
-        elif self.second_hand:
-            # Switch to the second hand
-            self.playing_second_hand = True
-            self.player_hand = self.second_hand
-            self.second_hand = None
-            self.message_label.config(text="Now playing your second hand.")
-            self.update_player_total()
-            return
-
-        # Reveal dealer's face-down card
-        face_down_card = self.dealer_hand.cards[1]
-        self.animate_card(face_down_card, (250, 100), (250, 100), overlap_offset=0)  # Adjusted for overlap
-
-        # Update dealer's total immediately after revealing the card
-        self.update_dealer_total()
-
-        # Dealer's turn: follow standard casino rules
-        while self.calculate_hand_total(self.dealer_hand) < 17:
-            new_card = self.draw_card_with_reshuffle()
-            x_offset = 150 + len(self.dealer_hand.cards) * 50  # Offset for new card
-            self.animate_card(new_card, (50, 200), (x_offset, 100))
-            self.dealer_hand.add_card(new_card)
-            self.update_dealer_total()
+        self.perform(self.table.stand)
 
-        # Determine the winner for both hands
-        self.determine_winner()
-
-        # Disable buttons after the game ends
-        self.hit_button.config(state=tk.DISABLED)
-        self.stand_button.config(state=tk.DISABLED)
-        self.fold_button.config(state=tk.DISABLED)
+    def double_down(self):
+        """
+        Player doubles the bet, takes one more card and stands.
+        """
+        self.perform(self.table.double_down)
 
     def fold(self):
         """
         Player chooses to fold. End the game.
         """
-        # Disable buttons after folding
-        self.hit_button.config(state=tk.DISABLED)
-        self.stand_button.config(state=tk.DISABLED)
-        self.fold_button.config(state=tk.DISABLED)
+        self.perform(self.table.fold)
 
-        # Display a message or reset the game
-        self.message_label.config(text="Player folded. Game over.")
+    def place_insurance(self):
+        """
+        Allows the player to place an insurance bet.
+        """
+        self.perform(self.table.place_insurance)
 
-    def update_player_total(self):
+    def split_hand(self):
         """
-        Updates the player's total and displays it.
+        Splits the current hand into two hands if its two cards are of the same rank.
         """
-        total = self.calculate_hand_total(self.player_hand)
-        self.player_total_label.config(text=f"Player Total: {total}")
+        self.perform(self.table.split_hand)
 
-    def update_dealer_total(self):
+    def show_hint(self):
         """
-        Updates the dealer's total and displays it.
+        Shows the basic strategy play for the current hand.
         """
-        total = self.calculate_hand_total(self.dealer_hand)
-        self.dealer_total_label.config(text=f"Dealer Total: {total}")
+        table = self.table
+        if table.state not in PLAYING_STATES:
+            return
+        if self.strategy is None:
+            self.strategy = chart_for(rules=table.rules)
+        action = self.strategy.action(
+            table.current_hand,
+            table.dealer_hand.cards[0],
+            can_double=table.can_double,
+            can_split=table.can_split,
+            can_surrender=table.can_surrender,
+        )
+        self.message_label.config(text=f"Hint: {HINT_MESSAGES[action]}")
 
-    def calculate_hand_total(self, hand):
+    def on_table_event(self, event, data):
+        """
+        Updates the window to follow what happens at the table.
         """
-        Calculates the total value of a hand.
+        handler = getattr(self, f"on_{event}", None)
+        if handler:
+            handler(**data)
+
+    def on_state_changed(self, state):
+        playing = tk.NORMAL if state in PLAYING_STATES else tk.DISABLED
+        self.set_button_state(self.hit_button, playing)
+        self.set_button_state(self.stand_button, playing)
+        self.set_button_state(self.fold_button, playing)
+        self.set_button_state(self.hint_button, playing)
+        self.set_button_state(self.insurance_button, tk.NORMAL if state == INSURANCE else tk.DISABLED)
+        self.set_button_state(self.place_bet_button, tk.NORMAL if state == BETTING else tk.DISABLED)
+        self.update_hand_buttons()
+
+    def update_hand_buttons(self):
+        # Splitting and doubling depend on the current hand's cards, not just the state
+        self.set_button_state(self.double_button, tk.NORMAL if self.table.can_double else tk.DISABLED)
+        self.set_button_state(self.split_button, tk.NORMAL if self.table.can_split else tk.DISABLED)
+
+    def set_button_state(self, button, state):
+        # Only reconfigure buttons that actually change; each config is a round trip to Tcl
+        if self.button_states.get(button) != state:
+            self.button_states[button] = state
+            button.config(state=state)
+
+    def on_bet_placed(self, bet, balance):
+        self.balance_label.config(text=f"Balance: {balance}")
+        self.message_label.config(text=f"Bet placed: {bet}")
+
+    def on_round_started(self):
+        # Reset hands and UI
+        self.animations.cancel_all()
+        self.sprites.release_all()
+        self.results = []
+        self.message_label.config(text="")
+        self.player_total_label.config(text="Player Total: 0")
+        self.dealer_total_label.config(text="Dealer Total: ?")
 
-        Args:
-            hand (Hand): The hand to calculate the total for.
+    def on_reshuffled(self):
+        self.audio.play("shuffle")
+        if self.table.state == SETTLE:
+            self.results.append("Shoe reshuffled.")  # Shown with the round's results
+        else:
+            self.message_label.config(text="Deck is empty! Reshuffling...")
 
-        Returns:
-            int: The total value of the hand.
-        """
-        total = 0
-        aces = 0
-        for card in hand.cards:
-            rank, _ = card
-            if rank in ['Jack', 'Queen', 'King']:
-                total += 10
-            elif rank == 'Ace':
-                aces += 1
-                total += 11  # Count Ace as 11 initially
-            else:
-                total += int(rank)
+    def on_card_dealt(self, hand, card, index, face_up):
+        count = index + 1
+        self.animate_card(hand, card if face_up else "back", DECK_POSITION, self.card_position(hand, index, count))
+        self.close_up(hand, count)
+        if hand == "dealer":
+            if self.table.state == DEALER_TURN:  # Dealer's total stays hidden until the reveal
+                self.update_dealer_total()
+        else:
+            self.update_player_total()
+            self.update_hand_buttons()
 
-        # Adjust for Aces if total exceeds 21
-        while total > 21 and aces > 0:
-            total -= 10
-            aces -= 1
+    def on_insurance_offered(self):
+        self.message_label.config(text="Dealer shows an Ace! Place insurance?")
 
-        return total
+    def on_insurance_placed(self, insurance_bet, balance):
+        self.balance_label.config(text=f"Balance: {balance}")
+        self.message_label.config(text=f"Insurance bet placed: {insurance_bet}")
 
-    def declare_bust(self):
-        """
-        Declares the player has busted and transitions to the next hand or dealer's turn.
-        """
-        self.message_label.config(text="Bust! You went over 21.")
-        self.hit_button.config(state=tk.DISABLED)
-        self.stand_button.config(state=tk.DISABLED)
-        self.fold_button.config(state=tk.DISABLED)
-
-        if self.playing_second_hand:
-            # Finish the second hand and proceed to the dealer's turn
-            self.playing_second_hand = False
-            self.message_label.config(text="Now playing the dealer's turn.")
-            self.stand()  # Transition to the dealer's turn
-        elif self.second_hand:
-            # Switch to the second hand
-            self.playing_second_hand = True
-            self.player_hand = self.second_hand
-            self.second_hand = None
-            self.message_label.config(text="Now playing your second hand.")
-            self.update_player_total()
-            self.hit_button.config(state=tk.NORMAL)
-            self.stand_button.config(state=tk.NORMAL)
+    def on_hand_split(self, hand, new_hand, card, bet, balance):
+        self.balance_label.config(text=f"Balance: {balance}")
 
-    def determine_winner(self):
-        """
-        Determines the winner of the game and displays the result.
-        """
-        def resolve_hand(hand, bet, hand_name):
-            player_total = self.calculate_hand_total(hand)
-            dealer_total = self.calculate_hand_total(self.dealer_hand)
+        # Move the split card over to the new hand's position, stopping its deal if it's still on its way
+        start = self.card_position(hand, 1, 2)
+        self.animations.cancel(self.sprites.sprite(hand, 1))
+        self.sprites.release_last(hand)
+        item = self.sprites.acquire(new_hand, self.deck.card_images[card], start)
+        self.animations.move(item, start, self.card_position(new_hand, 0, 1))
 
-            if dealer_total > 21:
-                result = f"{hand_name}: Dealer busts! You win!"
-                self.balance += bet * 2  # Player wins double the bet
-            elif player_total > dealer_total:
-                result = f"{hand_name}: You win!"
-                self.balance += bet * 2  # Player wins double the bet
-            elif player_total < dealer_total:
-                result = f"{hand_name}: Dealer wins!"
-                # Player loses the bet (balance already deducted)
-            else:
-                result = f"{hand_name}: It's a tie!"
-                self.balance += bet  # Return the bet on a tie
+        self.message_label.config(text=f"Hand split! Play your {HAND_NAMES[hand].lower()}.")
+        self.update_hand_buttons()
+        self.update_player_total()
 
-            return result
+    def on_next_hand_started(self, hand):
+        self.message_label.config(text=f"Now playing your {HAND_NAMES[hand].lower()}.")
+        self.update_hand_buttons()
+        self.update_player_total()
 
-        # Resolve the first hand
-        first_hand_result = resolve_hand(self.player_hand, self.bet, "First Hand")
+    def on_doubled(self, hand, bet, balance):
+        self.balance_label.config(text=f"Balance: {balance}")
+        self.message_label.config(text=f"Doubled down! Bet is now {bet}.")
 
-        # Resolve the second hand if it exists
-        second_hand_result = ""
-        if self.second_hand:
-            second_hand_result = resolve_hand(self.second_hand, self.second_hand_bet, "Second Hand")
+    def on_bust(self, hand):
+        self.message_label.config(text="Bust! You went over 21.")
 
-        # Display results
-        self.message_label.config(text=f"{first_hand_result}\n{second_hand_result}")
+    def on_hole_card_revealed(self, card, total):
+        # Turn the dealer's face-down card over
+        self.sprites.itemconfigure(self.sprites.sprite("dealer", 1), image=self.deck.card_images[card])
+        self.update_dealer_total()
 
-        # Update balance label
-        self.balance_label.config(text=f"Balance: {self.balance}")
+    def on_folded(self):
+        self.results.append("Player folded. Game over.")
 
-    def place_bet(self):
-        """
-        Places a bet and updates the balance.
-        """
-        try:
-            bet = int(self.bet_entry.get())
-            if bet <= 0:
-                self.message_label.config(text="Bet must be greater than 0.")
-                return
-            if bet > self.balance:
-                self.message_label.config(text="Insufficient balance!")
-                return
-
-            self.bet = bet
-            self.balance -= bet
-            self.balance_label.config(text=f"Balance: {self.balance}")
-            self.message_label.config(text=f"Bet placed: {self.bet}")
-            self.start_game()  # Start the game after placing the bet
-        except ValueError:
-            self.message_label.config(text="Invalid bet amount.")
+    def on_hand_settled(self, hand, outcome, total, dealer_total, payout):
+        message = RESULT_MESSAGES[outcome]
+        if total > BLACKJACK:
+            message = "Bust! You went over 21."
+        elif outcome == "win" and dealer_total > BLACKJACK:
+            message = "Dealer busts! You win!"
+        self.results.append(f"{HAND_NAMES[hand]}: {message}")
 
-    def place_insurance(self):
+    def on_insurance_settled(self, won, payout):
+        self.results.append("Insurance pays!" if won else "Insurance lost.")
+
+    def on_round_settled(self, balance, net):
+        if net:
+            self.audio.play("win" if net > 0 else "lose")
+        if self.results:
+            self.message_label.config(text="\n".join(self.results))
+        self.balance_label.config(text=f"Balance: {balance}")
+
+    def card_position(self, hand, index, count):
         """
-        Allows the player to place an insurance bet.
+        Returns where a hand's index-th card goes while the hand holds count cards.
         """
-        try:
-            insurance_bet = self.bet // 2  # Insurance bet is up to half of the original bet
-            if insurance_bet > self.balance:
-                self.message_label.config(text="Insufficient balance for insurance!")
-                return
-
-            self.insurance_bet = insurance_bet
-            self.balance -= insurance_bet
-            self.balance_label.config(text=f"Balance: {self.balance}")
-            self.message_label.config(text=f"Insurance bet placed: {self.insurance_bet}")
-            self.insurance_button.config(state=tk.DISABLED)  # Disable the button after placing the bet
-        except ValueError:
-            self.message_label.config(text="Error placing insurance bet.")
+        x, y = HAND_POSITIONS[hand]
+        spacing = min(CARD_SPACING, (self.hand_width(hand) - CARD_SIZE[0]) / max(count - 1, 1))
+        return (x + index * spacing, y)
 
-    def split_hand(self):
+    def hand_width(self, hand):
+        return ROW_WIDTH if hand == "dealer" or len(self.table.hands) == 1 else HAND_WIDTH
+
+    def close_up(self, hand, count):
         """
-        Splits the player's hand into two hands if the first two cards are of the same rank.
+        Moves a hand's earlier cards closer together once it holds more cards than fit its room.
         """
-        if self.player_hand.cards[0][0] != self.player_hand.cards[1][0]:
-            self.message_label.config(text="Cannot split: Cards must be of the same rank.")
+        if (count - 1) * CARD_SPACING <= self.hand_width(hand) - CARD_SIZE[0]:
             return
+        for index in range(count - 1):
+            item = self.sprites.sprite(hand, index)
+            pos = self.card_position(hand, index, count)
+            if not self.animations.retarget(item, pos):
+                self.sprites.coords(item, *pos)
+
+    @metrics.timed("game.animate_card")
+    def animate_card(self, hand, card, start_pos, end_pos):
+        """
+        Shows a card on the hand's next sprite and queues it moving from start_pos to end_pos.
 
-        if self.bet > self.balance:
-            self.message_label.config(text="Insufficient balance to split!")
-            return
+        Args:
+            hand (str): The hand the card belongs to ("player", "second", "third", "fourth" or "dealer").
+            card (tuple or str): The card to animate (e.g., ('Ace', 'Spades')) or "back" for face-down.
+            start_pos (tuple): Starting position (x, y) of the card.
+            end_pos (tuple): Ending position (x, y) of the card.
 
-        # Deduct the bet for the second hand
-        self.second_hand_bet = self.bet
-        self.balance -= self.second_hand_bet
-        self.balance_label.config(text=f"Balance: {self.balance}")
+        Returns:
+            int: The canvas item for the card.
+        """
+        card_id = self.sprites.acquire(hand, self.deck.card_images[card], start_pos, state="hidden")
 
-        # Create the second hand
-        self.second_hand = Hand()
-        split_card = self.player_hand.cards.pop()  # Move one card to the second hand
-        self.second_hand.add_card(split_card)
+        # Play the card draw sound effect as the card starts to move
+        self.animations.move(card_id, start_pos, end_pos, on_start=self.play_deal_sound)
+        return card_id
 
-        # Animate the split card to the second hand's position (pushed down by 25px)
-        self.animate_card(split_card, (300, 300), (200, 325), overlap_offset=50)
+    def play_deal_sound(self):
+        self.audio.play("deal")
 
-        # Update the UI
-        self.message_label.config(text="Hand split! Play your first hand.")
-        self.split_button.config(state=tk.DISABLED)  # Disable the split button
-        self.update_player_total()
+    def update_player_total(self):
+        """
+        Updates the player's total and displays it.
+        """
+        total = self.table.current_hand.total
+        self.player_total_label.config(text=f"Player Total: {total}")
+
+    def update_dealer_total(self):
+        """
+        Updates the dealer's total and displays it.
+        """
+        total = self.table.dealer_hand.total
+        self.dealer_total_label.config(text=f"Dealer Total: {total}")
 
 if __name__ == "__main__":
     root = tk.Tk()
     game = BlackjackGame(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    game.audio.close()
+    if game.recorder:
+        game.recorder.close()
+    if game.metrics_path:
+        metrics.REGISTRY.dump(game.metrics_path)
\ No newline at end of file
@@ -0,0 +1,354 @@
+"""
+Asyncio game server hosting many blackjack tables over a local TCP protocol.
+
+Each table is a components.multi_table.MultiSeatTable: one shoe, one
+dealer and several seats playing each round together, in seat order. A
+table-wide timer closes betting and stands a seat that is too slow to act.
+
+The protocol is newline-delimited JSON. Clients send requests such as
+    {"op": "join", "table": "high-rollers"}
+    {"op": "bet", "amount": 10}
+    {"op": "hit"} / {"op": "stand"} / {"op": "double"} / {"op": "split"} / {"op": "insurance"} / {"op": "fold"}
+    {"op": "surrender"}  (only at tables whose rules allow it)
+    {"op": "leave"}
+    {"op": "stats"}
+and receive
+    {"t": "joined", "table": ..., "seat": ..., "balance": ...}
+    {"t": "events", "table": ..., "events": [[seat, event, data], ...]}
+    {"t": "stats", "histograms": ..., ...}
+    {"t": "error", "msg": ...}
+    {"t": "ack", "id": ...}
+A request may carry an "id"; it is acknowledged once the events it caused
+have been sent. Events are the MultiSeatTable events, with seat null for
+table-wide ones, batched per event-loop iteration. A seat acts only on its
+turn (turn_started). Cards are sent as card codes (see
+components.shoe.CARDS), and face-down cards are never sent.
+
+The server times every request from reading it to queueing its events and
+ack, per op; "stats" returns those latency histograms and --metrics-file
+writes them out periodically.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+
+from components.metrics import Registry
+from components.multi_table import MultiSeatTable
+from components.rules import DEFAULT_RULES, RuleSet
+from components.round_log import RoundRecorder
+from components.shoe import CARD_CODES
+from components.table import InvalidAction, BETTING, DEALER_TURN, PLAYING_STATES
+
+SEATS_PER_TABLE = 5
+TURN_TIMEOUT = 30.0  # Seconds a seat may take to act before it is stood automatically
+SEND_QUEUE_SIZE = 256  # Messages buffered per client before it is dropped as too slow
+METRICS_INTERVAL = 5.0  # Seconds between writes of --metrics-file
+OPS = ("join", "leave", "bet", "hit", "stand", "double", "split", "insurance", "fold", "surrender", "stats")
+
+
+def encode(message):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def public_event(event, data):
+    """
+    Returns an event's data as sent to clients: cards as codes and face-down cards hidden.
+    """
+    if "card" in data:
+        data = dict(data)
+        if event == "card_dealt" and not data["face_up"]:
+            data["card"] = None
+        else:
+            data["card"] = CARD_CODES[data["card"]]
+    return data
+
+
+class Connection:
+    """
+    A connected client and its bounded queue of outgoing messages.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.queue = asyncio.Queue(SEND_QUEUE_SIZE)
+        self.room = None
+        self.seat = None
+        self.closed = False
+
+    def send(self, data):
+        """
+        Queues encoded bytes for the client; a client that stops reading is disconnected.
+        """
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.close()
+
+    async def write_loop(self):
+        try:
+            while True:
+                data = await self.queue.get()
+                if data is None:
+                    break
+                self.writer.write(data)
+                await self.writer.drain()  # Wait for the socket rather than buffering without bound
+        except ConnectionError:
+            self.closed = True
+        self.writer.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            # Make room for the sentinel; whatever was still queued won't be read anyway
+            while self.queue.full():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class TableRoom:
+    """
+    A MultiSeatTable with the connections at its seats, one turn timer and the seats' round logs.
+
+    The timer belongs to the table, not to a seat. While betting, it closes
+    betting turn_timeout seconds after the first bet and deals to the seats
+    that have bet. While seats are playing, it stands the hand of a seat
+    that takes longer than turn_timeout, which passes the turn on.
+    """
+
+    def __init__(self, name, seats=SEATS_PER_TABLE, turn_timeout=TURN_TIMEOUT, log_dir=None, rules=DEFAULT_RULES):
+        self.name = name
+        self.table = MultiSeatTable(seats, rules=rules)
+        self.table.subscribe(self.on_event)
+        self.connections = [None] * seats
+        self.turn_timeout = turn_timeout
+        self.log_dir = log_dir  # Where each seat's round log goes, if anywhere
+        self.recorders = {}  # seat: (RoundRecorder, its table listener)
+        self.timer = None
+        self.pending = []
+        self.flush_scheduled = False
+
+    @property
+    def full(self):
+        return self.table.full
+
+    def sit(self, connection):
+        seat = self.table.sit()
+        self.connections[seat] = connection
+        connection.room, connection.seat = self, seat
+        if self.log_dir:
+            recorder = RoundRecorder(os.path.join(self.log_dir, f"{self.name}-seat{seat}.bjlog"))
+            listener = self.seat_listener(seat, recorder)
+            self.table.subscribe(listener)
+            self.recorders[seat] = (recorder, listener)
+        return seat
+
+    def seat_listener(self, seat, recorder):
+        """
+        Returns a table listener passing a round log the events of one seat's rounds.
+        """
+        table = self.table
+
+        def listener(event_seat, event, data):
+            if event_seat == seat or (event_seat is None and (event == "reshuffled" or table.in_round(seat))):
+                recorder(event, data)
+        return listener
+
+    def leave(self, connection):
+        seat = connection.seat
+        recorder = self.recorders.pop(seat, None)
+        if recorder:
+            self.table.unsubscribe(recorder[1])
+            recorder[0].close()
+        self.connections[seat] = None
+        connection.room = connection.seat = None
+        self.table.leave(seat)
+
+    def on_event(self, seat, event, data):
+        if event in ("turn_started", "next_hand_started"):
+            self.start_timer()
+        elif event == "bet_placed" and self.timer is None:
+            self.start_timer()  # Betting closes a while after the first bet
+        elif event == "state_changed" and data["state"] in (DEALER_TURN, BETTING):
+            self.cancel_timer()
+        self.pending.append([seat, event, public_event(event, data)])
+        if not self.flush_scheduled:
+            # Everything that happens in this loop iteration goes out in one message
+            self.flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self.flush)
+
+    def start_timer(self):
+        self.cancel_timer()
+        self.timer = asyncio.get_running_loop().call_later(self.turn_timeout, self.timed_out)
+
+    def cancel_timer(self):
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+
+    def timed_out(self):
+        self.timer = None
+        table = self.table
+        if table.state == BETTING:
+            if any(player is not None and player.bet for player in table.players):
+                table.deal()
+        elif table.state in PLAYING_STATES:
+            table.stand(table.turn)
+
+    def flush(self):
+        self.flush_scheduled = False
+        if not self.pending:
+            return
+        data = encode({"t": "events", "table": self.name, "events": self.pending})
+        self.pending = []
+        for connection in self.connections:
+            if connection is not None:
+                connection.send(data)
+
+
+class GameServer:
+    """
+    Accepts clients and runs their requests against the tables they sit at.
+    """
+
+    def __init__(self, seats=SEATS_PER_TABLE, turn_timeout=TURN_TIMEOUT, log_dir=None, rules=DEFAULT_RULES):
+        self.seats = seats
+        self.turn_timeout = turn_timeout
+        self.log_dir = log_dir
+        self.rules = rules  # Every table the server opens plays by these
+        self.metrics = Registry()  # Request latency per op, always on
+        self.rooms = {}
+        self.room_names = (f"table-{i}" for i in itertools.count(1))
+
+    def room_for(self, name):
+        """
+        Returns the named table, or the first table with a free seat if name is None.
+        """
+        if name is None:
+            name = next((room.name for room in self.rooms.values() if not room.full), None)
+            if name is None:
+                name = next(self.room_names)
+        room = self.rooms.get(name)
+        if room is None:
+            room = self.rooms[name] = TableRoom(name, self.seats, self.turn_timeout, self.log_dir, self.rules)
+        return room
+
+    async def handle_client(self, reader, writer):
+        connection = Connection(reader, writer)
+        writer_task = asyncio.create_task(connection.write_loop())
+        try:
+            while not connection.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                request = None
+                try:
+                    request = json.loads(line)
+                    self.handle_request(connection, request)
+                except InvalidAction as error:
+                    connection.send(encode({"t": "error", "msg": str(error)}))
+                except (ValueError, KeyError, TypeError) as error:
+                    connection.send(encode({"t": "error", "msg": f"Bad request: {error}"}))
+                # Acknowledge and time the request after this iteration's events have gone out
+                asyncio.get_running_loop().call_soon(self.finish_request, connection, request, start)
+        except (ConnectionError, ValueError):
+            pass  # Dropped connection or an over-long line
+        finally:
+            if connection.room is not None:
+                connection.room.leave(connection)
+            connection.close()
+            await writer_task
+
+    def finish_request(self, connection, request, start):
+        op = request.get("op") if isinstance(request, dict) else None
+        self.metrics.histogram(f"server.{op if op in OPS else 'bad_request'}").observe(time.perf_counter() - start)
+        if isinstance(request, dict) and "id" in request:
+            connection.send(encode({"t": "ack", "id": request["id"]}))
+
+    def handle_request(self, connection, request):
+        op = request["op"]
+        if op == "stats":
+            connection.send(encode(dict(self.metrics.snapshot(), t="stats")))
+            return
+        if op == "join":
+            if connection.room is not None:
+                raise InvalidAction("Already seated.")
+            room = self.room_for(request.get("table"))
+            if room.full:
+                raise InvalidAction("Table is full.")
+            seat = room.sit(connection)
+            connection.send(encode({"t": "joined", "table": room.name, "seat": seat,
+                                    "balance": room.table.players[seat].balance}))
+            return
+
+        if connection.room is None:
+            raise InvalidAction("Join a table first.")
+        if op == "leave":
+            connection.room.leave(connection)
+            return
+
+        table, seat = connection.room.table, connection.seat
+        if op == "bet":
+            table.place_bet(seat, int(request["amount"]))
+        elif op == "hit":
+            table.hit(seat)
+        elif op == "stand":
+            table.stand(seat)
+        elif op == "double":
+            table.double_down(seat)
+        elif op == "split":
+            table.split_hand(seat)
+        elif op == "insurance":
+            table.place_insurance(seat)
+        elif op == "fold":
+            table.fold(seat)
+        elif op == "surrender":
+            table.surrender(seat)
+        else:
+            raise InvalidAction(f"Unknown op {op!r}.")
+
+    async def dump_metrics(self, path):
+        while True:
+            await asyncio.sleep(METRICS_INTERVAL)
+            self.metrics.dump(path)
+
+    async def serve(self, host, port, metrics_file=None):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        if metrics_file:
+            asyncio.create_task(self.dump_metrics(metrics_file))
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host blackjack tables over a local TCP protocol.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--seats", type=int, default=SEATS_PER_TABLE, help="Seats per table")
+    parser.add_argument("--turn-timeout", type=float, default=TURN_TIMEOUT,
+                        help="Seconds before a seat auto-stands, and after the first bet before the round is dealt")
+    parser.add_argument("--log-dir", help="Write a binary round log per seat into this directory")
+    parser.add_argument("--rules", default="{}",
+                        help='JSON object of table rules, e.g. \'{"num_decks": 6, "surrender": true}\'')
+    parser.add_argument("--metrics-file",
+                        help="Write request latency histograms here every few seconds (Prometheus text for .prom)")
+    args = parser.parse_args()
+
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+    server = GameServer(args.seats, args.turn_timeout, args.log_dir, RuleSet.from_dict(json.loads(args.rules)))
+    print(f"Serving blackjack on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.metrics_file))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
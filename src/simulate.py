@@ -0,0 +1,63 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from components.rules import NUM_DECKS, DEALER_STAND_TOTAL, RuleSet
+from components.parallel import run_parallel
+from components.shuffle import DEFAULT_PENETRATION
+from components.variants import tables_for
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play blackjack rounds headless and report the results.")
+    parser.add_argument("--rounds", type=int, default=1_000_000, help="Number of rounds to play")
+    parser.add_argument("--decks", type=int, default=NUM_DECKS, help="Number of decks in the shoe")
+    parser.add_argument("--shoes", type=int, default=4096, help="Shoes simulated side by side")
+    parser.add_argument("--stand-on", type=int, default=DEALER_STAND_TOTAL, help="Total the player stands on")
+    parser.add_argument("--basic-strategy", action="store_true",
+                        help="Play the basic strategy chart, doubling and splitting, instead of standing on a total")
+    parser.add_argument("--penetration", type=float, default=DEFAULT_PENETRATION,
+                        help="Fraction of the shoe dealt before the cut card")
+    parser.add_argument("--rules", default="{}",
+                        help='JSON object of table rules, e.g. \'{"hit_soft_17": true, "blackjack_pays": "3:2"}\'')
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 for one per CPU)")
+    parser.add_argument("--json", action="store_true", help="Print the full result as JSON")
+    args = parser.parse_args()
+
+    # Always run from a known seed so any run can be reproduced
+    seed = args.seed if args.seed is not None else np.random.SeedSequence().entropy
+
+    rules = RuleSet.from_dict(dict({"num_decks": args.decks, "penetration": args.penetration}, **json.loads(args.rules)))
+    policy = tables_for(rules).policy if args.basic_strategy else None
+
+    start = time.perf_counter()
+    result = run_parallel(
+        args.rounds,
+        seed,
+        workers=args.workers or None,
+        num_shoes=args.shoes,
+        player_stand_on=args.stand_on,
+        policy=policy,
+        rules=rules,
+    )
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(dict(result.as_dict(), seed=seed, seconds=elapsed)))
+        return
+
+    print(f"Seed: {seed}")
+    print(f"Rounds: {result.rounds}")
+    print(f"Hands: {result.hands}  Doubles: {result.doubles}  Splits: {result.splits}  Surrenders: {result.surrenders}")
+    print(f"Naturals: {result.naturals}")
+    print(f"Wins: {result.wins}  Losses: {result.losses}  Pushes: {result.pushes}")
+    print(f"Player busts: {result.player_busts}  Dealer busts: {result.dealer_busts}")
+    print(f"House edge: {result.house_edge:.4%}")
+    print(f"Rounds/sec: {result.rounds / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from components.parallel import run_sweep
+from components.rules import RuleSet
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate basic strategy under many rule variants.")
+    parser.add_argument("--grid", default="{}",
+                        help='JSON object of rule values to combine, e.g. \'{"num_decks": [1, 8], "hit_soft_17": [false, true]}\'')
+    parser.add_argument("--variants", help="JSON file holding a list of rule objects, swept as well as the grid")
+    parser.add_argument("--rules", default="{}", help="JSON object of rules every variant shares")
+    parser.add_argument("--rounds", type=int, default=1_000_000, help="Rounds per variant")
+    parser.add_argument("--shoes", type=int, default=4096, help="Shoes simulated side by side")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 for one per CPU)")
+    parser.add_argument("--json", action="store_true", help="Print the full results as JSON")
+    args = parser.parse_args()
+
+    base = RuleSet.from_dict(json.loads(args.rules))
+    grid = json.loads(args.grid)
+    rule_sets = RuleSet.grid(base, **grid) if grid or not args.variants else []
+    if args.variants:
+        with open(args.variants) as f:
+            rule_sets = [base.replace(**rules) for rules in json.load(f)] + rule_sets
+
+    # Always run from a known seed so any run can be reproduced
+    seed = args.seed if args.seed is not None else np.random.SeedSequence().entropy
+
+    start = time.perf_counter()
+    results = run_sweep(rule_sets, args.rounds, seed, workers=args.workers or None, num_shoes=args.shoes)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps({
+            "seed": seed,
+            "seconds": elapsed,
+            "variants": [dict(result.as_dict(), rules=rules.as_dict()) for rules, result in zip(rule_sets, results)],
+        }))
+        return
+
+    print(f"Seed: {seed}")
+    for rules, result in zip(rule_sets, results):
+        print(f"{result.house_edge:+.4%}  {rules!r}")
+    print(f"Variants: {len(rule_sets)}  Rounds/sec: {sum(result.rounds for result in results) / elapsed:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
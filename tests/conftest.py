@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# The game runs from src/, so its modules import each other as top-level packages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Keep solved charts, sprite atlases and the kiosk's state out of the user's cache directory
+os.environ["XDG_CACHE_HOME"] = tempfile.mkdtemp(prefix="blackjack-tests-")
@@ -0,0 +1,16 @@
+import pygame
+
+from components.audio import AudioEngine
+
+
+def test_device_opens_only_once_started():
+    audio = AudioEngine()
+    assert not audio.started and not audio.ready.is_set()
+    audio.close()  # Never started, so there's nothing to wait for
+
+    assert not audio.play("deal")  # Too early to be heard, but starts the device opening
+    assert audio.started
+    audio.start()  # Already under way
+    assert audio.ready.wait(5)
+    audio.close()
+    assert not pygame.mixer.get_init()
@@ -0,0 +1,31 @@
+import math
+
+import pytest
+
+from components.dealer_odds import OUTCOMES, composition_from_cards, dealer_probabilities, natural_probability
+from components.strategy import VALUE_RANKS, shoe_composition
+
+BLACKJACK_INDEX = OUTCOMES.index(21)
+
+
+@pytest.mark.parametrize("composition", [
+    shoe_composition(1),
+    shoe_composition(8),
+    composition_from_cards([("10", "Spades")] * 3 + [("2", "Hearts")] * 2 + [("Ace", "Clubs")]),
+], ids=["one deck", "eight decks", "six cards"])
+@pytest.mark.parametrize("hit_soft_17", [False, True], ids=["s17", "h17"])
+def test_outcome_probabilities_sum_to_one(composition, hit_soft_17):
+    for rank in VALUE_RANKS:
+        distribution = dealer_probabilities(rank, composition, hit_soft_17)
+        assert len(distribution) == len(OUTCOMES)
+        assert all(p >= 0 for p in distribution)
+        assert math.isclose(sum(distribution), 1.0, rel_tol=1e-12)
+        # A natural is one of the ways to reach 21
+        assert natural_probability(rank, composition) <= distribution[BLACKJACK_INDEX] + 1e-12
+
+
+def test_hitting_soft_17_moves_17s_elsewhere():
+    composition = shoe_composition(6)
+    stand = dealer_probabilities("6", composition, hit_soft_17=False)
+    hit = dealer_probabilities("6", composition, hit_soft_17=True)
+    assert hit[0] < stand[0] and hit[-1] > stand[-1]
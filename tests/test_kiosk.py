@@ -0,0 +1,105 @@
+import pygame
+import pytest
+
+from components.rules import RuleSet, max_cards_per_hand
+from components.shoe import CARD_CODES
+from components.table import BETTING, STARTING_BALANCE
+from kiosk import KioskGame, BASE_SIZE, HAND_POSITIONS, HAND_WIDTH
+
+
+@pytest.fixture
+def kiosk():
+    pygame.init()
+    game = KioskGame(pygame.display.set_mode(BASE_SIZE))
+    yield game
+    game.audio.close()
+    pygame.quit()
+
+
+def stack(deck, ranks):
+    """
+    Moves cards of these ranks to the top of the shoe, in dealing order, keeping its composition.
+    """
+    shoe = deck.shoe
+    cards = shoe.cards
+    for offset, rank in enumerate(ranks):
+        index = shoe.position + offset
+        codes = [CARD_CODES[(rank, suit)] for suit in ("Spades", "Hearts", "Diamonds", "Clubs")]
+        found = next(i for i in range(index, len(cards)) if cards[i] in codes)
+        cards[index], cards[found] = cards[found], cards[index]
+
+
+def settle(kiosk, seconds=5.0):
+    for _ in range(int(seconds * 60)):
+        kiosk.animator.advance(1 / 60)
+
+
+def test_max_cards_per_hand_grows_with_the_shoe():
+    assert max_cards_per_hand(1) == 11  # A,A,A,A,2,2,2,2,3,3,3
+    assert max_cards_per_hand(2) == 14
+    assert max_cards_per_hand(6) == max_cards_per_hand(8) == 21
+
+
+def test_a_hand_of_21_aces_fits(kiosk):
+    table = kiosk.table
+    stack(kiosk.deck, ["Ace", "9", "Ace", "7"] + ["Ace"] * 19 + ["10"])
+    table.place_bet(10)
+    for _ in range(19):
+        table.hit()
+    assert len(table.current_hand.cards) == 21 and table.current_hand.total == 21
+    table.hit()  # The 22nd card busts it
+    settle(kiosk)
+
+    sprites = kiosk.cards["player"][:22]
+    assert all(sprite.visible for sprite in sprites)
+    x = [sprite.pos[0] for sprite in sprites]
+    assert x == sorted(x) and x[-1] <= kiosk.at((HAND_POSITIONS["fourth"][0] + HAND_WIDTH - 100, 0))[0]
+
+
+def test_split_card_stays_hidden_when_split_mid_deal(kiosk):
+    table = kiosk.table
+    stack(kiosk.deck, ["8", "9", "8", "7"])
+    table.place_bet(10)
+    table.split_hand()  # Before the deal has finished animating
+    settle(kiosk)
+
+    assert kiosk.used["player"] == 1
+    assert not kiosk.cards["player"][1].visible
+    assert kiosk.cards["second"][0].visible
+
+
+def test_split_hands_do_not_overlap(kiosk):
+    table = kiosk.table
+    stack(kiosk.deck, ["8", "9", "8", "7", "2", "2", "2", "2", "2", "3"])
+    table.place_bet(10)
+    table.split_hand()
+    for _ in range(5):
+        table.hit()
+    table.stand()
+    table.hit()
+    settle(kiosk)
+
+    first = [sprite.pos[0] for sprite in kiosk.cards["player"][:kiosk.used["player"]]]
+    second = kiosk.cards["second"][0].pos[0]
+    assert kiosk.used["player"] == 6
+    assert max(first) + kiosk.at((100, 0))[0] <= second
+
+
+def test_surrender_on_a_table_whose_rules_allow_it(tmp_path):
+    pygame.init()
+    rules = RuleSet(num_decks=2, surrender=True)
+    state_file = str(tmp_path / "table.bin")
+    game = KioskGame(pygame.display.set_mode(BASE_SIZE), state_file=state_file, rules=rules)
+    try:
+        assert game.table.rules == rules and game.deck.num_decks == 2
+        stack(game.deck, ["10", "9", "6", "7"])
+        game.perform(game.table.place_bet, 10)
+        game.on_key(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r, unicode="r"))
+        assert game.table.state == BETTING and game.table.balance == STARTING_BALANCE - 5
+
+        # The saved table is restored only under the same rules
+        assert KioskGame(game.screen, state_file=state_file, rules=rules).table.balance == STARTING_BALANCE - 5
+        assert KioskGame(game.screen, state_file=state_file).table.balance == STARTING_BALANCE
+    finally:
+        game.audio.close()
+        pygame.quit()
@@ -0,0 +1,191 @@
+import random
+
+import pytest
+
+from components.deck import Deck
+from components.multi_table import MultiSeatTable
+from components.rules import RuleSet
+from components.shuffle import fast_rng
+from components.table import InvalidAction, BETTING, DEALER_TURN, INSURANCE, PLAYER_TURN
+
+
+def new_table(seats=3, rules=None, seed=1):
+    rules = rules if rules is not None else RuleSet()
+    return MultiSeatTable(seats, deck=Deck(rules.num_decks, rng=fast_rng(seed)), rules=rules)
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, seat, event, data):
+        self.events.append((seat, event, data))
+
+    def of(self, name):
+        return [(seat, data) for seat, event, data in self.events if event == name]
+
+
+def test_every_seat_plays_against_one_dealer_in_seat_order():
+    table = new_table()
+    events = Recorder()
+    table.subscribe(events)
+    for seat in range(3):
+        table.sit()
+    for seat in range(3):
+        assert table.state == BETTING
+        table.place_bet(seat, 10)
+
+    # Dealt as soon as everyone bet: two cards each, two for the one dealer hand
+    dealt = events.of("card_dealt")
+    assert [seat for seat, _ in dealt] == [0, 1, 2, None, 0, 1, 2, None]
+    assert not dealt[-1][1]["face_up"]
+
+    turns = []
+    while table.state != BETTING:
+        seat = table.turn
+        turns.append(seat)
+        with pytest.raises(InvalidAction):
+            table.hit((seat + 1) % 3)  # Not their turn
+        table.stand(seat)
+    assert turns == [0, 1, 2]
+    assert len(events.of("hole_card_revealed")) == 1
+    assert sorted(seat for seat, _ in events.of("round_settled")) == [0, 1, 2]
+    dealer_totals = {data["dealer_total"] for _, data in events.of("hand_settled")}
+    assert len(dealer_totals) == 1
+
+
+def test_hole_card_is_shown_when_every_seat_gives_up():
+    table = new_table(seats=2, rules=RuleSet(surrender=True))
+    events = Recorder()
+    table.subscribe(events)
+    for seat in range(2):
+        table.sit()
+    for seat in range(2):
+        table.place_bet(seat, 10)
+    while table.state != BETTING:
+        if table.turn == 0:
+            table.fold(0)
+        else:
+            table.surrender(table.turn)
+    assert [data["card"] for _, data in events.of("hole_card_revealed")] == [table.dealer_hand.cards[1]]
+
+
+def test_reshuffled_is_announced_once_the_shoe_is_refilled():
+    table = new_table(seats=1, seed=2)
+    shoe = table.deck.shoe
+    sizes = []
+    table.subscribe(lambda seat, event, data: sizes.append(len(shoe)) if event == "reshuffled" else None)
+    table.sit()
+    table.place_bet(0, 10)
+    assert table.turn == 0
+    shoe.position = len(shoe.cards)  # Run the shoe out mid-round
+    table.hit(0)
+    assert sizes == [len(shoe.cards)]
+
+
+def test_nets_match_balance_changes_under_random_play():
+    rules = RuleSet(blackjack_pays="3:2", surrender=True, hit_soft_17=True)
+    table = new_table(seats=4, rules=rules)
+    events = Recorder()
+    table.subscribe(events)
+    for _ in range(4):
+        table.sit(balance=10**9)
+    rng = random.Random(7)
+    actions = ("hit", "stand", "double_down", "split_hand", "surrender", "place_insurance", "fold")
+    rounds = 0
+    while rounds < 2000:
+        if table.state == BETTING:
+            for seat in range(4):
+                if rng.random() < 0.8:
+                    table.place_bet(seat, rng.choice((2, 10, 25)))
+            if table.state == BETTING:
+                if any(player.bet for player in table.players):
+                    table.deal()
+                rounds += 1
+            continue
+        try:
+            getattr(table, rng.choice(actions))(table.turn)
+        except InvalidAction:
+            pass
+        if table.state == BETTING:
+            rounds += 1
+
+    for seat, player in enumerate(table.players):
+        nets = sum(data["net"] for event_seat, data in events.of("round_settled") if event_seat == seat)
+        assert player.balance - 10**9 == nets
+
+
+def test_insurance_is_offered_to_each_seat_on_its_turn():
+    for seed in range(200):
+        table = new_table(seats=2, seed=seed)
+        table.sit()
+        table.sit()
+        table.place_bet(0, 10)
+        table.place_bet(1, 10)
+        if table.dealer_hand.cards[0][0] == "Ace" and table.turn == 0:
+            break
+    else:
+        pytest.fail("No Ace upcard dealt")
+    assert table.state == INSURANCE
+    table.place_insurance(0)
+    assert table.state == PLAYER_TURN
+    table.stand(0)
+    if table.turn == 1:
+        assert table.state == INSURANCE
+        table.hit(1)  # Playing on declines it
+        with pytest.raises(InvalidAction):
+            table.place_insurance(1)
+
+
+def test_leaving_on_turn_passes_the_turn():
+    table = new_table(seats=2, seed=3)
+    table.sit()
+    table.sit()
+    table.place_bet(0, 10)
+    table.place_bet(1, 10)
+    if table.turn == 0:
+        table.leave(0)
+        assert table.turn == 1 or table.state in (DEALER_TURN, BETTING)
+    table.leave(1)
+    assert table.state == BETTING
+
+
+def test_sitting_out_a_round():
+    table = new_table(seats=3)
+    for _ in range(3):
+        table.sit()
+    table.place_bet(0, 10)
+    assert table.state == BETTING  # Seats 1 and 2 haven't bet
+    table.deal()
+    assert not table.in_round(1) and not table.in_round(2)
+    while table.state != BETTING:
+        table.stand(table.turn)
+    assert table.players[1].balance == table.players[2].balance == 1000
+
+
+def test_no_card_is_dealt_twice_between_shuffles():
+    table = new_table(seats=3, rules=RuleSet(1, penetration=0.6))
+    seen = set()
+    duplicates = []
+
+    def watch(seat, event, data):
+        if event == "reshuffled":
+            seen.clear()
+        elif event == "card_dealt":
+            if data["card"] in seen:
+                duplicates.append(data["card"])
+            seen.add(data["card"])
+
+    table.subscribe(watch)
+    for _ in range(3):
+        table.sit(balance=10**9)
+    rng = random.Random(2)
+    for _ in range(1000):
+        for seat in range(3):
+            table.place_bet(seat, 10)
+        while table.state != BETTING:
+            if table.current_hand(table.turn).total < 17 and rng.random() < 0.8:
+                table.hit(table.turn)
+            else:
+                table.stand(table.turn)
+    assert not duplicates
@@ -0,0 +1,26 @@
+from components.parallel import run_parallel, run_sweep
+from components.rules import RuleSet
+from components.variants import tables_for
+
+
+def test_results_do_not_depend_on_the_worker_count():
+    runs = [run_parallel(30_000, seed=5, workers=workers, chunk_rounds=7_000, num_shoes=64) for workers in (1, 2, 3)]
+    assert runs[0].rounds == 30_000
+    assert runs[1].as_dict() == runs[0].as_dict() == runs[2].as_dict()
+
+
+def test_chart_runs_do_not_depend_on_the_worker_count():
+    rules = RuleSet(surrender=True, blackjack_pays="3:2")
+    policy = tables_for(rules).policy
+    runs = [
+        run_parallel(20_000, seed=9, workers=workers, chunk_rounds=6_000, num_shoes=64, policy=policy, rules=rules)
+        for workers in (1, 2)
+    ]
+    assert runs[0].as_dict() == runs[1].as_dict()
+
+
+def test_sweeps_do_not_depend_on_the_worker_count():
+    variants = RuleSet.grid(hit_soft_17=[False, True], num_decks=[1, 6])
+    one, two = (run_sweep(variants, 10_000, seed=2, workers=workers, chunk_rounds=4_000, num_shoes=64)
+                for workers in (1, 2))
+    assert [result.as_dict() for result in one] == [result.as_dict() for result in two]
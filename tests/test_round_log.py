@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+
+from components.deck import Deck
+from components.round_log import (
+    HANDS, HEADER, KIND_CARD, KIND_REVEAL, KIND_ROUND_SETTLED, NO_CARD, RECORD, RoundLog, RoundRecorder,
+)
+from components.rules import RuleSet
+from components.shoe import CARD_CODES
+from components.shuffle import fast_rng
+from components.table import Table, BETTING
+
+
+def play(path, rounds, seed):
+    table = Table(Deck(rng=fast_rng(seed)), balance=10_000)
+    recorder = RoundRecorder(path)
+    table.subscribe(recorder)
+    for _ in range(rounds):
+        table.place_bet(10)
+        while table.state != BETTING:
+            table.stand()
+    recorder.close()
+
+
+def test_records_every_round(tmp_path):
+    path = str(tmp_path / "table.bjlog")
+    play(path, 5, seed=1)
+    log = RoundLog(path)
+    assert log.num_rounds == 5
+    assert log.of_kind(KIND_ROUND_SETTLED)["round"].tolist() == [0, 1, 2, 3, 4]
+
+
+def test_reopening_continues_round_numbers(tmp_path):
+    path = str(tmp_path / "table.bjlog")
+    play(path, 3, seed=1)
+    play(path, 3, seed=2)
+    assert RoundLog(path).of_kind(KIND_ROUND_SETTLED)["round"].tolist() == [0, 1, 2, 3, 4, 5]
+
+
+def test_torn_tail_is_truncated_before_appending(tmp_path):
+    path = str(tmp_path / "table.bjlog")
+    play(path, 5, seed=1)
+    size = os.path.getsize(path)
+    os.truncate(path, size - 7)  # A crash in the middle of the last round's settlement record
+
+    play(path, 5, seed=2)
+    assert (os.path.getsize(path) - HEADER.size) % RECORD.size == 0
+    log = RoundLog(path)
+    assert log.num_rounds == 9
+    assert set(np.unique(log.records["kind"]).tolist()) <= set(range(1, 15))
+    rounds = log.records["round"]
+    assert np.all(np.diff(rounds.astype(np.int64)) >= 0)
+    assert rounds[-1] == 9
+
+
+def test_reader_ignores_a_torn_tail(tmp_path):
+    path = str(tmp_path / "table.bjlog")
+    play(path, 2, seed=1)
+    whole = RoundLog(path)
+    count = len(whole)
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 5)
+    assert len(RoundLog(path)) == count
+
+
+def test_hole_card_is_logged_when_the_round_ends_early(tmp_path):
+    path = str(tmp_path / "table.bjlog")
+    table = Table(Deck(rng=fast_rng(3)), rules=RuleSet(surrender=True))
+    recorder = RoundRecorder(path)
+    table.subscribe(recorder)
+    dealt = []
+    for action in (table.fold, table.surrender):
+        table.place_bet(10)
+        dealt.append([CARD_CODES[card] for card in table.dealer_hand.cards])
+        action()
+    recorder.close()
+
+    log = RoundLog(path)
+    for round_number, cards in enumerate(dealt):
+        records = log.records[log.records["round"] == round_number]
+        dealer_cards = records[(records["kind"] == KIND_CARD) & (records["hand"] == HANDS["dealer"])]["card"]
+        hole_card = records[records["kind"] == KIND_REVEAL]["card"]
+        assert dealer_cards.tolist() == [cards[0], NO_CARD]
+        assert hole_card.tolist() == [cards[1]]
@@ -0,0 +1,60 @@
+import numpy as np
+
+from components.hand_values import RANK_INDEX, STATE_TOTALS
+from components.seat import Seat, SeatArray, BUST, PLAYING, STOOD
+
+
+def card(rank):
+    return (rank, "Hearts")
+
+
+def test_split_and_resplit_up_to_the_limit():
+    seat = Seat(max_hands=3)
+    seat.reset(bet=10)
+    seat.hands[0].add_card(card("8"))
+    seat.hands[0].add_card(card("8"))
+    assert seat.can_split
+
+    assert seat.split() == 1
+    assert [seat.hands[i].cards for i in range(2)] == [[card("8")], [card("8")]]
+    assert seat.bets[:2] == [10, 10] and seat.total_bet == 20
+
+    seat.hands[0].add_card(card("8"))
+    assert seat.can_split
+    assert seat.split() == 2
+    assert seat.num_hands == 3 and seat.total_bet == 30
+    seat.hands[0].add_card(card("8"))
+    assert not seat.can_split  # Every slot is taken
+
+    # Hands are played in slot order, and the seat is done after the last
+    for status in (STOOD, BUST, STOOD):
+        assert not seat.done
+        seat.finish(status)
+    assert seat.done and seat.status[:3] == [STOOD, BUST, STOOD]
+
+    seat.reset(bet=5)
+    assert seat.num_hands == 1 and seat.status[0] == PLAYING and not seat.hands[0].cards
+    assert all(not hand.cards for hand in seat.hands)
+
+
+def test_seat_array_splits_like_a_seat():
+    seats = SeatArray(2, max_hands=4)
+    rows = np.arange(2)
+    seats.reset(rows)
+    eight, nine = RANK_INDEX["8"], RANK_INDEX["9"]
+    hands = seats.current_hands(rows)
+    seats.deal(hands, np.array([eight, nine]))
+    seats.deal(hands, np.array([eight, nine]))
+    assert seats.pairs[:, 0].tolist() == [True, True]
+
+    seats.split(np.array([0]))
+    seats.deal(seats.current_hands(np.array([0])), np.array([eight]))
+    assert seats.pairs[0, 0]
+    seats.split(np.array([0]))  # Resplit
+
+    assert seats.num_hands.tolist() == [3, 1]
+    assert seats.bets[0].tolist() == [1, 1, 1, 0] and seats.bets[1].tolist() == [1, 0, 0, 0]
+    assert STATE_TOTALS[seats.states[0, :3]].tolist() == [8, 8, 8]
+    assert seats.num_cards[0, :3].tolist() == [1, 1, 1]
+    assert STATE_TOTALS[seats.states[1, 0]] == 18  # The other seat is untouched
+    assert seats.hand_mask().sum(axis=1).tolist() == [3, 1]
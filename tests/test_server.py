@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from server import GameServer
+
+
+async def connect(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    return reader, writer
+
+
+async def send(writer, **request):
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+
+
+async def read_until(reader, predicate, timeout=2.0):
+    """
+    Reads messages until one satisfies predicate, returning every message read.
+    """
+    messages = []
+    while True:
+        message = json.loads(await asyncio.wait_for(reader.readline(), timeout))
+        messages.append(message)
+        if predicate(message):
+            return messages
+
+
+def events(messages):
+    return [event for message in messages if message["t"] == "events" for event in message["events"]]
+
+
+def test_seats_share_one_round_and_the_turn_timer_moves_on():
+    async def scenario():
+        server = GameServer(seats=2, turn_timeout=0.2)
+        listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        (reader0, writer0), (reader1, writer1) = await connect(port), await connect(port)
+
+        await send(writer0, op="join", table="t")
+        assert (await read_until(reader0, lambda m: m["t"] == "joined"))[-1]["seat"] == 0
+        await send(writer1, op="join", table="t")
+        assert (await read_until(reader1, lambda m: m["t"] == "joined"))[-1]["seat"] == 1
+
+        await send(writer0, op="bet", amount=10)
+        await send(writer1, op="bet", amount=10, id=1)
+        seen = events(await read_until(reader1, lambda m: m.get("id") == 1))
+        dealt = [(seat, data["hand"]) for seat, event, data in seen if event == "card_dealt"]
+        assert dealt == [(0, "player"), (1, "player"), (None, "dealer")] * 2
+
+        # Seat 1 can't act before seat 0, who times out and is stood for
+        await send(writer1, op="hit", id=2)
+        replies = await read_until(reader1, lambda m: m.get("id") == 2)
+        assert any(m["t"] == "error" and "turn" in m["msg"] for m in replies)
+        seen = events(await read_until(
+            reader1, lambda m: m["t"] == "events" and any(e[1] == "turn_started" and e[0] == 1 for e in m["events"])
+        ))
+        assert [0, "stood", {"hand": "player"}] in seen
+
+        await send(writer1, op="stand")
+        seen = events(await read_until(
+            reader1, lambda m: m["t"] == "events" and any(e[1] == "state_changed" and e[2]["state"] == "betting"
+                                                          for e in m["events"])
+        ))
+        assert sum(1 for e in seen if e[1] == "hole_card_revealed") == 1
+        assert sorted(e[0] for e in seen if e[1] == "round_settled") == [0, 1]
+
+        await send(writer0, op="stats")
+        stats = (await read_until(reader0, lambda m: m["t"] == "stats"))[-1]
+        assert stats["histograms"]["server.bet"]["count"] == 2
+
+        for writer in (writer0, writer1):
+            writer.close()
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run(scenario())
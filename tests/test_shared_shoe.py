@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from components.deck import Deck
+from components.shuffle import ContinuousShufflePolicy, CutCardPolicy, fast_rng
+from components.table import Table, InvalidAction, SharedShoe, BETTING, SETTLE
+
+
+class DealtCards:
+    """
+    Every physical card out of a one-deck shoe: dealt since it was last shuffled, or still in play.
+    """
+
+    def __init__(self):
+        self.tables = []
+        self.seen = set()
+        self.duplicates = 0
+
+    def shuffled(self):
+        # Cards in a round still being played stay out of the shoe; a settling round's are discards
+        self.seen = {
+            card
+            for table in self.tables if table.state not in (BETTING, SETTLE)
+            for hand in table.hands + [table.dealer_hand]
+            for card in hand.cards
+        }
+
+    def __call__(self, event, data):
+        if event == "card_dealt":
+            card = data["card"]
+            self.duplicates += card in self.seen
+            self.seen.add(card)
+
+
+class WatchedPolicy:
+    """
+    Forgets the dealt cards whenever the wrapped policy puts them back in the shoe.
+    """
+
+    def __init__(self, policy, dealt):
+        self.policy = policy
+        self.dealt = dealt
+
+    def due(self, shoe):
+        return self.policy.due(shoe)
+
+    def end_round(self, shoe):
+        if self.policy.due(shoe):
+            self.dealt.shuffled()
+        return self.policy.end_round(shoe)
+
+
+def interleave(policy, seats=3, steps=20_000, seed=1):
+    dealt = DealtCards()
+    deck = Deck(1, rng=fast_rng(seed), shuffle_policy=WatchedPolicy(policy, dealt))
+    shoe = SharedShoe(deck)
+    for _ in range(seats):
+        table = Table(balance=10**9)
+        shoe.join(table)
+        table.subscribe(dealt)
+        dealt.tables.append(table)
+
+    rng = random.Random(seed)
+    rounds = 0
+    for _ in range(steps):
+        table = rng.choice(dealt.tables)
+        if table.state == BETTING:
+            try:
+                table.place_bet(10)
+            except InvalidAction:
+                assert shoe.shuffle_due
+        elif table.current_hand.total < 17 and rng.random() < 0.7:
+            table.hit()
+        else:
+            table.stand()
+        if table.state == BETTING:
+            rounds += 1
+    return dealt, rounds
+
+
+@pytest.mark.parametrize("policy", [CutCardPolicy(0.5), ContinuousShufflePolicy()])
+def test_interleaved_seats_never_see_a_card_twice(policy):
+    dealt, rounds = interleave(policy)
+    assert rounds > 1000
+    assert dealt.duplicates == 0
+
+
+def test_shuffle_waits_for_every_seat():
+    deck = Deck(1, rng=fast_rng(3), shuffle_policy=CutCardPolicy(0.01))
+    shoe = SharedShoe(deck)
+    first, second = Table(), Table()
+    shoe.join(first)
+    shoe.join(second)
+    reshuffles = []
+    first.subscribe(lambda event, data: reshuffles.append(event) if event == "reshuffled" else None)
+
+    first.place_bet(10)
+    second.place_bet(10)
+    while first.state != BETTING:
+        first.stand()
+    assert shoe.shuffle_due and not reshuffles
+    with pytest.raises(InvalidAction):
+        first.place_bet(10)
+
+    while second.state != BETTING:
+        second.stand()
+    assert reshuffles == ["reshuffled"] and not shoe.shuffle_due
+    assert deck.shoe.position == 0
+    first.place_bet(10)
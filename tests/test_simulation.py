@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from components.rules import RuleSet
+from components.simulation import PLAY_DOUBLE, PLAY_SURRENDER, PlayerPolicy, simulate
+from components.strategy import chart_for
+from components.variants import tables_for
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path)
+
+
+def test_tables_stand_in_for_rules(cache_dir):
+    rules = RuleSet(num_decks=2, hit_soft_17=True, surrender=True)
+    tables = tables_for(rules, cache_dir=cache_dir)
+    by_rules = simulate(20_000, num_shoes=64, rng=np.random.default_rng(3), policy=tables.policy, rules=rules)
+    by_tables = simulate(20_000, num_shoes=64, rng=np.random.default_rng(3), tables=tables)
+    assert by_tables.as_dict() == by_rules.as_dict()
+
+
+def test_rejects_surrender_the_rules_forbid(cache_dir):
+    # A chart solved with surrender, played where it isn't offered, must not score surrenders as losses
+    policy = PlayerPolicy.from_chart(chart_for(cache_dir=cache_dir, rules=RuleSet(surrender=True)))
+    assert (policy.actions == PLAY_SURRENDER).any()
+    with pytest.raises(ValueError, match="surrender"):
+        simulate(1000, num_shoes=8, rules=RuleSet(surrender=False), policy=policy)
+
+
+def test_rejects_doubles_the_rules_forbid(cache_dir):
+    policy = PlayerPolicy.from_chart(chart_for(cache_dir=cache_dir))
+    assert (policy.actions == PLAY_DOUBLE).any()
+    with pytest.raises(ValueError, match="doubles"):
+        simulate(1000, num_shoes=8, rules=RuleSet(double_on=(10, 11)), policy=policy)
+    restricted = PlayerPolicy.from_chart(chart_for(cache_dir=cache_dir), rules=RuleSet(double_on=(10, 11)))
+    assert simulate(1000, num_shoes=8, rules=RuleSet(double_on=(10, 11)), policy=restricted).rounds == 1000
+
+
+def test_rejects_more_hands_than_the_rules_allow(cache_dir):
+    policy = PlayerPolicy.from_chart(chart_for(cache_dir=cache_dir))
+    with pytest.raises(ValueError, match="hands"):
+        simulate(1000, num_shoes=8, rules=RuleSet(max_hands=2), policy=policy)
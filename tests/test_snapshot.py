@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from components import snapshot
+from components.deck import Deck
+from components.rules import RuleSet
+from components.shuffle import CutCardPolicy, fast_rng
+from components.table import InvalidAction, Table, BETTING, PLAYING_STATES
+
+RULES = RuleSet(num_decks=2, hit_soft_17=True, blackjack_pays="6:5", surrender=True, max_hands=3, penetration=0.6)
+ACTIONS = ("hit", "stand", "double_down", "split_hand", "surrender")
+
+
+def new_table(rules=RULES, seed=7):
+    deck = Deck(rules.num_decks, rng=fast_rng(seed), shuffle_policy=CutCardPolicy(rules.penetration))
+    return Table(deck, rules=rules)
+
+
+def play(table, rng, actions):
+    """
+    Plays actions at random, betting whenever the table is between rounds, and returns the events.
+    """
+    events = []
+    table.subscribe(lambda event, data: events.append((event, data)))
+    for _ in range(actions):
+        try:
+            if table.state == BETTING:
+                table.balance = max(table.balance, 100)
+                table.place_bet(10)
+            elif table.state in PLAYING_STATES:
+                getattr(table, rng.choice(ACTIONS))()
+        except InvalidAction:
+            pass
+    return events
+
+
+def mid_hand(seed=7):
+    table = new_table(seed=seed)
+    rng = random.Random(seed)
+    play(table, rng, 200)
+    while table.state not in PLAYING_STATES:
+        play(table, rng, 1)
+    return table
+
+
+def test_round_trip_keeps_the_rules_and_the_game():
+    table = mid_hand()
+    restored = snapshot.loads(snapshot.dumps(table), rng=fast_rng())
+
+    assert restored.rules == RULES and len(restored.seat.hands) == RULES.max_hands
+    assert restored.deck.shuffle_policy.penetration == RULES.penetration
+    assert snapshot.dumps(restored) == snapshot.dumps(table)
+    # The restored shoe and shuffle generator play on exactly as the original does
+    assert play(restored, random.Random(1), 300) == play(table, random.Random(1), 300)
+
+
+def test_restore_refuses_a_table_with_other_rules():
+    data = snapshot.dumps(mid_hand())
+    with pytest.raises(ValueError, match="rules"):
+        snapshot.restore(new_table(RULES.replace(surrender=False)), data)
+    assert snapshot.dumps(snapshot.restore(new_table(), data)) == data
+
+
+def corrupt(data, offset, value):
+    data = bytearray(data)
+    data[offset] = value
+    return bytes(data)
+
+
+def test_corrupt_snapshots_raise_value_error():
+    data = snapshot.dumps(mid_hand())
+    rules_len = snapshot.HEADER.unpack_from(data)[-1]
+    first_card = snapshot.HEADER.size + rules_len + snapshot.HAND.size
+    status = snapshot.HEADER.size + rules_len + 8
+    shoe = len(data) - snapshot.RNG_STATE.size - 1
+
+    bad = [
+        corrupt(data, 8, 200),  # State code
+        corrupt(data, status, 9),  # Hand status
+        corrupt(data, first_card, 99),  # Card code in a hand
+        corrupt(data, shoe, 60),  # Card code in the shoe
+        corrupt(data, snapshot.HEADER.size, ord("[")),  # Rules JSON
+        data[:len(data) - 5],
+        data[:20],
+    ]
+    for blob in bad:
+        with pytest.raises(ValueError):
+            snapshot.loads(blob)
@@ -0,0 +1,45 @@
+import struct
+
+from components import strategy
+from components.rules import RuleSet
+from components.strategy import CHART_SIZE, HEADER, MAGIC, SOLVER_VERSION, StrategyChart, action_evs, chart_for, solve
+
+EIGHTS = 7  # Value index of an 8
+SIXES = 5
+UPCARD_6 = 5
+UPCARD_TEN = 9
+
+
+def split_ev(pair, upcard, **rules):
+    return action_evs(2 * (pair + 1), False, upcard, pair=pair, rules=RuleSet(**rules))["split"]
+
+
+def test_doubling_after_splits_is_worth_something():
+    assert split_ev(SIXES, UPCARD_6) > split_ev(SIXES, UPCARD_6, double_after_split=False)
+
+
+def test_resplits_are_worth_something():
+    assert split_ev(EIGHTS, UPCARD_6) > split_ev(EIGHTS, UPCARD_6, max_hands=2)
+
+
+def test_no_split_without_a_second_hand():
+    evs = action_evs(16, False, UPCARD_TEN, pair=EIGHTS, rules=RuleSet(max_hands=1))
+    assert "split" not in evs
+
+
+def test_split_rules_have_their_own_charts():
+    keys = {RuleSet().strategy_key, RuleSet(double_after_split=False).strategy_key, RuleSet(max_hands=2).strategy_key}
+    assert len(keys) == 3
+
+
+def test_chart_from_another_solver_is_solved_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(strategy, "_charts", {})  # Only the file cache is under test
+    rules = RuleSet(num_decks=1)
+    path = tmp_path / f"strategy_{rules.strategy_key}.bin"
+    stale = bytes([ord("S")]) * CHART_SIZE  # Stands on everything, as no solver would
+    path.write_bytes(HEADER.pack(MAGIC, SOLVER_VERSION - 1, 1, CHART_SIZE) + stale)
+
+    chart = chart_for(cache_dir=str(tmp_path), rules=rules)
+    assert chart.table == solve(rules=rules).table
+    assert struct.unpack_from("<I", path.read_bytes(), len(MAGIC))[0] == SOLVER_VERSION
+    assert StrategyChart.load(str(path)).table == chart.table
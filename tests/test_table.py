@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from components.deck import Deck
+from components.rules import RuleSet
+from components.shoe import CARD_CODES
+from components.shuffle import CutCardPolicy, fast_rng
+from components.table import InvalidAction, Table, BETTING, PLAYING_STATES, STARTING_BALANCE
+
+ACTIONS = ("hit", "stand", "double_down", "split_hand", "place_insurance", "surrender", "fold")
+
+
+def new_table(rules, seed):
+    deck = Deck(rules.num_decks, rng=fast_rng(seed), shuffle_policy=CutCardPolicy(rules.penetration))
+    return Table(deck, rules=rules)
+
+
+class Ledger:
+    """
+    Follows every stake and payout a table announces, and the balance from round to round.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.start = table.balance
+        self.staked = self.paid = 0
+        self.rounds = 0
+        table.subscribe(self)
+
+    def __call__(self, event, data):
+        if event == "bet_placed":
+            self.staked += data["bet"]
+        elif event == "hand_split":
+            self.staked += data["bet"]
+        elif event == "doubled":
+            self.staked += data["bet"] // 2
+        elif event == "insurance_placed":
+            self.staked += data["insurance_bet"]
+        elif event in ("hand_settled", "insurance_settled"):
+            self.paid += data["payout"]
+        elif event == "round_settled":
+            assert data["balance"] == self.table.balance
+            assert data["net"] == data["balance"] - self.start, "net differs from the balance change"
+            assert data["net"] == self.paid - self.staked, "net differs from the payouts less the stakes"
+            self.rounds += 1
+
+    def next_round(self):
+        self.start = self.table.balance
+        self.staked = self.paid = 0
+
+
+@pytest.mark.parametrize("rules", [
+    RuleSet(),
+    RuleSet(num_decks=1, hit_soft_17=True, blackjack_pays="3:2", surrender=True),
+    RuleSet(num_decks=2, blackjack_pays="6:5", double_on=(10, 11), double_after_split=False, max_hands=2),
+], ids=lambda rules: rules.strategy_key)
+def test_round_nets_match_the_balance(rules):
+    table = new_table(rules, seed=3)
+    ledger = Ledger(table)
+    rng = random.Random(3)
+    while ledger.rounds < 2000:
+        if table.state == BETTING:
+            table.balance = max(table.balance, 1000)
+            ledger.next_round()
+            table.place_bet(rng.choice((5, 10, 25)))
+        elif table.state in PLAYING_STATES:
+            try:
+                getattr(table, rng.choices(ACTIONS, (8, 8, 2, 3, 1, 1, 1))[0])()
+            except InvalidAction:
+                pass
+
+
+def test_resplit_plays_each_hand_in_turn():
+    table = new_table(RuleSet(max_hands=3), seed=1)
+    shoe = table.deck.shoe
+    ranks = ["8", "9", "8", "7", "8", "3", "10", "2"]  # Deal, then cards for the split hands in play order
+    shoe.cards[:len(ranks)] = [CARD_CODES[(rank, "Clubs")] for rank in ranks]
+    events = []
+    table.subscribe(lambda event, data: events.append((event, data)))
+    table.place_bet(10)
+
+    table.split_hand()
+    table.hit()  # player draws the third 8
+    assert table.seat.can_split
+    table.split_hand()
+    assert not table.seat.can_split  # Three hands is the limit
+    assert [data["new_hand"] for event, data in events if event == "hand_split"] == ["second", "third"]
+
+    table.hit()  # player: 8, 3
+    table.stand()
+    table.hit()  # second: 8, 10
+    table.stand()
+    table.hit()  # third: 8, 2
+    table.stand()
+
+    settled = [data for event, data in events if event == "hand_settled"]
+    assert [(data["hand"], data["total"]) for data in settled] == [("player", 11), ("second", 18), ("third", 10)]
+    assert table.balance == STARTING_BALANCE - 30 + sum(data["payout"] for data in settled)
+
+
+def test_reshuffled_is_announced_once_the_shoe_is_refilled():
+    table = new_table(RuleSet(), seed=2)
+    shoe = table.deck.shoe
+    sizes = []
+    table.subscribe(lambda event, data: sizes.append(len(shoe)) if event == "reshuffled" else None)
+    table.place_bet(10)
+    assert table.state in PLAYING_STATES
+    shoe.position = len(shoe.cards)  # Run the shoe out mid-round
+    table.hit()
+    assert sizes == [len(shoe.cards)]